@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from nlp2 import RestaurantAnalyzer
+from report_engine import to_jsonable
+
+
+class AnalyzerCache:
+    """نگهداری تحلیل‌گرهای اخیراً استفاده شده در حافظه (LRU)"""
+
+    def __init__(self, data_dir, capacity=8):
+        self.data_dir = os.path.realpath(data_dir)
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def resolve(self, file_name):
+        """مسیر امن فایل داخل پوشه داده‌ها"""
+        path = os.path.realpath(os.path.join(self.data_dir, file_name))
+        if os.path.commonpath([path, self.data_dir]) != self.data_dir or not os.path.isfile(path):
+            raise FileNotFoundError(f"فایل {file_name} یافت نشد")
+        return path
+
+    def get(self, file_name):
+        """تحلیل‌گر یک فایل؛ در صورت تغییر فایل دوباره ساخته می‌شود"""
+        path = self.resolve(file_name)
+        key = (path, os.path.getmtime(path))
+
+        with self._lock:
+            analyzer = self._entries.get(key)
+            if analyzer is not None:
+                self._entries.move_to_end(key)
+                return analyzer
+            # فقط یک درخواست فایل را می‌سازد و بقیه منتظر همان می‌مانند
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                analyzer = self._entries.get(key)
+            try:
+                if analyzer is None:
+                    df = pd.read_csv(path, encoding='utf-8')
+                    analyzer = RestaurantAnalyzer(df)
+                    with self._lock:
+                        self._entries[key] = analyzer
+                        # نسخه‌های قدیمی همین فایل و موارد اضافه حذف می‌شوند
+                        for old_key in [k for k in self._entries if k[0] == path and k != key]:
+                            del self._entries[old_key]
+                        while len(self._entries) > self.capacity:
+                            self._entries.popitem(last=False)
+            finally:
+                # در صورت خطا هم قفل بارگذاری نگه داشته نمی‌شود
+                with self._lock:
+                    self._loading.pop(key, None)
+            return analyzer
+
+    def datasets(self):
+        with self._lock:
+            return [os.path.relpath(path, self.data_dir) for path, _ in self._entries]
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """مسیرهای HTTP سرویس تحلیل"""
+
+    cache = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        routes = {
+            '/datasets': self.handle_datasets,
+            '/restaurants': self.handle_restaurants,
+            '/report': self.handle_report,
+            '/best': self.handle_best,
+            '/top': self.handle_top,
+        }
+
+        handler = routes.get(url.path)
+        if handler is None:
+            return self.send_json({'error': 'مسیر یافت نشد'}, 404)
+
+        start = time.perf_counter()
+        try:
+            payload = handler(params)
+        except FileNotFoundError as e:
+            return self.send_json({'error': str(e)}, 404)
+        except (KeyError, ValueError) as e:
+            return self.send_json({'error': f"پارامتر نامعتبر: {e}"}, 400)
+        except Exception as e:
+            return self.send_json({'error': str(e)}, 500)
+
+        payload['elapsed_ms'] = (time.perf_counter() - start) * 1000
+        self.send_json(payload)
+
+    def handle_datasets(self, params):
+        return {'datasets': self.cache.datasets()}
+
+    def handle_restaurants(self, params):
+        analyzer = self.cache.get(params['file'])
+        restaurants = [
+            {'name': name, 'average_rating': analysis['average_rating'],
+             'total_comments': analysis['total_comments'],
+             'positive_percentage': analysis['positive_percentage']}
+            for name, analysis in analyzer.all_restaurants_analysis.items()
+        ]
+        return {'restaurants': restaurants}
+
+    def handle_report(self, params):
+        analyzer = self.cache.get(params['file'])
+        report = analyzer.get_restaurant_report(params['name'])
+        if report is None:
+            raise FileNotFoundError(f"رستوران {params['name']} یافت نشد")
+        return {'report': report}
+
+    def handle_best(self, params):
+        analyzer = self.cache.get(params['file'])
+        return {'best_restaurant': analyzer.best_restaurant}
+
+    def handle_top(self, params):
+        k = int(params.get('k', 10))
+        offset = int(params.get('offset', 0))
+        # مقدار منفی در برش لیست از انتها می‌شمارد؛ مانند مقدار غیرعددی رد می‌شود (400)
+        if k < 0 or offset < 0:
+            raise ValueError("k و offset نباید منفی باشند")
+        analyzer = self.cache.get(params['file'])
+        top = [{'rank': offset + i + 1, 'name': name, 'score': score}
+               for i, (name, score) in enumerate(analyzer.top_restaurants(k, offset))]
+        return {'top': top, 'total': len(analyzer.ranking)}
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(to_jsonable(payload), ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}")
+
+
+def create_server(data_dir='.', host='127.0.0.1', port=8765, capacity=8):
+    """ساخت سرور چندنخی با حافظه نهان مشترک"""
+    handler = type('Handler', (AnalysisRequestHandler,), {'cache': AnalyzerCache(data_dir, capacity)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="سرویس HTTP محلی برای تحلیل رستوران‌ها")
+    parser.add_argument('--data-dir', default='.', help="پوشه فایل‌های CSV")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--cache-size', type=int, default=8, help="حداکثر تعداد تحلیل‌گرهای گرم")
+    args = parser.parse_args()
+
+    server = create_server(args.data_dir, args.host, args.port, args.cache_size)
+    print(f"🚀 سرویس تحلیل روی http://{args.host}:{args.port} آماده است")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("⏹️ سرویس متوقف شد")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import argparse
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+import pandas as pd
+
+from nlp2 import RestaurantAnalyzer
+from synthetic_corpus import write_corpus
+
+
+DEFAULT_SIZES = (10 ** 3, 10 ** 4, 10 ** 5)
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(HERE, 'benchmarks', 'data')
+RESULTS_DIR = os.path.join(HERE, 'benchmarks', 'results')
+
+
+def measure(func, *args, trace_memory=True):
+    """اجرای تابع و برگرداندن (نتیجه، زمان، اوج حافظه بر حسب MB)"""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def corpus_path(size, seed):
+    """مسیر فایل مصنوعی هر اندازه؛ فقط بار اول ساخته می‌شود"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"synthetic_{size}_seed{seed}_structured.csv")
+    if not os.path.exists(path):
+        print(f"🧪 ساخت داده مصنوعی با {size} ردیف...")
+        write_corpus(path, size, seed=seed)
+    return path
+
+
+def benchmark_size(size, seed=0, trace_memory=True):
+    """زمان و حافظه هر مرحله تحلیل برای یک اندازه داده"""
+    stages = {}
+
+    def record(name, func, *args):
+        result, elapsed, peak = measure(func, *args, trace_memory=trace_memory)
+        stages[name] = {'seconds': elapsed, 'peak_mb': peak}
+        return result
+
+    path = corpus_path(size, seed)
+    raw = record('load_csv', lambda: pd.read_csv(path, encoding='utf-8'))
+
+    analyzer = record('constructor_total', RestaurantAnalyzer, raw.copy())
+
+    # اجرای جداگانه هر مرحله روی همان تحلیل‌گر
+    analyzer.df = raw.copy()
+    record('clean_data', analyzer.clean_data)
+
+    comments = analyzer.df['comment_text'].tolist()
+    record('persian_sentiment_analysis', analyzer.persian_sentiment_analysis_for_restaurant, comments)
+    record('analyze_common_issues', analyzer.analyze_common_issues_for_restaurant, comments)
+    record('extract_top_words_positive', analyzer.extract_top_words, comments, 'positive')
+    record('extract_top_words_negative', analyzer.extract_top_words, comments, 'negative')
+    record('get_basic_statistics', analyzer.get_basic_statistics)
+    analyzer.all_restaurants_analysis = record('analyze_all_restaurants', analyzer.analyze_all_restaurants)
+    record('find_best_restaurant', analyzer.find_best_restaurant)
+
+    return {
+        'rows': size,
+        'restaurants': len(analyzer.all_restaurants_analysis),
+        'stages': stages,
+    }
+
+
+def compare(current, baseline, threshold=1.2):
+    """مقایسه با نتایج قبلی و گزارش مراحلی که کندتر شده‌اند"""
+    regressions = []
+    baseline_sizes = {str(entry['rows']): entry for entry in baseline['results']}
+    for entry in current['results']:
+        previous = baseline_sizes.get(str(entry['rows']))
+        if previous is None:
+            continue
+        for stage, values in entry['stages'].items():
+            old = previous['stages'].get(stage)
+            if not old or not old['seconds']:
+                continue
+            ratio = values['seconds'] / old['seconds']
+            marker = '❌' if ratio > threshold else '✅'
+            print(f"{marker} {entry['rows']:>9} {stage:<30} {old['seconds']:.4f} → {values['seconds']:.4f} ({ratio:.2f}x)")
+            if ratio > threshold:
+                regressions.append((entry['rows'], stage, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="بنچمارک مراحل RestaurantAnalyzer روی داده مصنوعی")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="اندازه‌های داده (تا 10000000)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="بدون tracemalloc (سریع‌تر)")
+    parser.add_argument('--baseline', help="فایل JSON نتایج قبلی برای مقایسه")
+    parser.add_argument('--threshold', type=float, default=1.2, help="نسبت کندی قابل قبول")
+    parser.add_argument('-o', '--output', help="مسیر ذخیره نتایج")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        print(f"\n📏 اندازه: {size}")
+        entry = benchmark_size(size, args.seed, trace_memory=not args.no_memory)
+        for stage, values in entry['stages'].items():
+            peak = f"{values['peak_mb']:.1f} MB" if values['peak_mb'] is not None else "-"
+            print(f"  {stage:<30} {values['seconds']:.4f} ثانیه  {peak}")
+        results.append(entry)
+
+    report = {
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'seed': args.seed,
+        'results': results,
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"analyzer_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 نتایج ذخیره شد: {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            raise SystemExit("⚠️ کاهش کارایی نسبت به نتایج قبلی مشاهده شد")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import platform
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import http_scraper
+from http_scraper import http_scrape, load_config
+from synthetic_corpus import SyntheticReviewGenerator
+
+
+STAND_IN_NEIGHBORHOOD = 'محله آزمایشی'
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'results')
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """پاسخ‌های JSON شبیه API سایت، از روی داده مصنوعی و با تأخیر شبکه مصنوعی"""
+
+    # keep-alive برای سنجش استفاده دوباره از اتصال‌ها
+    protocol_version = 'HTTP/1.1'
+    vendors = []
+    comments = {}
+    latency = 0.0
+    page_size = 20
+    # تعداد درخواست‌های اول که با 429 رد می‌شوند (برای آزمودن تلاش دوباره)
+    throttle = 0
+    _served = None
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        with self._served['lock']:
+            self._served['count'] += 1
+            throttled = self._served['count'] <= self.throttle
+        if throttled:
+            return self.send_json({'error': 'too many requests'}, 429)
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        page = int(params.get('page', 0))
+
+        if url.path == '/vendors':
+            size = int(params.get('page_size', self.page_size))
+            items = [{'type': 'VENDOR', 'data': {'title': name, 'code': code}}
+                     for name, code in self.vendors[page * size:(page + 1) * size]]
+            return self.send_json({'data': {'finalResult': items}})
+
+        if url.path == '/comments':
+            comments = self.comments.get(params.get('vendorCode'))
+            if comments is None:
+                return self.send_json({'error': 'not found'}, 404)
+            return self.send_json({'data': {'comments': comments[page * self.page_size:
+                                                                 (page + 1) * self.page_size]}})
+
+        self.send_json({'error': 'not found'}, 404)
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_stand_in_server(restaurants=20, comments_per_restaurant=60, latency=0.05, seed=0, port=0, throttle=0):
+    """سرور محلی جایگزین سایت؛ (سرور، تنظیمات اسکرپر HTTP) را برمی‌گرداند"""
+    generator = SyntheticReviewGenerator(seed, restaurants)
+    rng = generator.rng
+    vendors = [(name, f"v{i}") for i, name in enumerate(generator.restaurants)]
+    comments = {}
+    for name, code in vendors:
+        comments[code] = [
+            {
+                'commentText': generator.comment(rating),
+                'createdDate': (date(2025, 1, 1) + timedelta(days=rng.randint(0, 300))).isoformat() + ' 12:00:00',
+                'rate': float(rating),
+            }
+            for rating in (rng.randint(1, 5) for _ in range(comments_per_restaurant))
+        ]
+
+    handler = type('Handler', (StandInHandler,), {
+        'vendors': vendors, 'comments': comments, 'latency': latency, 'throttle': throttle,
+        '_served': {'count': 0, 'lock': threading.Lock()},
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    config = load_config()
+    config.update({
+        'vendors_url': base + '/vendors?lat={lat}&long={lng}&query={food}&page={page}&page_size={page_size}',
+        'comments_url': base + '/comments?vendorCode={vendor_code}&page={page}',
+        'locations': {STAND_IN_NEIGHBORHOOD: [35.7, 51.4]},
+        'max_comment_pages': comments_per_restaurant // StandInHandler.page_size + 2,
+    })
+    return server, config
+
+
+def benchmark_http(config, concurrency, requests_per_second):
+    start = time.perf_counter()
+    rows = http_scrape(STAND_IN_NEIGHBORHOOD, 'پیتزا', config,
+                       concurrency=concurrency, requests_per_second=requests_per_second)
+    return {'concurrency': concurrency, 'seconds': time.perf_counter() - start, 'rows': len(rows)}
+
+
+def benchmark_selenium(neighborhood, food):
+    """مسیر مرورگر روی سایت واقعی (نیازمند Edge و اینترنت)"""
+    from scrapy2 import setup_driver, scraper, clean_and_validate_data
+
+    start = time.perf_counter()
+    driver = setup_driver(neighborhood_name=neighborhood, food_name=food)
+    try:
+        rows = clean_and_validate_data(scraper(driver)) if driver else []
+    finally:
+        if driver:
+            driver.quit()
+    return {'seconds': time.perf_counter() - start, 'rows': len(rows)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="بنچمارک اسکرپر HTTP روی سرور محلی جایگزین")
+    parser.add_argument('--restaurants', type=int, default=20)
+    parser.add_argument('--comments', type=int, default=60, help="تعداد نظر هر رستوران")
+    parser.add_argument('--latency', type=float, default=0.05, help="تأخیر هر پاسخ (ثانیه)")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--rps', type=float, default=0, help="محدودیت نرخ (0 یعنی بدون محدودیت)")
+    parser.add_argument('--selenium', nargs=2, metavar=('NEIGHBORHOOD', 'FOOD'),
+                        help="اجرای مسیر مرورگر روی سایت واقعی برای مقایسه")
+    parser.add_argument('-o', '--output', help="مسیر ذخیره نتایج")
+    args = parser.parse_args()
+
+    server, config = create_stand_in_server(args.restaurants, args.comments, args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            entry = benchmark_http(config, concurrency, args.rps)
+            print(f"🌐 همزمانی {concurrency:>3}: {entry['seconds']:.2f} ثانیه، {entry['rows']} نظر")
+            results.append(entry)
+    finally:
+        server.shutdown()
+
+    report = {
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'client': 'aiohttp' if http_scraper.aiohttp is not None else 'http.client',
+        'restaurants': args.restaurants,
+        'comments_per_restaurant': args.comments,
+        'latency': args.latency,
+        'http': results,
+    }
+
+    if args.selenium:
+        entry = benchmark_selenium(*args.selenium)
+        print(f"🧭 مرورگر: {entry['seconds']:.2f} ثانیه، {entry['rows']} نظر")
+        report['selenium'] = dict(entry, neighborhood=args.selenium[0], food=args.selenium[1])
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"http_scraper_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 نتایج ذخیره شد: {output}")
+
+
+if __name__ == "__main__":
+    main()
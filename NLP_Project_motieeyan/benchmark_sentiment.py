@@ -0,0 +1,84 @@
+import argparse
+import time
+from collections import Counter
+
+import pandas as pd
+
+from nlp2 import RestaurantAnalyzer
+from sentiment_model import LABELS, LinearSentimentModel, load_training_data
+
+
+def time_call(func, *args):
+    """اجرای تابع و برگرداندن (نتیجه، زمان بر حسب ثانیه)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(csv_files, model_path=None, scale=None):
+    """مقایسه سرعت و میزان توافق مدل خطی با موتور واژه‌نامه‌ای"""
+    try:
+        df = pd.concat([pd.read_csv(path, encoding='utf-8') for path in csv_files], ignore_index=True)
+    except pd.errors.EmptyDataError:
+        df = pd.DataFrame()
+
+    # فایل خالی (یا بدون نظر معتبر پس از پاکسازی) تقسیم بر صفر می‌دهد
+    comments = []
+    if not df.empty:
+        analyzer = RestaurantAnalyzer(df)
+        comments = analyzer.df['comment_text'].astype(str).tolist()
+    if not comments:
+        raise SystemExit("❌ هیچ نظری در فایل‌های ورودی پیدا نشد")
+    if scale and scale > len(comments):
+        comments = (comments * (scale // len(comments) + 1))[:scale]
+
+    if model_path:
+        model = LinearSentimentModel.load(model_path)
+    else:
+        print("⚠️ مدلی داده نشد؛ آموزش روی همین داده‌ها انجام می‌شود")
+        training_comments, labels = load_training_data(csv_files)
+        model = LinearSentimentModel().fit(training_comments, labels)
+
+    lexicon_results, lexicon_time = time_call(analyzer.persian_sentiment_analysis_for_restaurant, comments)
+    lexicon_labels = [item['emotion'] for item in lexicon_results]
+
+    # بار اول حافظه هش خالی است؛ بار دوم حالت گرم را اندازه می‌گیرد
+    model_labels, cold_time = time_call(model.predict_labels, comments)
+    _, warm_time = time_call(model.predict_labels, comments)
+
+    agreement = sum(a == b for a, b in zip(lexicon_labels, model_labels)) / len(comments) * 100
+    confusion = Counter(zip(lexicon_labels, model_labels))
+
+    print(f"\n📊 تعداد نظرات: {len(comments)}")
+    print(f"• واژه‌نامه: {lexicon_time:.3f} ثانیه ({len(comments) / lexicon_time:,.0f} نظر در ثانیه)")
+    print(f"• مدل خطی (سرد): {cold_time:.3f} ثانیه ({len(comments) / cold_time:,.0f} نظر در ثانیه)")
+    print(f"• مدل خطی (گرم): {warm_time:.3f} ثانیه ({len(comments) / warm_time:,.0f} نظر در ثانیه)")
+    print(f"• میزان توافق: {agreement:.1f}%")
+
+    print("\nماتریس درهم‌ریختگی (سطر: واژه‌نامه، ستون: مدل):")
+    print("\t" + "\t".join(LABELS))
+    for lexicon_label in LABELS:
+        counts = [str(confusion[(lexicon_label, model_label)]) for model_label in LABELS]
+        print(f"{lexicon_label}\t" + "\t".join(counts))
+
+    return {
+        'comments': len(comments),
+        'lexicon_seconds': lexicon_time,
+        'model_cold_seconds': cold_time,
+        'model_warm_seconds': warm_time,
+        'agreement_percentage': agreement,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="بنچمارک مدل احساسات در برابر موتور واژه‌نامه‌ای")
+    parser.add_argument('csv_files', nargs='+')
+    parser.add_argument('--model', help="مسیر مدل آموزش‌دیده (npz)")
+    parser.add_argument('--scale', type=int, help="تکرار نظرات تا رسیدن به این تعداد")
+    args = parser.parse_args()
+
+    run_benchmark(args.csv_files, args.model, args.scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+# بودجه زمان راه‌اندازی (ثانیه) برای هر نقطه ورود
+STARTUP_BUDGET_SECONDS = {
+    'scrapy2': 1.0,
+    'nlp2': 1.5,
+}
+
+# کد اجرا شده در فرآیند فرزند؛ زمان‌ها از لحظه شروع مفسر اندازه‌گیری می‌شوند
+CHILD_SCRIPTS = {
+    'scrapy2': """
+import time
+t0 = time.perf_counter()
+import scrapy2
+t_import = time.perf_counter() - t0
+t_window = None
+if {with_window}:
+    import tkinter as tk
+    root = tk.Tk()
+    scrapy2.ScraperGUI(root)
+    root.update()
+    t_window = time.perf_counter() - t0
+    root.destroy()
+print('RESULT', t_import, t_window)
+""",
+    'nlp2': """
+import time
+t0 = time.perf_counter()
+import nlp2
+t_import = time.perf_counter() - t0
+t_window = None
+if {with_window}:
+    import tkinter as tk
+    df = nlp2.pd.read_csv({sample_csv!r}, encoding='utf-8')
+    analyzer = nlp2.RestaurantAnalyzer(df)
+    root = tk.Tk()
+    nlp2.RestaurantAnalysisGUI(root, analyzer, {sample_csv!r})
+    root.update()
+    t_window = time.perf_counter() - t0
+    root.destroy()
+print('RESULT', t_import, t_window)
+""",
+}
+
+
+def run_child(entry, source_dir, with_window, sample_csv):
+    """اجرای یک نقطه ورود در فرآیند تازه و برگرداندن (کل، ایمپورت، اولین پنجره)"""
+    script = CHILD_SCRIPTS[entry].format(with_window=with_window, sample_csv=sample_csv)
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-c', script], cwd=source_dir,
+                               capture_output=True, text=True, encoding='utf-8')
+    total = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr else entry)
+
+    line = next(l for l in completed.stdout.splitlines() if l.startswith('RESULT'))
+    _, t_import, t_window = line.split()
+    return total, float(t_import), None if t_window == 'None' else float(t_window)
+
+
+def benchmark(source_dir, entries, repeat, with_window, sample_csv):
+    """اجرای سرد (اولین اجرا) و گرم (میانه اجراهای بعدی) برای هر نقطه ورود"""
+    results = {}
+    for entry in entries:
+        runs = [run_child(entry, source_dir, with_window, sample_csv) for _ in range(repeat + 1)]
+        cold, warm = runs[0], runs[1:]
+        results[entry] = {
+            'cold_total': cold[0],
+            'cold_import': cold[1],
+            'cold_window': cold[2],
+            'warm_total': statistics.median(r[0] for r in warm),
+            'warm_import': statistics.median(r[1] for r in warm),
+            'warm_window': statistics.median(r[2] for r in warm) if with_window else None,
+        }
+    return results
+
+
+def format_seconds(value):
+    return f"{value:.3f}" if value is not None else "-"
+
+
+def print_results(label, results):
+    print(f"\n⏱️ {label}")
+    print("نقطه ورود\tایمپورت سرد\tایمپورت گرم\tپنجره سرد\tپنجره گرم\tکل گرم\tبودجه")
+    for entry, r in results.items():
+        measured = r['warm_window'] if r['warm_window'] is not None else r['warm_total']
+        budget = STARTUP_BUDGET_SECONDS[entry]
+        status = '✅' if measured <= budget else '❌'
+        print(f"{entry}\t{format_seconds(r['cold_import'])}\t{format_seconds(r['warm_import'])}\t"
+              f"{format_seconds(r['cold_window'])}\t{format_seconds(r['warm_window'])}\t"
+              f"{format_seconds(r['warm_total'])}\t{budget:.1f} {status}")
+
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="اندازه‌گیری زمان راه‌اندازی تا اولین پنجره")
+    parser.add_argument('--entries', nargs='+', default=list(CHILD_SCRIPTS), choices=list(CHILD_SCRIPTS))
+    parser.add_argument('--repeat', type=int, default=5, help="تعداد اجراهای گرم")
+    parser.add_argument('--compare', help="پوشه نسخه قبلی برای مقایسه (مثلاً یک git worktree)")
+    parser.add_argument('--no-window', action='store_true', help="فقط زمان ایمپورت (بدون نمایشگر)")
+    parser.add_argument('--sample-csv', help="فایل CSV برای باز کردن پنجره تحلیل")
+    args = parser.parse_args()
+
+    sample_csv = args.sample_csv or next(
+        (os.path.join(here, name) for name in sorted(os.listdir(here)) if name.endswith('_structured.csv')),
+        None)
+    with_window = not args.no_window
+
+    if args.compare:
+        before = benchmark(args.compare, args.entries, args.repeat, with_window, sample_csv)
+        print_results(f"قبل ({args.compare})", before)
+
+    after = benchmark(here, args.entries, args.repeat, with_window, sample_csv)
+    print_results(f"فعلی ({here})", after)
+
+    over_budget = [entry for entry, r in after.items()
+                   if (r['warm_window'] if r['warm_window'] is not None else r['warm_total'])
+                   > STARTUP_BUDGET_SECONDS[entry]]
+    if over_budget:
+        raise SystemExit(f"بودجه راه‌اندازی رعایت نشد: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
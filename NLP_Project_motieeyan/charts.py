@@ -0,0 +1,106 @@
+import base64
+import io
+from collections import OrderedDict
+import tkinter as tk
+from tkinter import ttk
+
+try:
+    # برای نمایش درست متن فارسی در matplotlib (اختیاری)
+    import arabic_reshaper
+    from bidi.algorithm import get_display
+except ImportError:
+    arabic_reshaper = None
+
+
+SENTIMENT_LABELS = ('مثبت', 'منفی', 'خنثی')
+SENTIMENT_COLORS = ('#4caf50', '#e53935', '#9e9e9e')
+RATINGS = (1, 2, 3, 4, 5)
+
+
+def fa(text):
+    """آماده‌سازی متن فارسی برای رسم (اتصال حروف و راست‌به‌چپ)"""
+    if arabic_reshaper is None:
+        return text
+    return get_display(arabic_reshaper.reshape(text))
+
+
+class RestaurantChartView:
+    """تب نمودارها: یک Figure ثابت که آرتیست‌هایش با تغییر انتخاب به‌روز می‌شوند"""
+
+    def __init__(self, parent, issue_names, cache_size=64):
+        # matplotlib فقط با اولین باز شدن این تب بارگذاری می‌شود
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.issue_names = list(issue_names)
+        self.cache_size = cache_size
+        self._images = OrderedDict()
+
+        self.figure = Figure(figsize=(7, 6), dpi=90)
+        self.canvas = FigureCanvasAgg(self.figure)
+        rating_ax, sentiment_ax, issues_ax = self.figure.subplots(3, 1)
+
+        self.rating_bars = rating_ax.bar(RATINGS, [0] * len(RATINGS), color='#ffb300')
+        rating_ax.set_xticks(RATINGS)
+        rating_ax.set_title(fa('توزیع امتیازها'))
+        self.rating_ax = rating_ax
+
+        self.sentiment_bars = sentiment_ax.barh(range(len(SENTIMENT_LABELS)), [0] * len(SENTIMENT_LABELS),
+                                                color=SENTIMENT_COLORS)
+        sentiment_ax.set_yticks(range(len(SENTIMENT_LABELS)))
+        sentiment_ax.set_yticklabels([fa(label) for label in SENTIMENT_LABELS])
+        sentiment_ax.set_xlim(0, 100)
+        sentiment_ax.set_title(fa('تحلیل احساسات (درصد)'))
+
+        self.issue_bars = issues_ax.barh(range(len(self.issue_names)), [0] * len(self.issue_names),
+                                         color='#fb8c00')
+        issues_ax.set_yticks(range(len(self.issue_names)))
+        issues_ax.set_yticklabels([fa(name) for name in self.issue_names])
+        issues_ax.set_title(fa('مشکلات گزارش شده'))
+        self.issues_ax = issues_ax
+
+        self.figure.tight_layout()
+
+        self.image_label = ttk.Label(parent)
+        self.image_label.pack(fill='both', expand=True)
+
+    def show(self, restaurant_name, analysis):
+        """نمایش نمودارهای یک رستوران؛ تصاویر قبلی از حافظه نهان خوانده می‌شوند"""
+        image = self._images.get(restaurant_name)
+        if image is None:
+            image = self.render(analysis)
+            self._images[restaurant_name] = image
+            if len(self._images) > self.cache_size:
+                self._images.popitem(last=False)
+        else:
+            self._images.move_to_end(restaurant_name)
+
+        self.image_label.config(image=image)
+
+    def render(self, analysis):
+        """به‌روزرسانی ارتفاع میله‌ها و تبدیل شکل به تصویر Tk"""
+        rating_distribution = analysis['rating_distribution']
+        rating_counts = [rating_distribution.get(float(r), rating_distribution.get(r, 0)) for r in RATINGS]
+        for bar, count in zip(self.rating_bars, rating_counts):
+            bar.set_height(count)
+        self.rating_ax.set_ylim(0, max(max(rating_counts), 1) * 1.1)
+
+        for bar, label in zip(self.sentiment_bars, SENTIMENT_LABELS):
+            bar.set_width(analysis['sentiment_percentages'][label])
+
+        issue_counts = [analysis['common_issues'].get(name, 0) for name in self.issue_names]
+        for bar, count in zip(self.issue_bars, issue_counts):
+            bar.set_width(count)
+        self.issues_ax.set_xlim(0, max(max(issue_counts, default=0), 1) * 1.1)
+
+        buffer = io.BytesIO()
+        self.canvas.print_png(buffer)
+        # تصویر به interpreter همان پنجره تعلق دارد، نه ریشه پیش‌فرض Tk
+        return tk.PhotoImage(master=self.image_label, data=base64.b64encode(buffer.getvalue()))
+
+    def invalidate(self, restaurant_name=None):
+        """پاک کردن تصویر ذخیره شده یک رستوران (یا همه)"""
+        if restaurant_name is None:
+            self._images.clear()
+        else:
+            self._images.pop(restaurant_name, None)
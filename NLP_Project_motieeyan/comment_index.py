@@ -0,0 +1,98 @@
+import bisect
+import heapq
+from array import array
+from collections import defaultdict
+
+
+class CommentInvertedIndex:
+    """ایندکس معکوس از (نوع، عبارت، رستوران) به شماره ردیف نظرات در DataFrame تحلیل‌گر"""
+
+    ISSUE = 'issue'
+    WORD = 'word'
+
+    def __init__(self):
+        # آرایه‌های فشرده اعداد بدون علامت به جای لیست پایتون
+        self._postings = defaultdict(lambda: array('I'))
+        self._restaurants_by_term = defaultdict(set)
+        self._terms_by_restaurant = defaultdict(set)
+
+    def add(self, restaurant, kind, term, row_id):
+        """ثبت یک نظر برای یک عبارت؛ ردیف‌ها به ترتیب صعودی اضافه می‌شوند"""
+        self._postings[(kind, term, restaurant)].append(row_id)
+        self._restaurants_by_term[(kind, term)].add(restaurant)
+        self._terms_by_restaurant[(kind, restaurant)].add(term)
+
+    def rows(self, kind, term, restaurant=None):
+        """شماره ردیف نظرات مطابق؛ بدون رستوران یعنی همه رستوران‌ها (مرتب)"""
+        if restaurant is not None:
+            return self._postings.get((kind, term, restaurant), array('I'))
+        postings = [self._postings[(kind, term, r)] for r in self._restaurants_by_term.get((kind, term), ())]
+        return list(heapq.merge(*postings))
+
+    def count(self, kind, term, restaurant=None):
+        if restaurant is not None:
+            return len(self._postings.get((kind, term, restaurant), ()))
+        return sum(len(self._postings[(kind, term, r)])
+                   for r in self._restaurants_by_term.get((kind, term), ()))
+
+    def terms(self, kind, restaurant=None):
+        """عبارات ثبت شده برای یک رستوران (یا همه) به همراه تعداد نظرات"""
+        if restaurant is not None:
+            return {term: self.count(kind, term, restaurant)
+                    for term in self._terms_by_restaurant.get((kind, restaurant), ())}
+        return {term: self.count(kind, term)
+                for (term_kind, term) in self._restaurants_by_term if term_kind == kind}
+
+    def restaurants_for(self, kind, term):
+        """رستوران‌هایی که این عبارت در نظراتشان آمده، با تعداد نظرات"""
+        return {restaurant: len(self._postings[(kind, term, restaurant)])
+                for restaurant in self._restaurants_by_term.get((kind, term), ())}
+
+    def remove(self, restaurant, kind, term, row_id):
+        """حذف یک نظر از یک عبارت (برای به‌روزرسانی پس از تغییر واژه‌نامه)"""
+        key = (kind, term, restaurant)
+        posting = self._postings.get(key)
+        if posting is None:
+            return
+        index = bisect.bisect_left(posting, row_id)
+        if index < len(posting) and posting[index] == row_id:
+            del posting[index]
+        if not posting:
+            del self._postings[key]
+            self._restaurants_by_term[(kind, term)].discard(restaurant)
+            self._terms_by_restaurant[(kind, restaurant)].discard(term)
+            if not self._restaurants_by_term[(kind, term)]:
+                del self._restaurants_by_term[(kind, term)]
+
+    def insert(self, restaurant, kind, term, row_id):
+        """افزودن یک نظر در جای مرتب خود (برخلاف add که فقط به انتها اضافه می‌کند)"""
+        posting = self._postings[(kind, term, restaurant)]
+        index = bisect.bisect_left(posting, row_id)
+        if index == len(posting) or posting[index] != row_id:
+            posting.insert(index, row_id)
+        self._restaurants_by_term[(kind, term)].add(restaurant)
+        self._terms_by_restaurant[(kind, restaurant)].add(term)
+
+
+class CommentTokenIndex:
+    """ایندکس واژه‌های متن نظرات برای پیدا کردن نظرات شامل یک عبارت دلخواه"""
+
+    def __init__(self, comments):
+        postings = defaultdict(lambda: array('I'))
+        for row_id, comment in enumerate(comments):
+            for token in set(str(comment).lower().split()):
+                postings[token].append(row_id)
+        self._postings = dict(postings)
+
+    def candidates(self, term):
+        """ردیف‌هایی که ممکن است عبارت را (به صورت زیررشته) داشته باشند؛ بیش‌شمار، نه کم‌شمار"""
+        parts = term.lower().split()
+        if not parts:
+            return set()
+        # طولانی‌ترین بخش عبارت کمترین نامزد را دارد
+        anchor = max(parts, key=len)
+        rows = set()
+        for token, posting in self._postings.items():
+            if anchor in token:
+                rows.update(posting)
+        return rows
@@ -0,0 +1,167 @@
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
+
+from comment_index import CommentInvertedIndex
+from lazy_imports import lazy_module
+from lexicon import top_terms
+from nlp2 import RestaurantAnalyzer
+from ranking import RestaurantRanking
+from restaurant_identity import combine_analyses
+
+pd = lazy_module('pandas')
+
+
+def dataset_label(path):
+    """برچسب کوتاه هر فایل، مثلاً «اندرزگو_پیتزا استیک» برای «اندرزگو_پیتزا استیک_structured.csv»"""
+    name = os.path.basename(path)
+    for suffix in ('_structured.csv', '.csv'):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def load_datasets(paths, max_workers=None):
+    """خواندن همزمان چند فایل CSV؛ {برچسب: DataFrame} به ترتیب ورودی"""
+    with ThreadPoolExecutor(max_workers=max_workers or min(len(paths), 8)) as executor:
+        frames = list(executor.map(lambda path: pd.read_csv(path, encoding='utf-8'), paths))
+
+    datasets = {}
+    for path, frame in zip(paths, frames):
+        label = dataset_label(path)
+        # برچسب‌های تکراری (نام فایل یکسان در پوشه‌های مختلف) شماره می‌گیرند
+        unique_label, n = label, 2
+        while unique_label in datasets:
+            unique_label, n = f"{label} ({n})", n + 1
+        datasets[unique_label] = frame
+    return datasets
+
+
+class ComparativeAnalyzer(RestaurantAnalyzer):
+    """تحلیل چند مجموعه داده با یک پاکسازی و یک پیمایش واژه‌نامه روی همه نظرات"""
+
+    def __init__(self, datasets, sentiment_backend=None, deduplicate=None, instrumentation=None, lexicon=None):
+        """datasets: {برچسب: DataFrame}"""
+        self.dataset_labels = list(datasets)
+        combined = pd.concat([df.assign(dataset=label) for label, df in datasets.items()], ignore_index=True)
+        super().__init__(combined, sentiment_backend, deduplicate, instrumentation, lexicon)
+
+    def analyze_all_restaurants(self):
+        """تحلیل هر رستوران در هر مجموعه داده؛ تحلیل کل هر رستوران از ادغام آن‌ها ساخته می‌شود"""
+        self.comment_index = CommentInvertedIndex()
+        self.token_index = None
+        self.word_counts = {}
+        self.dataset_analyses = {label: {} for label in self.dataset_labels}
+
+        for (label, restaurant), data in self.df.groupby(['dataset', 'restaurant_name'], sort=False):
+            self.dataset_analyses[label][restaurant] = self.analyze_restaurant(restaurant, data)
+
+        with self.instrumentation.stage('dataset_rankings'):
+            self.dataset_rankings = {label: RestaurantRanking(analyses)
+                                     for label, analyses in self.dataset_analyses.items()}
+
+        by_restaurant = defaultdict(list)
+        for analyses in self.dataset_analyses.values():
+            for restaurant, analysis in analyses.items():
+                by_restaurant[restaurant].append(analysis)
+
+        restaurants_analysis = {}
+        for restaurant, analyses in by_restaurant.items():
+            combined = combine_analyses(analyses)
+            # کلمات کلیدی دقیق از شمارنده‌های کل رستوران
+            word_counts = self.word_counts[restaurant]
+            combined['top_positive_words'] = top_terms(word_counts['positive'])
+            combined['top_negative_words'] = top_terms(word_counts['negative'])
+            restaurants_analysis[restaurant] = combined
+        return restaurants_analysis
+
+    def apply_lexicon(self, new_lexicon):
+        """در حالت مقایسه آمار هر مجموعه جداگانه است؛ با تغییر واژه‌نامه تحلیل دوباره اجرا می‌شود"""
+        changed_terms = self.lexicon.changed_terms(new_lexicon)
+        issues_changed = self.lexicon.issue_names != new_lexicon.issue_names
+        self.lexicon = new_lexicon
+        result = {'changed_terms': sorted(changed_terms), 'issues_changed': issues_changed,
+                  'rescored_comments': 0, 'restaurants': []}
+        if changed_terms or issues_changed:
+            with self.instrumentation.stage('apply_lexicon'):
+                self.analyze_data()
+            result['rescored_comments'] = len(self.df)
+            result['restaurants'] = sorted(self.all_restaurants_analysis)
+        return result
+
+    def dataset_summary(self, label):
+        """آمار کلی یک مجموعه داده، با نرخ هر مشکل به درصد نظرات"""
+        analyses = self.dataset_analyses[label]
+        if not analyses:
+            return None
+        combined = combine_analyses(list(analyses.values()))
+        total = combined['total_comments']
+        return {
+            'label': label,
+            'restaurants': len(analyses),
+            'total_comments': total,
+            'average_rating': combined['average_rating'],
+            'positive_percentage': combined['positive_percentage'],
+            'issue_rates': {issue: (count / total) * 100 if total else 0
+                            for issue, count in combined['common_issues'].items()},
+            'best_restaurant': self.dataset_rankings[label].best(),
+        }
+
+
+class ComparisonView:
+    """تب مقایسه: نرخ مشکلات و رتبه‌بندی رستوران‌ها در هر مجموعه داده، کنار هم"""
+
+    def __init__(self, parent, analyzer, top_k=15):
+        self.parent = parent
+        self.analyzer = analyzer
+        self.top_k = top_k
+        self.refresh()
+
+    def refresh(self):
+        for widget in self.parent.winfo_children():
+            widget.destroy()
+
+        labels = self.analyzer.dataset_labels
+        summaries = {label: self.analyzer.dataset_summary(label) for label in labels}
+
+        # جدول آمار کلی و نرخ مشکلات (هر ستون یک مجموعه داده)
+        columns = ['metric'] + [f"d{i}" for i in range(len(labels))]
+        table = ttk.Treeview(self.parent, columns=columns, show='headings',
+                             height=len(self.analyzer.lexicon.issues) + 4)
+        table.heading('metric', text='شاخص')
+        table.column('metric', width=150)
+        for column, label in zip(columns[1:], labels):
+            table.heading(column, text=label)
+            table.column(column, width=140, anchor='center')
+
+        def row(title, fmt, key):
+            values = [fmt(summaries[label][key]) if summaries[label] else '-' for label in labels]
+            table.insert('', 'end', values=[title] + values)
+
+        row('تعداد نظرات', str, 'total_comments')
+        row('تعداد رستوران‌ها', str, 'restaurants')
+        row('میانگین امتیاز', lambda v: f"{v:.2f}", 'average_rating')
+        row('نظرات مثبت', lambda v: f"{v:.1f}%", 'positive_percentage')
+        for issue in self.analyzer.lexicon.issues:
+            values = [f"{summaries[label]['issue_rates'].get(issue, 0):.1f}%" if summaries[label] else '-'
+                      for label in labels]
+            table.insert('', 'end', values=[f"⚠️ {issue}"] + values)
+        table.pack(fill='x', padx=15, pady=(15, 10))
+
+        # رتبه‌بندی هر مجموعه داده در یک ستون
+        rankings_frame = ttk.Frame(self.parent)
+        rankings_frame.pack(fill='both', expand=True, padx=15, pady=(0, 15))
+        for label in labels:
+            frame = ttk.LabelFrame(rankings_frame, text=f"🏆 {label}")
+            frame.pack(side='right', fill='both', expand=True, padx=5)
+            tree = ttk.Treeview(frame, columns=('rank', 'name', 'score'), show='headings')
+            tree.heading('rank', text='رتبه')
+            tree.heading('name', text='رستوران')
+            tree.heading('score', text='امتیاز')
+            tree.column('rank', width=40, anchor='center')
+            tree.column('name', width=200)
+            tree.column('score', width=60, anchor='center')
+            for rank, (name, score) in enumerate(self.analyzer.dataset_rankings[label].top(self.top_k), 1):
+                tree.insert('', 'end', values=(rank, name, f"{score:.2f}"))
+            tree.pack(fill='both', expand=True)
@@ -0,0 +1,103 @@
+import zlib
+
+import numpy as np
+
+from persian_text import normalize_persian
+
+
+# عدد اول مرسن برای هش‌های جهانی MinHash
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class NearDuplicateDetector:
+    """تشخیص نظرات تقریباً تکراری با امضای MinHash و هش حساس به محل (LSH)"""
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, shingle_size=5, min_length=15, seed=1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm باید بر تعداد باندها بخش‌پذیر باشد")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.shingle_size = shingle_size
+        # نظرات خیلی کوتاه (مثل «عالی») تکراری حساب نمی‌شوند
+        self.min_length = min_length
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text):
+        """مجموعه هش n-gramهای حرفی متن نرمال‌شده"""
+        text = normalize_persian(text)
+        if len(text) < self.min_length:
+            return None
+        k = self.shingle_size
+        return {zlib.crc32(text[i:i + k].encode('utf-8')) for i in range(len(text) - k + 1)}
+
+    def signature(self, shingles):
+        """امضای MinHash یک مجموعه شینگل"""
+        values = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        # (a*x + b) mod p؛ ضرب در uint64 سرریز می‌کند ولی برای MinHash کافی است
+        hashed = (self._a[:, None] * values[None, :] + self._b[:, None]) % np.uint64(_MERSENNE_PRIME)
+        return (hashed & np.uint64(_MAX_HASH)).min(axis=1).astype(np.uint32)
+
+    def find_duplicates(self, texts):
+        """برای هر نظر اندیس اولین نظر مشابه (یا خودش) را برمی‌گرداند"""
+        texts = list(texts)
+        parent = list(range(len(texts)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(i, j):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                # نماینده هر خوشه کوچک‌ترین اندیس است تا اولین نظر حفظ شود
+                if root_i < root_j:
+                    parent[root_j] = root_i
+                else:
+                    parent[root_i] = root_j
+
+        signatures = {}
+        for i, text in enumerate(texts):
+            shingles = self.shingles(text)
+            if shingles:
+                signatures[i] = self.signature(shingles)
+
+        # در هر باند فقط با اولین عضو سطل مقایسه می‌کنیم؛ هزینه خطی در اندازه سطل
+        r = self.rows_per_band
+        for band in range(self.bands):
+            buckets = {}
+            for i, sig in signatures.items():
+                key = sig[band * r:(band + 1) * r].tobytes()
+                first = buckets.setdefault(key, i)
+                if first != i and find(first) != find(i):
+                    similarity = np.mean(signatures[first] == sig)
+                    if similarity >= self.threshold:
+                        union(first, i)
+
+        return [find(i) for i in range(len(texts))]
+
+
+def mark_duplicates(df, column='comment_text', **detector_options):
+    """افزودن ستون‌های duplicate_of و is_duplicate به DataFrame"""
+    detector = NearDuplicateDetector(**detector_options)
+    representatives = detector.find_duplicates(df[column].astype(str).tolist())
+
+    df = df.copy()
+    positions = np.arange(len(df))
+    representatives = np.asarray(representatives, dtype=np.int64)
+    df['is_duplicate'] = representatives != positions
+    df['duplicate_of'] = np.where(df['is_duplicate'], representatives, -1)
+    return df
+
+
+def collapse_duplicates(df, column='comment_text', **detector_options):
+    """حذف نظرات تکراری و نگه داشتن اولین نمونه هر خوشه"""
+    marked = mark_duplicates(df, column, **detector_options)
+    return marked[~marked['is_duplicate']].drop(columns=['is_duplicate', 'duplicate_of'])
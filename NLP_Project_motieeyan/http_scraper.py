@@ -0,0 +1,322 @@
+import argparse
+import asyncio
+import csv
+import http.client
+import json
+import re
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+from persian_text import format_jalali_date, gregorian_to_jalali, normalize_persian
+from progress_channel import ProgressTracker
+
+try:
+    # کلاینت HTTP ناهمگام با connection pool (اختیاری)
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+# آدرس‌ها و نام فیلدهای پاسخ JSON؛ با فایل --config قابل تغییرند
+DEFAULT_CONFIG = {
+    'vendors_url': ('https://snappfood.ir/search/api/v1/desktop/vendors-list'
+                    '?lat={lat}&long={lng}&query={food}&page={page}&page_size={page_size}'),
+    'comments_url': 'https://snappfood.ir/mobile/v1/user-comment?vendorCode={vendor_code}&page={page}',
+    'vendors_path': ['data', 'finalResult'],
+    'vendor_item_path': ['data'],
+    'vendor_name_field': 'title',
+    'vendor_code_field': 'code',
+    'comments_path': ['data', 'comments'],
+    'comment_text_field': 'commentText',
+    'comment_date_field': 'createdDate',
+    'comment_rating_field': 'rate',
+    # مختصات هر محله: {"اندرزگو": [35.80, 51.47]}
+    'locations': {},
+    'page_size': 20,
+    'max_vendor_pages': 5,
+    'max_comment_pages': 10,
+    'headers': {'User-Agent': 'Mozilla/5.0', 'Accept': 'application/json'},
+}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# خطاهای شبکه (قطع اتصال، timeout سوکت و ...) مانند وضعیت‌های بالا دوباره تلاش می‌شوند
+TRANSPORT_ERRORS = (OSError, asyncio.TimeoutError, http.client.HTTPException)
+if aiohttp is not None:
+    TRANSPORT_ERRORS += (aiohttp.ClientError,)
+# خطاهایی که روی اتصال keep-alive استفاده شده یعنی سرور اتصال بیکار را بسته است
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+_NUMERIC_DATE = re.compile(r'(\d{4})[-/](\d{1,2})[-/](\d{1,2})')
+
+
+def load_config(path=None):
+    """تنظیمات پیش‌فرض به همراه مقادیر فایل JSON داده شده"""
+    config = dict(DEFAULT_CONFIG)
+    if path:
+        with open(path, encoding='utf-8') as f:
+            config.update(json.load(f))
+    return config
+
+
+def dig(data, path):
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def format_review_date(value):
+    """تبدیل تاریخ API (میلادی یا شمسی عددی) به قالب اسکرپر، مثلاً «۱۹ آبان ۱۴۰۴»"""
+    text = normalize_persian(value or '')
+    match = _NUMERIC_DATE.search(text)
+    if not match:
+        return str(value or '').strip()
+    year, month, day = (int(part) for part in match.groups())
+    if year > 1700:
+        year, month, day = gregorian_to_jalali(year, month, day)
+    return format_jalali_date(year, month, day)
+
+
+def format_review_rating(value):
+    """امتیاز ۱ تا ۵ مانند اسکرپر مرورگر؛ مقدار نامعتبر رشته خالی"""
+    try:
+        rating = int(round(float(value)))
+    except (TypeError, ValueError):
+        return ""
+    return rating if 1 <= rating <= 5 else ""
+
+
+class RateLimiter:
+    """حداقل فاصله بین شروع درخواست‌ها (requests_per_second در کل کلاینت)"""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1 / requests_per_second if requests_per_second else 0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next = max(self._next, loop.time()) + self.interval
+
+
+class AiohttpClient:
+    """کلاینت aiohttp با TCPConnector محدود به تعداد اتصال همزمان"""
+
+    def __init__(self, concurrency, headers, timeout):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=concurrency),
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        )
+
+    async def get(self, url):
+        async with self.session.get(url) as response:
+            return response.status, await response.read()
+
+    async def close(self):
+        await self.session.close()
+
+
+class ThreadedHttpClient:
+    """جایگزین بدون وابستگی: http.client با اتصال keep-alive جداگانه برای هر thread"""
+
+    def __init__(self, concurrency, headers, timeout):
+        self.headers = headers
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self, scheme, netloc):
+        pool = getattr(self._local, 'connections', None)
+        if pool is None:
+            pool = self._local.connections = {}
+        connection = pool.get((scheme, netloc))
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            connection = pool[(scheme, netloc)] = connection_class(netloc, timeout=self.timeout)
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _get(self, url):
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        while True:
+            connection = self._connection(parts.scheme, parts.netloc)
+            reused = connection.sock is not None
+            try:
+                connection.request('GET', path, headers=self.headers)
+                response = connection.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                self._local.connections.pop((parts.scheme, parts.netloc), None)
+                # فقط اتصال keep-alive که سرور در این فاصله بسته است با اتصال تازه جایگزین می‌شود؛
+                # تلاش دوباره برای بقیه خطاها با fetch_json است
+                if not (reused and isinstance(e, STALE_CONNECTION_ERRORS)):
+                    raise
+
+    async def get(self, url):
+        return await asyncio.to_thread(self._get, url)
+
+    async def close(self):
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+
+
+class HttpScraper:
+    """اسکرپر HTTP ناهمگام: فهرست رستوران‌ها و صفحات نظرات با موازی‌سازی محدود"""
+
+    def __init__(self, config=None, concurrency=8, requests_per_second=10, retries=3, timeout=20, backoff=0.5):
+        self.config = config or load_config()
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.requests_made = 0
+        self.client = None
+
+    async def __aenter__(self):
+        client_class = AiohttpClient if aiohttp is not None else ThreadedHttpClient
+        self.client = client_class(self.concurrency, self.config['headers'], self.timeout)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._limiter = RateLimiter(self.requests_per_second)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.close()
+
+    async def fetch_json(self, url):
+        """دریافت JSON با محدودیت همزمانی و نرخ، و تلاش دوباره برای خطاهای موقت"""
+        for attempt in range(self.retries + 1):
+            async with self._semaphore:
+                await self._limiter.wait()
+                self.requests_made += 1
+                try:
+                    status, body = await self.client.get(url)
+                except TRANSPORT_ERRORS as e:
+                    if attempt == self.retries:
+                        raise RuntimeError(f"خطای شبکه برای {url}: {e}") from e
+                    status = None
+            if status == 200:
+                return json.loads(body.decode('utf-8'))
+            if status is not None and (status not in RETRY_STATUSES or attempt == self.retries):
+                raise RuntimeError(f"HTTP {status} برای {url}")
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def list_vendors(self, neighborhood, food):
+        """رستوران‌های یک محله و غذا به صورت (نام، کد)"""
+        config = self.config
+        location = config['locations'].get(neighborhood)
+        if location is None:
+            raise ValueError(f"مختصات محله '{neighborhood}' در تنظیمات (locations) وجود ندارد")
+
+        vendors = []
+        for page in range(config['max_vendor_pages']):
+            url = config['vendors_url'].format(lat=location[0], lng=location[1], food=quote(food),
+                                               page=page, page_size=config['page_size'])
+            items = dig(await self.fetch_json(url), config['vendors_path']) or []
+            for item in items:
+                vendor = dig(item, config['vendor_item_path'])
+                if vendor and vendor.get(config['vendor_code_field']):
+                    vendors.append(((vendor.get(config['vendor_name_field']) or '').strip(),
+                                    vendor[config['vendor_code_field']]))
+            if len(items) < config['page_size']:
+                break
+        return vendors
+
+    async def fetch_comments(self, name, vendor_code):
+        """همه صفحات نظرات یک رستوران با ساختار خروجی اسکرپر مرورگر"""
+        config = self.config
+        rows = []
+        for page in range(config['max_comment_pages']):
+            url = config['comments_url'].format(vendor_code=quote(str(vendor_code)), page=page)
+            comments = dig(await self.fetch_json(url), config['comments_path']) or []
+            for comment in comments:
+                rows.append({
+                    "restaurant_name": name,
+                    "comment_text": str(comment.get(config['comment_text_field']) or '').strip(),
+                    "date": format_review_date(comment.get(config['comment_date_field'])),
+                    "rating": format_review_rating(comment.get(config['comment_rating_field'])),
+                })
+            if not comments:
+                break
+        return rows
+
+    async def scrape(self, neighborhood, food, progress=None):
+        """progress: همان رویدادهای started/restaurant_done اسکرپر مرورگر"""
+        vendors = await self.list_vendors(neighborhood, food)
+        tracker = ProgressTracker(len(vendors))
+        if progress:
+            progress('started', total=len(vendors))
+
+        results = [None] * len(vendors)
+        done = 0
+        comments_so_far = 0
+
+        async def run(index, name, code):
+            nonlocal done, comments_so_far
+            try:
+                results[index] = await self.fetch_comments(name, code)
+            except Exception as e:
+                print(f"   > Error on {name}: {e}")
+                results[index] = []
+            done += 1
+            comments_so_far += len(results[index])
+            tracker.step()
+            if progress:
+                progress('restaurant_done', index=done, total=len(vendors), rows=results[index],
+                         comments_so_far=comments_so_far, eta=tracker.eta_seconds)
+
+        await asyncio.gather(*(run(i, name, code) for i, (name, code) in enumerate(vendors)))
+        # ترتیب خروجی مانند اسکرپر مرورگر: به ترتیب فهرست رستوران‌ها
+        return [row for rows in results for row in rows]
+
+
+def http_scrape(neighborhood, food, config=None, progress=None, **options):
+    """اجرای همگام اسکرپر HTTP (قابل استفاده در ScrapeScheduler و ScraperGUI)"""
+    from scrapy2 import clean_and_validate_data
+
+    async def run():
+        async with HttpScraper(config, **options) as scraper:
+            return await scraper.scrape(neighborhood, food, progress)
+
+    return clean_and_validate_data(asyncio.run(run()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="جمع‌آوری نظرات رستوران‌ها از طریق HTTP (بدون مرورگر)")
+    parser.add_argument('neighborhood')
+    parser.add_argument('food')
+    parser.add_argument('--config', help="فایل JSON تنظیمات آدرس‌ها و مختصات محله‌ها")
+    parser.add_argument('--concurrency', type=int, default=8, help="حداکثر درخواست همزمان")
+    parser.add_argument('--rps', type=float, default=10, help="حداکثر درخواست در ثانیه")
+    parser.add_argument('-o', '--output', help="مسیر فایل CSV خروجی")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = http_scrape(args.neighborhood, args.food, load_config(args.config),
+                       concurrency=args.concurrency, requests_per_second=args.rps)
+    output = args.output or f"{args.neighborhood}_{args.food}_structured.csv"
+    with open(output, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['restaurant_name', 'comment_text', 'date', 'rating'])
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"✅ {len(rows)} نظر در {time.perf_counter() - start:.1f} ثانیه در {output} ذخیره شد")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import io
+import json
+import time
+from contextlib import contextmanager
+
+from lazy_imports import lazy_module
+
+# ابزار پروفایل فقط با --profile لازم است؛ ایمپورت آن‌ها به راه‌اندازی nlp2 اضافه نمی‌شود
+cProfile = lazy_module('cProfile')
+pstats = lazy_module('pstats')
+tracemalloc = lazy_module('tracemalloc')
+
+
+class Instrumentation:
+    """زمان‌سنج و شمارنده مراحل تحلیل، با پروفایل cProfile/tracemalloc اختیاری"""
+
+    def __init__(self, profile=False, trace_memory=False):
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.counters = {}
+        self._order = []
+        self._profiler = None
+        self._profile_text = None
+        self._memory_peak_mb = None
+        # فقط اگر خود start ردیابی حافظه را روشن کرده باشد، stop آن را خاموش می‌کند
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name):
+        """اندازه‌گیری زمان یک مرحله (تکرار یک مرحله تجمیع می‌شود)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = {'calls': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+                self._order.append(name)
+            stats['calls'] += 1
+            stats['total_seconds'] += elapsed
+            stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def start(self):
+        """شروع پروفایل‌های اختیاری"""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self):
+        """پایان پروفایل‌ها و نگه داشتن خلاصه آن‌ها"""
+        if self._profiler is not None:
+            self._profiler.disable()
+            buffer = io.StringIO()
+            pstats.Stats(self._profiler, stream=buffer).sort_stats('cumulative').print_stats(20)
+            self._profile_text = buffer.getvalue()
+            self._profiler = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            self._memory_peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def report(self):
+        """گزارش ساخت‌یافته قابل ذخیره در JSON"""
+        stages = {}
+        for name in self._order:
+            stats = self.stages[name]
+            stages[name] = dict(stats, mean_seconds=stats['total_seconds'] / stats['calls'])
+        return {
+            'stages': stages,
+            'counters': dict(self.counters),
+            'memory_peak_mb': self._memory_peak_mb,
+            'profile': self._profile_text,
+        }
+
+    def format_report(self):
+        """متن خوانا برای نمایش در رابط گرافیکی"""
+        lines = ["⏱️ زمان‌بندی مراحل تحلیل:"]
+        for name, stats in self.report()['stages'].items():
+            calls = f" ({stats['calls']} بار)" if stats['calls'] > 1 else ""
+            lines.append(f"• {name}: {stats['total_seconds'] * 1000:.1f} میلی‌ثانیه{calls}")
+        if self.counters:
+            lines.append("\n🔢 شمارنده‌ها:")
+            lines.extend(f"• {name}: {value}" for name, value in self.counters.items())
+        if self._memory_peak_mb is not None:
+            lines.append(f"\n💾 اوج حافظه: {self._memory_peak_mb:.1f} MB")
+        if self._profile_text:
+            lines.append("\n🔬 پروفایل cProfile:\n" + self._profile_text)
+        return "\n".join(lines)
+
+    def export_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
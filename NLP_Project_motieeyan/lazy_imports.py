@@ -0,0 +1,26 @@
+import importlib
+
+
+class LazyModule:
+    """ماژولی که فقط در اولین دسترسی به یکی از ویژگی‌هایش ایمپورت می‌شود"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name):
+    """ساخت ارجاع تنبل به یک ماژول سنگین (مثل pandas)"""
+    return LazyModule(name)
@@ -0,0 +1,153 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import re
+
+
+# با تغییر ساختار CompiledLexicon این عدد را افزایش دهید تا فایل‌های کامپایل قدیمی نادیده گرفته شوند
+FORMAT_VERSION = 2
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_LEXICON_PATH = os.path.join(HERE, 'lexicons', 'lexicon.json')
+
+
+class CompiledLexicon:
+    """واژه‌نامه کامپایل شده احساسات و مشکلات (یک منبع برای همه تحلیل‌ها)"""
+
+    def __init__(self, positive, negative, issues, source_hash=None):
+        self.positive = frozenset(positive)
+        self.negative = frozenset(negative)
+        self.issues = {issue: tuple(keywords) for issue, keywords in issues.items()}
+        self.source_hash = source_hash
+        self.source_path = None
+
+        # واژه‌های تکی با مجموعه و عبارات چندکلمه‌ای با جستجوی زیررشته پیدا می‌شوند
+        self.positive_words = frozenset(w for w in self.positive if ' ' not in w)
+        self.negative_words = frozenset(w for w in self.negative if ' ' not in w)
+        self.phrases = {phrase: phrase in self.positive
+                        for phrase in sorted(self.positive | self.negative) if ' ' in phrase}
+        # طولانی‌ترین عبارت اول، تا «خیلی عالی بود» پیش از «عالی بود» انتخاب شود
+        self._phrase_pattern = re.compile(
+            '|'.join(re.escape(p) for p in sorted(self.phrases, key=lambda p: (-len(p), p)))
+        ) if self.phrases else None
+        self._issue_patterns = [
+            (issue, re.compile('|'.join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)))
+             if keywords else None)
+            for issue, keywords in self.issues.items()
+        ]
+
+    @classmethod
+    def from_dict(cls, data, source_hash=None):
+        return cls(data.get('positive', ()), data.get('negative', ()), data.get('issues', {}), source_hash)
+
+    @property
+    def issue_names(self):
+        return list(self.issues)
+
+    def match_sentiment(self, text):
+        """(احساس، واژه‌های مثبت، واژه‌های منفی) یک نظر"""
+        found_positive = []
+        found_negative = []
+        if self._phrase_pattern is not None:
+            # کلمات یک عبارت پیدا شده مصرف می‌شوند و جداگانه دوباره شمرده نمی‌شوند
+            for match in self._phrase_pattern.finditer(text):
+                phrase = match.group()
+                (found_positive if self.phrases[phrase] else found_negative).append(phrase)
+            text = self._phrase_pattern.sub(' ', text)
+
+        words = text.split()
+        found_positive += [word for word in words if word in self.positive_words]
+        found_negative += [word for word in words if word in self.negative_words]
+
+        if len(found_positive) > len(found_negative):
+            emotion = 'مثبت'
+        elif len(found_negative) > len(found_positive):
+            emotion = 'منفی'
+        else:
+            emotion = 'خنثی'
+        return emotion, found_positive, found_negative
+
+    def match_issues(self, text):
+        """نام مشکلاتی که یکی از کلمات کلیدی‌شان در نظر آمده است"""
+        text = text.lower()
+        return [issue for issue, pattern in self._issue_patterns
+                if pattern is not None and pattern.search(text)]
+
+    def terms(self):
+        terms = set(self.positive | self.negative)
+        for keywords in self.issues.values():
+            terms.update(keywords)
+        return terms
+
+    def changed_terms(self, other):
+        """عباراتی که بین دو نسخه اضافه، حذف یا جابه‌جا شده‌اند"""
+        changed = (self.positive ^ other.positive) | (self.negative ^ other.negative)
+        for issue in set(self.issues) | set(other.issues):
+            changed |= set(self.issues.get(issue, ())) ^ set(other.issues.get(issue, ()))
+        return changed
+
+
+def top_terms(counts, n=5):
+    """n عبارت پرتکرار با ترتیب قطعی (تعداد نزولی، سپس خود عبارت)؛ تعدادهای صفر و منفی کنار می‌روند"""
+    items = sorted(((term, count) for term, count in counts.items() if count > 0),
+                   key=lambda item: (-item[1], item[0]))
+    return dict(items[:n])
+
+
+def artifact_path(path):
+    """مسیر فایل کامپایل شده کنار فایل واژه‌نامه"""
+    return os.path.splitext(path)[0] + '.compiled.pickle'
+
+
+def load_lexicon(path=None, use_cache=True):
+    """خواندن واژه‌نامه؛ اگر فایل کامپایل شده با همان hash و نسخه موجود باشد از آن استفاده می‌شود"""
+    path = os.path.abspath(path or DEFAULT_LEXICON_PATH)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+
+    cache_path = artifact_path(path)
+    lexicon = None
+    if use_cache and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                artifact = pickle.load(f)
+            if artifact.get('format') == FORMAT_VERSION and artifact.get('source_hash') == digest:
+                lexicon = artifact['lexicon']
+        except (OSError, EOFError, AttributeError, KeyError, ImportError, pickle.UnpicklingError):
+            # فایل کامپایل خراب یا قدیمی (مثلاً اشاره به ماژول تغییر نام داده) از نو ساخته می‌شود
+            lexicon = None
+
+    if lexicon is None:
+        lexicon = CompiledLexicon.from_dict(json.loads(raw.decode('utf-8-sig')), digest)
+        if use_cache:
+            try:
+                # نوشتن در فایل موقت و جایگزینی، تا خواننده همزمان فایل نیمه‌کاره نبیند
+                temp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(temp_path, 'wb') as f:
+                    pickle.dump({'format': FORMAT_VERSION, 'source_hash': digest, 'lexicon': lexicon}, f,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, cache_path)
+            except OSError as e:
+                print(f"⚠️ ذخیره واژه‌نامه کامپایل شده ممکن نشد: {e}")
+
+    lexicon.source_path = path
+    return lexicon
+
+
+def main():
+    parser = argparse.ArgumentParser(description="کامپایل واژه‌نامه احساسات و مشکلات")
+    parser.add_argument('path', nargs='?', default=DEFAULT_LEXICON_PATH, help="فایل JSON واژه‌نامه")
+    args = parser.parse_args()
+
+    lexicon = load_lexicon(args.path)
+    print(f"✅ واژه‌نامه کامپایل شد: {artifact_path(lexicon.source_path)}")
+    print(f"• واژه‌های مثبت: {len(lexicon.positive)}")
+    print(f"• واژه‌های منفی: {len(lexicon.negative)}")
+    print(f"• دسته‌های مشکلات: {len(lexicon.issues)}")
+    print(f"• نسخه: {lexicon.source_hash[:12]}")
+
+
+if __name__ == "__main__":
+    main()
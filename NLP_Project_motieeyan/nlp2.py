@@ -1,23 +1,58 @@
-import pandas as pd
 import re
-import numpy as np
 from collections import Counter
-import matplotlib.pyplot as plt
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import json
 import os
 import sys
 from tkinter import scrolledtext
 
+from comment_index import CommentInvertedIndex, CommentTokenIndex
+from instrumentation import Instrumentation
+from lexicon import load_lexicon, top_terms
+from ranking import RestaurantRanking
+from lazy_imports import lazy_module
+from restaurant_identity import RestaurantIdentityIndex, parse_restaurant_name
+from restaurant_search import RestaurantSearchIndex
+from virtual_list import VirtualRestaurantList
+
+# pandas و numpy در اولین استفاده بارگذاری می‌شوند تا پنجره انتخاب فایل سریع‌تر باز شود
+pd = lazy_module('pandas')
+np = lazy_module('numpy')
+
 
 # کلاس اصلی برای تحلیل داده‌ها
 class RestaurantAnalyzer:
-    def __init__(self, df):
+    def __init__(self, df, sentiment_backend=None, deduplicate=None, instrumentation=None, lexicon=None):
         self.df = df
-        self.clean_data()
-        self.analyze_data()
+        # واژه‌نامه مشترک احساسات و مشکلات (lexicons/lexicon.json به صورت پیش‌فرض)
+        self.lexicon = lexicon or load_lexicon()
+        # موتور احساسات جایگزین (مثلاً LinearSentimentModel)؛ None یعنی واژه‌نامه
+        self.sentiment_backend = sentiment_backend
+        # None: بدون بررسی، 'flag': علامت‌گذاری، 'collapse': حذف نظرات تقریباً تکراری
+        self.deduplicate = deduplicate
+        # زمان‌سنج مراحل؛ برای cProfile/tracemalloc یک Instrumentation(profile=True) بدهید
+        self.instrumentation = instrumentation or Instrumentation()
+
+        self.instrumentation.start()
+        try:
+            with self.instrumentation.stage('clean_data'):
+                self.clean_data()
+            with self.instrumentation.stage('analyze_data'):
+                self.analyze_data()
+        finally:
+            self.instrumentation.stop()
+
+    @classmethod
+    def from_warehouse(cls, db_path, match=None, neighborhood=None, food=None, sentiment_backend=None):
+        """ساخت تحلیل‌گر از نتیجه یک جستجو در انبار SQLite"""
+        from warehouse import ReviewWarehouse
+
+        with ReviewWarehouse(db_path) as warehouse:
+            df = warehouse.query_dataframe(match=match, neighborhood=neighborhood, food=food)
+        if df.empty:
+            raise ValueError("هیچ نظری با این جستجو در انبار داده یافت نشد")
+        return cls(df, sentiment_backend)
 
     def clean_data(self):
         """پاکسازی داده‌ها"""
@@ -25,6 +60,7 @@ class RestaurantAnalyzer:
 
         # نمایش اطلاعات اولیه
         print(f"تعداد داده‌ها قبل از پاکسازی: {len(self.df)}")
+        self.instrumentation.count('rows_before_clean', len(self.df))
         print(f"ستون‌های موجود: {list(self.df.columns)}")
 
         # بررسی ستون‌های ضروری
@@ -43,9 +79,35 @@ class RestaurantAnalyzer:
         self.df['comment_text'] = self.df['comment_text'].fillna('')
         self.df['restaurant_name'] = self.df['restaurant_name'].fillna('نامشخص')
 
+        # یکسان‌سازی املاهای مختلف یک شعبه (ي/ی، ك/ک، فاصله‌ها)
+        self.identity_index = RestaurantIdentityIndex(self.df['restaurant_name'].unique())
+        self.df['restaurant_name'] = self.df['restaurant_name'].map(self.identity_index.display_name)
+
+        if self.deduplicate:
+            self.remove_near_duplicates()
+
+        # شماره ردیف‌ها پیوسته می‌شوند تا ایندکس نظرات با iloc به متن برسد
+        self.df = self.df.reset_index(drop=True)
+
         print(f"✅ تعداد داده‌ها پس از پاکسازی: {len(self.df)}")
+        self.instrumentation.count('rows_after_clean', len(self.df))
         print(f"✅ امتیازهای معتبر: {self.df['rating_clean'].notna().sum()}")
 
+    def remove_near_duplicates(self):
+        """علامت‌گذاری یا حذف نظرات تقریباً تکراری (مثلاً نظرات مشترک شعبه‌های یک زنجیره)"""
+        from dedup import mark_duplicates
+
+        if self.deduplicate not in ('flag', 'collapse'):
+            raise ValueError(f"حالت نامعتبر برای حذف تکراری‌ها: {self.deduplicate}")
+
+        self.df = mark_duplicates(self.df.reset_index(drop=True))
+        duplicates = int(self.df['is_duplicate'].sum())
+        print(f"🔁 نظرات تقریباً تکراری: {duplicates}")
+
+        if self.deduplicate == 'collapse':
+            self.df = self.df[~self.df['is_duplicate']]
+            print(f"✅ {duplicates} نظر تکراری حذف شد")
+
     def safe_convert_to_numeric(self, value):
         """تبدیل امن به عدد"""
         if pd.isna(value) or value == '' or value == ' ':
@@ -58,9 +120,20 @@ class RestaurantAnalyzer:
     def analyze_data(self):
         """انجام تمام تحلیل‌ها"""
         print("📊 در حال تحلیل داده‌ها...")
-        self.basic_stats = self.get_basic_statistics()
-        self.all_restaurants_analysis = self.analyze_all_restaurants()
-        self.best_restaurant = self.find_best_restaurant()
+        stage = self.instrumentation.stage
+        if self.sentiment_backend is not None:
+            # پیش‌بینی دسته‌ای یک‌باره برای همه نظرات
+            with stage('sentiment_backend'):
+                self.df['emotion'] = self.sentiment_backend.predict_labels(self.df['comment_text'].tolist())
+        with stage('get_basic_statistics'):
+            self.basic_stats = self.get_basic_statistics()
+        with stage('analyze_all_restaurants'):
+            self.all_restaurants_analysis = self.analyze_all_restaurants()
+        with stage('aggregate_brands'):
+            self.brand_analysis = self.identity_index.aggregate_brands(self.all_restaurants_analysis,
+                                                                       self.word_counts)
+        with stage('find_best_restaurant'):
+            self.best_restaurant = self.find_best_restaurant()
         print("✅ تحلیل داده‌ها کامل شد")
 
     def get_basic_statistics(self):
@@ -74,96 +147,93 @@ class RestaurantAnalyzer:
         stats['rating_distribution'] = valid_ratings.value_counts().sort_index().to_dict()
         stats['restaurant_count'] = self.df['restaurant_name'].nunique()
         stats['restaurant_names'] = sorted(self.df['restaurant_name'].unique().tolist())
+        stats['brand_count'] = self.identity_index.brand_count
+        if 'is_duplicate' in self.df.columns:
+            stats['duplicate_comments'] = int(self.df['is_duplicate'].sum())
 
         return stats
 
     def analyze_all_restaurants(self):
         """تحلیل کامل همه رستوران‌ها"""
         restaurants_analysis = {}
+        # ایندکس معکوس مشکلات و کلمات به نظرات، در همین پیمایش ساخته می‌شود
+        self.comment_index = CommentInvertedIndex()
+        # ایندکس واژه‌های متن فقط با اولین بارگذاری دوباره واژه‌نامه ساخته می‌شود
+        self.token_index = None
+        self.word_counts = {}
 
-        for restaurant in self.df['restaurant_name'].unique():
-            restaurant_data = self.df[self.df['restaurant_name'] == restaurant]
-            ratings = restaurant_data['rating_clean'].dropna()
-            comments = restaurant_data['comment_text'].tolist()
+        for restaurant, restaurant_data in self.df.groupby('restaurant_name', sort=False):
+            restaurants_analysis[restaurant] = self.analyze_restaurant(restaurant, restaurant_data)
+
+        return restaurants_analysis
 
-            # تحلیل احساسات
+    def analyze_restaurant(self, restaurant, restaurant_data):
+        """تحلیل نظرات یک رستوران و ثبت آن‌ها در ایندکس‌ها"""
+        stage = self.instrumentation.stage
+        ratings = restaurant_data['rating_clean'].dropna()
+        comments = restaurant_data['comment_text'].tolist()
+        row_ids = restaurant_data.index.tolist()
+        self.instrumentation.count('restaurants')
+        self.instrumentation.count('comments_analyzed', len(comments))
+
+        # تحلیل احساسات (واژه‌های یافته شده برای کلمات کلیدی و ایندکس همیشه لازم‌اند)
+        with stage('persian_sentiment_analysis_for_restaurant'):
             sentiment_analysis = self.persian_sentiment_analysis_for_restaurant(comments)
-            emotion_dist = Counter([item['emotion'] for item in sentiment_analysis])
-
-            # تحلیل مشکلات
-            common_issues = self.analyze_common_issues_for_restaurant(comments)
-
-            # کلمات کلیدی
-            top_positive_words = self.extract_top_words(comments, 'positive')
-            top_negative_words = self.extract_top_words(comments, 'negative')
-
-            # محاسبه درصدهای احساسات
-            total_sentiments = len(sentiment_analysis)
-            positive_percentage = (emotion_dist['مثبت'] / total_sentiments) * 100 if total_sentiments > 0 else 0
-            negative_percentage = (emotion_dist['منفی'] / total_sentiments) * 100 if total_sentiments > 0 else 0
-            neutral_percentage = (emotion_dist['خنثی'] / total_sentiments) * 100 if total_sentiments > 0 else 0
-
-            restaurants_analysis[restaurant] = {
-                'total_comments': len(restaurant_data),
-                'average_rating': ratings.mean() if len(ratings) > 0 else 0,
-                'rating_distribution': ratings.value_counts().sort_index().to_dict(),
-                'sentiment_distribution': dict(emotion_dist),
-                'sentiment_percentages': {
-                    'مثبت': positive_percentage,
-                    'منفی': negative_percentage,
-                    'خنثی': neutral_percentage
-                },
-                'common_issues': common_issues,
-                'positive_percentage': positive_percentage,
-                'top_positive_words': top_positive_words,
-                'top_negative_words': top_negative_words,
-                'comments_sample': comments[:5]
+            if self.sentiment_backend is not None:
+                emotion_dist = Counter(restaurant_data['emotion'])
+            else:
+                emotion_dist = Counter([item['emotion'] for item in sentiment_analysis])
+            for row_id, item in zip(row_ids, sentiment_analysis):
+                for word in set(item['positive_words'] + item['negative_words']):
+                    self.comment_index.add(restaurant, CommentInvertedIndex.WORD, word, row_id)
+
+        # تحلیل مشکلات
+        with stage('analyze_common_issues_for_restaurant'):
+            common_issues = self.analyze_common_issues_for_restaurant(comments, row_ids, restaurant)
+
+        # کلمات کلیدی (از همان نتایج تحلیل احساسات، بدون پیمایش دوباره نظرات)
+        with stage('extract_top_words'):
+            word_counts = {
+                'positive': Counter(w for item in sentiment_analysis for w in item['positive_words']),
+                'negative': Counter(w for item in sentiment_analysis for w in item['negative_words']),
             }
-
-        return restaurants_analysis
+            # شمارنده‌های کل رستوران (در حالت مقایسه یک رستوران در چند مجموعه داده می‌آید)
+            totals = self.word_counts.setdefault(restaurant, {'positive': Counter(), 'negative': Counter()})
+            totals['positive'].update(word_counts['positive'])
+            totals['negative'].update(word_counts['negative'])
+            top_positive_words = top_terms(word_counts['positive'])
+            top_negative_words = top_terms(word_counts['negative'])
+
+        # محاسبه درصدهای احساسات
+        total_sentiments = sum(emotion_dist.values())
+        positive_percentage = (emotion_dist['مثبت'] / total_sentiments) * 100 if total_sentiments > 0 else 0
+        negative_percentage = (emotion_dist['منفی'] / total_sentiments) * 100 if total_sentiments > 0 else 0
+        neutral_percentage = (emotion_dist['خنثی'] / total_sentiments) * 100 if total_sentiments > 0 else 0
+
+        return {
+            'total_comments': len(restaurant_data),
+            'average_rating': ratings.mean() if len(ratings) > 0 else 0,
+            'rating_distribution': ratings.value_counts().sort_index().to_dict(),
+            'sentiment_distribution': dict(emotion_dist),
+            'sentiment_percentages': {
+                'مثبت': positive_percentage,
+                'منفی': negative_percentage,
+                'خنثی': neutral_percentage
+            },
+            'common_issues': common_issues,
+            'positive_percentage': positive_percentage,
+            'top_positive_words': top_positive_words,
+            'top_negative_words': top_negative_words,
+            'comments_sample': comments[:5]
+        }
 
     def persian_sentiment_analysis_for_restaurant(self, comments):
         """تحلیل احساسات برای یک رستوران"""
-        positive_words = {
-            'عالی', 'خوب', 'عالیه', 'خوشمزه', 'ممتاز', 'بینظیر', 'دستمریزاد',
-            'خوش طعم', 'گرم', 'تازه', 'داغ', 'سریع', 'کیفیت', 'محترم', 'مودب',
-            'لذیذ', 'تمیز', 'بهداشتی', 'منظم', 'پرخونه', 'متراکم', 'ترد',
-            'مثل همیشه', 'طعم خوب', 'خوبی داشت', 'عالی بود', 'پیشنهاد', 'عالی'
-        }
-
-        negative_words = {
-            'بد', 'ضعیف', 'افتضاح', 'بی‌مزه', 'سرد', 'نامرغوب', 'بدتر',
-            'خشک', 'شور', 'نپخته', 'دیر', 'تاخیر', 'بی‌کیفیت', 'شرم‌آور',
-            'بدمزه', 'ترش', 'شور', 'بیات', 'کهنه', 'خراب', 'ضعیف', 'گران',
-            'قیمت بیشتر', 'حجم کمتر', 'پر شده', 'بد بود', 'ضعیف بود'
-        }
-
         sentiment_results = []
 
         for comment in comments:
             comment_str = str(comment)
-            words = comment_str.split()
-
-            found_positive = [word for word in words if word in positive_words]
-            found_negative = [word for word in words if word in negative_words]
-
-            # جستجوی عبارات چندکلمه‌ای
-            for phrase in ['مثل همیشه', 'طعم خوب', 'خوبی داشت', 'قیمت بیشتر', 'حجم کمتر', 'پر شده']:
-                if phrase in comment_str:
-                    if phrase in positive_words:
-                        found_positive.append(phrase)
-                    else:
-                        found_negative.append(phrase)
-
-            positive_count = len(found_positive)
-            negative_count = len(found_negative)
-
-            if positive_count > negative_count:
-                emotion = 'مثبت'
-            elif negative_count > positive_count:
-                emotion = 'منفی'
-            else:
-                emotion = 'خنثی'
+            emotion, found_positive, found_negative = self.lexicon.match_sentiment(comment_str)
 
             sentiment_results.append({
                 'comment': comment_str,
@@ -176,57 +246,136 @@ class RestaurantAnalyzer:
 
     def extract_top_words(self, comments, word_type='positive'):
         """استخراج کلمات کلیدی پرتکرار"""
-        positive_words = {'عالی', 'خوب', 'عالیه', 'خوشمزه', 'ممتاز', 'بینظیر'}
-        negative_words = {'بد', 'ضعیف', 'افتضاح', 'بی‌مزه', 'سرد', 'گران'}
-
         all_words = []
         for comment in comments:
-            words = str(comment).split()
-            if word_type == 'positive':
-                filtered_words = [word for word in words if word in positive_words]
-            else:
-                filtered_words = [word for word in words if word in negative_words]
-            all_words.extend(filtered_words)
-
-        word_counts = Counter(all_words)
-        return dict(word_counts.most_common(5))
-
-    def analyze_common_issues_for_restaurant(self, comments):
-        """تحلیل مشکلات برای یک رستوران"""
-        issues_keywords = {
-            'گران بودن': ['قیمت بیشتر', 'گران', 'قیمت بالا'],
-            'حجم کم غذا': ['حجم کمتر', 'کم حجم', 'حجم کم'],
-            'کیفیت پایین': ['بی‌کیفیت', 'ضعیف', 'افتضاح', 'بد', 'خراب'],
-            'طعم نامناسب': ['بی‌مزه', 'شور', 'ترش', 'بدمزه'],
-            'ترکیب نامناسب': ['پر شده', 'سیب‌زمینی'],
-            'سرد بودن غذا': ['سرد', 'سرد شده'],
-            'تاخیر در ارسال': ['دیر', 'تاخیر', 'طولانی']
-        }
+            _, found_positive, found_negative = self.lexicon.match_sentiment(str(comment))
+            all_words.extend(found_positive if word_type == 'positive' else found_negative)
 
-        issues_count = {}
-        for issue, keywords in issues_keywords.items():
-            count = 0
-            for comment in comments:
-                comment_text = str(comment).lower()
-                if any(keyword in comment_text for keyword in keywords):
-                    count += 1
-            issues_count[issue] = count
+        return top_terms(Counter(all_words))
+
+    def analyze_common_issues_for_restaurant(self, comments, row_ids=None, restaurant=None):
+        """تحلیل مشکلات برای یک رستوران (با row_ids نظرات مطابق در ایندکس ثبت می‌شوند)"""
+        issues_count = dict.fromkeys(self.lexicon.issues, 0)
+        for position, comment in enumerate(comments):
+            for issue in self.lexicon.match_issues(str(comment)):
+                issues_count[issue] += 1
+                if row_ids is not None:
+                    self.comment_index.add(restaurant, CommentInvertedIndex.ISSUE, issue, row_ids[position])
 
         return issues_count
 
-    def find_best_restaurant(self):
-        """پیدا کردن بهترین رستوران"""
-        best_restaurant = None
-        best_score = -1
+    def reload_lexicon(self, path=None):
+        """بارگذاری دوباره واژه‌نامه از فایل و اعمال تغییرات آن"""
+        return self.apply_lexicon(load_lexicon(path or self.lexicon.source_path))
+
+    def apply_lexicon(self, new_lexicon):
+        """اعمال واژه‌نامه جدید؛ فقط نظراتی که عبارات تغییر کرده را دارند دوباره امتیاز می‌گیرند"""
+        old_lexicon = self.lexicon
+        changed_terms = old_lexicon.changed_terms(new_lexicon)
+        issues_changed = old_lexicon.issue_names != new_lexicon.issue_names
+        self.lexicon = new_lexicon
+        result = {'changed_terms': sorted(changed_terms), 'issues_changed': issues_changed,
+                  'rescored_comments': 0, 'restaurants': []}
+        if not changed_terms and not issues_changed:
+            return result
+
+        with self.instrumentation.stage('apply_lexicon'):
+            if self.token_index is None:
+                self.token_index = CommentTokenIndex(self.df['comment_text'].tolist())
+            rows = set()
+            for term in changed_terms:
+                rows |= self.token_index.candidates(term)
+
+            names = self.df['restaurant_name']
+            comments = self.df['comment_text']
+            affected = set()
+            for row in sorted(rows):
+                restaurant = names.iat[row]
+                if self.rescore_comment(restaurant, row, str(comments.iat[row]), old_lexicon, new_lexicon):
+                    affected.add(restaurant)
+            result['rescored_comments'] = len(rows)
+
+            if issues_changed:
+                for analysis in self.all_restaurants_analysis.values():
+                    analysis['common_issues'] = {issue: analysis['common_issues'].get(issue, 0)
+                                                 for issue in new_lexicon.issues}
+
+            for restaurant in affected:
+                self.refresh_restaurant_summary(restaurant)
+            # درصد مثبت کل (پیشین امتیاز بیزی) هم تغییر کرده است؛ رتبه‌بندی کامل از نو ساخته می‌شود
+            if affected:
+                self.ranking.rebuild(self.all_restaurants_analysis)
+            self.brand_analysis = self.identity_index.aggregate_brands(self.all_restaurants_analysis,
+                                                                       self.word_counts)
+            self.best_restaurant = self.ranking.best()
+
+        self.instrumentation.count('lexicon_rescored_comments', len(rows))
+        result['restaurants'] = sorted(affected)
+        return result
+
+    def rescore_comment(self, restaurant, row_id, text, old_lexicon, new_lexicon):
+        """به‌روزرسانی آمار یک رستوران با تفاوت نتیجه دو واژه‌نامه برای یک نظر"""
+        old_emotion, old_positive, old_negative = old_lexicon.match_sentiment(text)
+        new_emotion, new_positive, new_negative = new_lexicon.match_sentiment(text)
+        old_issues = set(old_lexicon.match_issues(text))
+        new_issues = set(new_lexicon.match_issues(text))
+        if (old_emotion, old_positive, old_negative) == (new_emotion, new_positive, new_negative) \
+                and old_issues == new_issues:
+            return False
+
+        analysis = self.all_restaurants_analysis[restaurant]
+        if self.sentiment_backend is None and old_emotion != new_emotion:
+            distribution = analysis['sentiment_distribution']
+            distribution[old_emotion] -= 1
+            if not distribution[old_emotion]:
+                del distribution[old_emotion]
+            distribution[new_emotion] = distribution.get(new_emotion, 0) + 1
+
+        word_counts = self.word_counts[restaurant]
+        word_counts['positive'].subtract(old_positive)
+        word_counts['positive'].update(new_positive)
+        word_counts['negative'].subtract(old_negative)
+        word_counts['negative'].update(new_negative)
+
+        old_words = set(old_positive + old_negative)
+        new_words = set(new_positive + new_negative)
+        for word in old_words - new_words:
+            self.comment_index.remove(restaurant, CommentInvertedIndex.WORD, word, row_id)
+        for word in new_words - old_words:
+            self.comment_index.insert(restaurant, CommentInvertedIndex.WORD, word, row_id)
+
+        issues = analysis['common_issues']
+        for issue in old_issues - new_issues:
+            issues[issue] -= 1
+            self.comment_index.remove(restaurant, CommentInvertedIndex.ISSUE, issue, row_id)
+        for issue in new_issues - old_issues:
+            issues[issue] = issues.get(issue, 0) + 1
+            self.comment_index.insert(restaurant, CommentInvertedIndex.ISSUE, issue, row_id)
+        return True
+
+    def refresh_restaurant_summary(self, restaurant):
+        """محاسبه دوباره درصدها و کلمات کلیدی از شمارنده‌های به‌روز شده"""
+        analysis = self.all_restaurants_analysis[restaurant]
+        distribution = analysis['sentiment_distribution']
+        total_sentiments = sum(distribution.values())
+        analysis['sentiment_percentages'] = {
+            label: (distribution.get(label, 0) / total_sentiments) * 100 if total_sentiments > 0 else 0
+            for label in ('مثبت', 'منفی', 'خنثی')
+        }
+        analysis['positive_percentage'] = analysis['sentiment_percentages']['مثبت']
+
+        word_counts = self.word_counts[restaurant]
+        analysis['top_positive_words'] = top_terms(word_counts['positive'])
+        analysis['top_negative_words'] = top_terms(word_counts['negative'])
 
-        for restaurant, analysis in self.all_restaurants_analysis.items():
-            if analysis['total_comments'] >= 1:  # حداقل یک نظر
-                score = analysis['average_rating'] * analysis['positive_percentage'] / 100
-                if score > best_score:
-                    best_score = score
-                    best_restaurant = restaurant
+    def find_best_restaurant(self):
+        """پیدا کردن بهترین رستوران (امتیاز بیزی، تا رستوران تک‌نظره اول نشود)"""
+        self.ranking = RestaurantRanking(self.all_restaurants_analysis)
+        return self.ranking.best()
 
-        return best_restaurant
+    def top_restaurants(self, k=10, offset=0):
+        """k رستوران برتر با همان معیار find_best_restaurant (با صفحه‌بندی)"""
+        return self.ranking.page(offset, k)
 
     def get_restaurant_report(self, restaurant_name):
         """گزارش برای یک رستوران خاص"""
@@ -251,15 +400,147 @@ class RestaurantAnalyzer:
 
         return report
 
+    def get_brand_report(self, brand_name):
+        """گزارش تجمیعی برای همه شعبه‌های یک برند"""
+        brand, _ = parse_restaurant_name(brand_name)
+        if brand not in self.brand_analysis:
+            return None
+
+        analysis = self.brand_analysis[brand]
+        report = {
+            'name': brand,
+            'branches': analysis['branches'],
+            'total_comments': analysis['total_comments'],
+            'average_rating': analysis['average_rating'],
+            'positive_percentage': analysis['positive_percentage'],
+            'sentiment_percentages': analysis['sentiment_percentages'],
+            'rating_distribution': analysis['rating_distribution'],
+            'sentiment_distribution': analysis['sentiment_distribution'],
+            'common_issues': {k: v for k, v in analysis['common_issues'].items() if v > 0},
+            'top_positive_words': analysis['top_positive_words'],
+            'top_negative_words': analysis['top_negative_words'],
+            'comments_sample': analysis['comments_sample']
+        }
+
+        return report
+
+    def get_matching_comments(self, kind, term, restaurant_name=None, limit=None):
+        """نظرات مطابق یک مشکل یا کلمه از روی ایندکس، بدون پیمایش دوباره داده‌ها"""
+        rows = self.comment_index.rows(kind, term, restaurant_name)
+        if limit is not None:
+            rows = rows[:limit]
+        names = self.df['restaurant_name']
+        comments = self.df['comment_text']
+        return [(names.iat[row], comments.iat[row]) for row in rows]
+
+
+# متن گزارش‌ها (مشترک بین رابط گرافیکی و گزارش‌های بدون رابط)
+def build_stats_text(report):
+    """متن تب آمار دقیق"""
+    stats_text = f"""
+📈 آمار دقیق رستوران:
+
+• تعداد کل نظرات: {report['total_comments']}
+• میانگین امتیاز: {report['average_rating']:.2f} از 5
+
+😊 تحلیل احساسات:
+• مثبت: {report['sentiment_percentages']['مثبت']:.1f}%
+• منفی: {report['sentiment_percentages']['منفی']:.1f}%
+• خنثی: {report['sentiment_percentages']['خنثی']:.1f}%
+
+⭐ توزیع امتیازها:
+"""
+    for rating, count in sorted(report['rating_distribution'].items()):
+        percentage = (count / report['total_comments']) * 100
+        stars = '⭐' * int(rating)
+        stats_text += f"  {stars} امتیاز {rating}: {count} نظر ({percentage:.1f}%)\n"
+
+    # کلمات کلیدی مثبت
+    if report['top_positive_words']:
+        stats_text += f"\n✅ کلمات مثبت پرتکرار:\n"
+        for word, count in report['top_positive_words'].items():
+            stats_text += f"• '{word}': {count} بار\n"
+
+    # کلمات کلیدی منفی
+    if report['top_negative_words']:
+        stats_text += f"\n❌ کلمات منفی پرتکرار:\n"
+        for word, count in report['top_negative_words'].items():
+            stats_text += f"• '{word}': {count} بار\n"
+
+    if report['common_issues']:
+        stats_text += f"\n⚠️ مشکلات گزارش شده:\n"
+        for issue, count in report['common_issues'].items():
+            percentage = (count / report['total_comments']) * 100
+            stats_text += f"• {issue}: {count} بار ({percentage:.1f}%)\n"
+
+    # نمونه‌ای از نظرات
+    if report['comments_sample']:
+        stats_text += f"\n💬 نمونه‌ای از نظرات:\n"
+        for i, comment in enumerate(report['comments_sample'][:3], 1):
+            stats_text += f"{i}. {comment}\n\n"
+
+    return stats_text
+
+
+def build_summary_text(report):
+    """متن تب خلاصه عملکرد"""
+    summary = []
+
+    summary.append(f"🎯 خلاصه عملکرد {report['name']}")
+    summary.append("=" * 50)
+
+    # آمار کلیدی
+    summary.append(f"\n📊 آمار کلیدی:")
+    summary.append(f"• میانگین امتیاز: {report['average_rating']:.1f}/5")
+    summary.append(f"• نظرات مثبت: {report['sentiment_percentages']['مثبت']:.1f}%")
+    summary.append(f"• نظرات منفی: {report['sentiment_percentages']['منفی']:.1f}%")
+    summary.append(f"• نظرات خنثی: {report['sentiment_percentages']['خنثی']:.1f}%")
+    summary.append(f"• تعداد نظرات: {report['total_comments']}")
+
+    # نقاط قوت
+    if report['top_positive_words']:
+        summary.append(f"\n✅ نقاط قوت:")
+        top_positive = list(report['top_positive_words'].keys())[:3]
+        for word in top_positive:
+            summary.append(f"• {word}")
+
+    # مشکلات اصلی
+    if report['common_issues']:
+        top_issue = max(report['common_issues'].items(), key=lambda x: x[1])
+        summary.append(f"\n⚠️ اصلی‌ترین مشکل: {top_issue[0]}")
+
+    # وضعیت کلی
+    summary.append(f"\n📈 وضعیت کلی:")
+    if report['average_rating'] >= 4.0 and report['sentiment_percentages']['مثبت'] >= 70:
+        summary.append("✅ عملکرد عالی - حفظ کیفیت فعلی توصیه می‌شود")
+    elif report['average_rating'] >= 3.0 and report['sentiment_percentages']['مثبت'] >= 50:
+        summary.append("⚠️ عملکرد قابل قبول - نیاز به بهبود جزئی")
+    elif report['sentiment_percentages']['منفی'] >= 40:
+        summary.append("❌ نیاز به بازنگری اساسی در کیفیت خدمات")
+    else:
+        summary.append("📊 عملکرد متوسط - نیاز به توجه بیشتر به بازخوردها")
+
+    return "\n".join(summary)
+
 
 # رابط گرافیکی
 class RestaurantAnalysisGUI:
+    SEARCH_DEBOUNCE_MS = 150
+    # حداکثر نظرات نمایش داده شده در تب نظرات مرتبط
+    DRILLDOWN_LIMIT = 500
+    DRILLDOWN_KINDS = {'مشکلات': CommentInvertedIndex.ISSUE, 'کلمات کلیدی': CommentInvertedIndex.WORD}
+    # فاصله بررسی تغییر فایل واژه‌نامه
+    LEXICON_POLL_MS = 2000
+
     def __init__(self, root, analyzer, csv_file_path=None):
         self.root = root
         self.analyzer = analyzer
         self.csv_file_path = csv_file_path
         self.current_restaurant = None
+        self._filter_job = None
+        self._lexicon_mtime = self.lexicon_mtime()
         self.setup_gui()
+        self.root.after(self.LEXICON_POLL_MS, self.watch_lexicon)
 
     def setup_gui(self):
         """تنظیم رابط گرافیکی"""
@@ -311,38 +592,20 @@ class RestaurantAnalysisGUI:
         search_entry.pack(fill='x', ipady=5)
         search_entry.bind('<KeyRelease>', self.filter_restaurants)
 
-        # لیست رستوران‌ها
-        list_frame = ttk.Frame(parent)
-        list_frame.pack(fill='both', expand=True)
-
-        # ایجاد Treeview برای نمایش رستوران‌ها
-        columns = ('name', 'rating', 'comments')
-        self.restaurant_tree = ttk.Treeview(list_frame, columns=columns,
-                                            show='headings', height=25)
-
-        # تعریف ستون‌ها با عرض بیشتر
-        self.restaurant_tree.heading('name', text='نام رستوران')
-        self.restaurant_tree.heading('rating', text='امتیاز')
-        self.restaurant_tree.heading('comments', text='تعداد نظرات')
-
-        self.restaurant_tree.column('name', width=350)
-        self.restaurant_tree.column('rating', width=100)
-        self.restaurant_tree.column('comments', width=100)
-
-        # اسکرول بار
-        scrollbar = ttk.Scrollbar(list_frame, orient='vertical',
-                                  command=self.restaurant_tree.yview)
-        self.restaurant_tree.configure(yscrollcommand=scrollbar.set)
-
-        self.restaurant_tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
+        # لیست مجازی رستوران‌ها؛ کلیک روی عنوان ستون مرتب‌سازی را عوض می‌کند
+        columns = [
+            ('name', 'نام رستوران', 220, None),
+            ('score', 'رتبه‌بندی', 70, 'score'),
+            ('rating', 'امتیاز', 60, 'rating'),
+            ('comments', 'تعداد نظرات', 80, 'comments'),
+            ('positive', 'نظرات مثبت', 80, 'positive'),
+        ]
+        self.restaurant_list = VirtualRestaurantList(parent, columns,
+                                                     on_select=self.show_restaurant_details)
 
         # پر کردن لیست
         self.populate_restaurant_list()
 
-        # 绑定事件
-        self.restaurant_tree.bind('<<TreeviewSelect>>', self.on_restaurant_select)
-
     def setup_display_area(self, parent):
         """تنظیم منطقه نمایش اطلاعات"""
         # عنوان پویا
@@ -363,6 +626,25 @@ class RestaurantAnalysisGUI:
         self.stats_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.stats_frame, text="📈 آمار دقیق")
 
+        # تب نمودارها (matplotlib فقط با اولین باز شدن این تب بارگذاری می‌شود)
+        self.charts_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.charts_frame, text="📉 نمودارها")
+        self.chart_view = None
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+
+        # تب مقایسه (فقط وقتی چند مجموعه داده با هم تحلیل شده‌اند)
+        self.comparison_view = None
+        if hasattr(self.analyzer, 'dataset_analyses'):
+            from comparison import ComparisonView
+            comparison_frame = ttk.Frame(self.notebook)
+            self.notebook.add(comparison_frame, text="⚖️ مقایسه")
+            self.comparison_view = ComparisonView(comparison_frame, self.analyzer)
+
+        # تب نظرات مرتبط با هر مشکل یا کلمه
+        self.drilldown_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.drilldown_frame, text="🔎 نظرات مرتبط")
+        self.setup_drilldown_tab()
+
         # تب اطلاعات فایل
         self.file_info_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.file_info_frame, text="📁 اطلاعات فایل")
@@ -370,6 +652,7 @@ class RestaurantAnalysisGUI:
 
     def setup_file_info_tab(self):
         """تنظیم تب اطلاعات فایل"""
+        info_text = ""
         if self.csv_file_path:
             file_name = os.path.basename(self.csv_file_path)
             file_size = os.path.getsize(self.csv_file_path) / 1024  # KB
@@ -393,67 +676,206 @@ class RestaurantAnalysisGUI:
 • توزیع امتیازها: {self.analyzer.basic_stats['rating_distribution']}
 """
 
-            text_widget = scrolledtext.ScrolledText(self.file_info_frame,
-                                                    font=('Tahoma', 11),
-                                                    wrap=tk.WORD)
-            text_widget.pack(fill='both', expand=True, padx=15, pady=15)
-            text_widget.insert('1.0', info_text)
-            text_widget.config(state='disabled')
+        # گزارش زمان‌بندی مراحل تحلیل
+        info_text += "\n" + self.analyzer.instrumentation.format_report()
 
-    def populate_restaurant_list(self):
-        """پر کردن لیست رستوران‌ها"""
-        # پاک کردن موارد قبلی
-        for item in self.restaurant_tree.get_children():
-            self.restaurant_tree.delete(item)
-
-        # مرتب‌سازی رستوران‌ها بر اساس امتیاز
-        sorted_restaurants = sorted(
-            self.analyzer.all_restaurants_analysis.items(),
-            key=lambda x: x[1]['average_rating'],
-            reverse=True
+        buttons = ttk.Frame(self.file_info_frame)
+        buttons.pack(pady=(10, 0))
+        ttk.Button(buttons, text="ذخیره گزارش زمان‌بندی (JSON)",
+                   command=self.export_timing_report).pack(side='right', padx=5)
+        ttk.Button(buttons, text="🔄 بارگذاری دوباره واژه‌نامه",
+                   command=lambda: self.reload_lexicon(show_message=True)).pack(side='right', padx=5)
+
+        text_widget = scrolledtext.ScrolledText(self.file_info_frame,
+                                                font=('Tahoma', 11),
+                                                wrap=tk.WORD)
+        text_widget.pack(fill='both', expand=True, padx=15, pady=15)
+        text_widget.insert('1.0', info_text)
+        text_widget.config(state='disabled')
+
+    def setup_drilldown_tab(self):
+        """تنظیم تب نظرات مرتبط (خوانده شده از ایندکس معکوس تحلیل‌گر)"""
+        controls = ttk.Frame(self.drilldown_frame)
+        controls.pack(fill='x', padx=15, pady=(15, 5))
+
+        self.drilldown_kind_var = tk.StringVar(value='مشکلات')
+        kind_box = ttk.Combobox(controls, textvariable=self.drilldown_kind_var, state='readonly',
+                                values=list(self.DRILLDOWN_KINDS), width=12)
+        kind_box.pack(side='right')
+        kind_box.bind('<<ComboboxSelected>>', lambda event: self.update_drilldown_terms())
+
+        self.drilldown_term_var = tk.StringVar()
+        self.drilldown_term_box = ttk.Combobox(controls, textvariable=self.drilldown_term_var,
+                                               state='readonly', width=30)
+        self.drilldown_term_box.pack(side='right', padx=10)
+        self.drilldown_term_box.bind('<<ComboboxSelected>>', lambda event: self.update_drilldown_comments())
+
+        self.drilldown_all_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(controls, text="همه رستوران‌ها", variable=self.drilldown_all_var,
+                        command=self.update_drilldown_terms).pack(side='right')
+
+        self.drilldown_status = tk.StringVar()
+        ttk.Label(self.drilldown_frame, textvariable=self.drilldown_status).pack(anchor='e', padx=15)
+
+        self._drilldown_terms = []
+        self.drilldown_list = tk.Listbox(self.drilldown_frame, font=('Tahoma', 11), justify='right')
+        self.drilldown_list.pack(fill='both', expand=True, padx=15, pady=(5, 15))
+
+    def update_drilldown_terms(self):
+        """پر کردن فهرست مشکلات یا کلمات به همراه تعداد نظرات"""
+        if self.current_restaurant is None or \
+                self.notebook.select() != str(self.drilldown_frame):
+            return
+
+        kind = self.DRILLDOWN_KINDS[self.drilldown_kind_var.get()]
+        restaurant = None if self.drilldown_all_var.get() else self.current_restaurant
+        counts = self.analyzer.comment_index.terms(kind, restaurant)
+        self._drilldown_terms = sorted(counts, key=counts.get, reverse=True)
+        self.drilldown_term_box['values'] = [f"{term} ({counts[term]})" for term in self._drilldown_terms]
+
+        if self._drilldown_terms:
+            self.drilldown_term_box.current(0)
+        else:
+            self.drilldown_term_var.set('')
+        self.update_drilldown_comments()
+
+    def update_drilldown_comments(self):
+        """نمایش نظرات مطابق عبارت انتخاب شده"""
+        self.drilldown_list.delete(0, tk.END)
+        index = self.drilldown_term_box.current()
+        if index < 0:
+            self.drilldown_status.set("موردی یافت نشد")
+            return
+
+        kind = self.DRILLDOWN_KINDS[self.drilldown_kind_var.get()]
+        term = self._drilldown_terms[index]
+        all_restaurants = self.drilldown_all_var.get()
+        restaurant = None if all_restaurants else self.current_restaurant
+        total = self.analyzer.comment_index.count(kind, term, restaurant)
+        matches = self.analyzer.get_matching_comments(kind, term, restaurant, limit=self.DRILLDOWN_LIMIT)
+
+        for name, comment in matches:
+            self.drilldown_list.insert(tk.END, f"{name}: {comment}" if all_restaurants else comment)
+
+        status = f"{total} نظر"
+        if all_restaurants:
+            status += f" در {len(self.analyzer.comment_index.restaurants_for(kind, term))} رستوران"
+        if total > len(matches):
+            status += f" (نمایش {len(matches)} مورد اول)"
+        self.drilldown_status.set(status)
+
+    def export_timing_report(self):
+        """ذخیره گزارش زمان‌بندی تحلیل در فایل JSON"""
+        path = filedialog.asksaveasfilename(
+            title="ذخیره گزارش زمان‌بندی",
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json")]
         )
+        if path:
+            self.analyzer.instrumentation.export_json(path)
+            messagebox.showinfo("اطلاع", f"گزارش ذخیره شد: {path}")
+
+    def lexicon_mtime(self):
+        try:
+            return os.path.getmtime(self.analyzer.lexicon.source_path)
+        except (OSError, TypeError):
+            return None
 
-        for restaurant, analysis in sorted_restaurants:
+    def watch_lexicon(self):
+        """بارگذاری خودکار واژه‌نامه پس از ویرایش فایل آن"""
+        if not self.root.winfo_exists():
+            return
+        mtime = self.lexicon_mtime()
+        if mtime is not None and mtime != self._lexicon_mtime:
+            self._lexicon_mtime = mtime
+            self.reload_lexicon()
+        self.root.after(self.LEXICON_POLL_MS, self.watch_lexicon)
+
+    def reload_lexicon(self, show_message=False):
+        """اعمال واژه‌نامه جدید و به‌روزرسانی فقط بخش‌های تغییر کرده رابط"""
+        try:
+            result = self.analyzer.reload_lexicon()
+        except (OSError, ValueError) as e:
+            messagebox.showerror("خطا", f"خطا در بارگذاری واژه‌نامه: {str(e)}")
+            return
+        self._lexicon_mtime = self.lexicon_mtime()
+
+        message = (f"🔄 واژه‌نامه بارگذاری شد: {len(result['changed_terms'])} عبارت تغییر کرد، "
+                   f"{result['rescored_comments']} نظر بررسی و {len(result['restaurants'])} رستوران به‌روز شد")
+        print(message)
+
+        if result['restaurants'] or result['issues_changed']:
+            if result['issues_changed'] and self.chart_view is not None:
+                # میله‌های نمودار مشکلات ثابت‌اند؛ با تغییر دسته‌ها نمودار از نو ساخته می‌شود
+                for widget in self.charts_frame.winfo_children():
+                    widget.destroy()
+                self.chart_view = None
+            elif self.chart_view is not None:
+                for restaurant in result['restaurants']:
+                    self.chart_view.invalidate(restaurant)
+
+            if self.comparison_view is not None:
+                self.comparison_view.refresh()
+            self.populate_restaurant_list()
+            self.apply_filter()
+            if self.current_restaurant is not None:
+                self.restaurant_list.select_name(self.current_restaurant)
+                self.show_restaurant_details(self.current_restaurant)
+
+        if show_message:
+            messagebox.showinfo("اطلاع", message)
+
+    def populate_restaurant_list(self):
+        """پر کردن لیست رستوران‌ها"""
+        # ترتیب اولیه همان رتبه‌بندی تحلیل‌گر است (بدون مرتب‌سازی دوباره)
+        ranking = self.analyzer.ranking
+        analyses = self.analyzer.all_restaurants_analysis
+        ranked = ranking.names()
+        ranked_set = set(ranked)
+        ordered_names = ranked + [name for name in analyses if name not in ranked_set]
+
+        rows = []
+        sort_keys = {'score': [], 'rating': [], 'comments': [], 'positive': []}
+        self.search_index = RestaurantSearchIndex()
+        for restaurant in ordered_names:
+            analysis = analyses[restaurant]
             rating = analysis['average_rating']
             comments_count = analysis['total_comments']
+            score = ranking.get_score(restaurant)
 
-            self.restaurant_tree.insert('', 'end', values=(
+            rows.append((
                 restaurant,
+                f"{score:.2f}" if score is not None else "-",
                 f"{rating:.1f}" if not pd.isna(rating) else "ندارد",
-                comments_count
+                comments_count,
+                f"{analysis['positive_percentage']:.0f}%"
             ))
+            sort_keys['score'].append(score if score is not None else -1)
+            sort_keys['rating'].append(rating if not pd.isna(rating) else -1)
+            sort_keys['comments'].append(comments_count)
+            sort_keys['positive'].append(analysis['positive_percentage'])
+            self.search_index.add(restaurant)
 
-    def filter_restaurants(self, event=None):
-        """فیلتر کردن لیست رستوران‌ها"""
-        search_term = self.search_var.get().lower()
-
-        for item in self.restaurant_tree.get_children():
-            values = self.restaurant_tree.item(item)['values']
-            restaurant_name = values[0].lower()
+        self.restaurant_list.set_rows(rows, sort_keys)
 
-            if search_term in restaurant_name:
-                self.restaurant_tree.item(item, tags=('visible',))
-            else:
-                self.restaurant_tree.item(item, tags=('hidden',))
+    def filter_restaurants(self, event=None):
+        """فیلتر کردن لیست رستوران‌ها (با تأخیر کوتاه تا تایپ کاربر تمام شود)"""
+        if self._filter_job is not None:
+            self.root.after_cancel(self._filter_job)
+        self._filter_job = self.root.after(self.SEARCH_DEBOUNCE_MS, self.apply_filter)
 
-    def on_restaurant_select(self, event):
-        """وقتی رستورانی انتخاب شود"""
-        selection = self.restaurant_tree.selection()
-        if selection:
-            item = selection[0]
-            restaurant_name = self.restaurant_tree.item(item)['values'][0]
-            self.show_restaurant_details(restaurant_name)
+    def apply_filter(self):
+        """نمایش فقط رستوران‌های مطابق با عبارت جستجو"""
+        self._filter_job = None
+        query = self.search_var.get()
+        self.restaurant_list.set_filter(self.search_index.search(query) if query.strip() else None)
 
     def show_best_restaurant(self):
         """نمایش بهترین رستوران"""
         if self.analyzer.best_restaurant:
             self.show_restaurant_details(self.analyzer.best_restaurant)
             # انتخاب در لیست
-            for item in self.restaurant_tree.get_children():
-                if self.restaurant_tree.item(item)['values'][0] == self.analyzer.best_restaurant:
-                    self.restaurant_tree.selection_set(item)
-                    self.restaurant_tree.focus(item)
-                    break
+            self.restaurant_list.select_name(self.analyzer.best_restaurant)
 
     def show_restaurant_details(self, restaurant_name):
         """نمایش جزئیات رستوران"""
@@ -469,6 +891,25 @@ class RestaurantAnalysisGUI:
         # به‌روزرسانی تب‌ها
         self.update_summary_tab(report)
         self.update_stats_tab(report)
+        self.update_charts_tab()
+        self.update_drilldown_terms()
+
+    def on_tab_changed(self, event=None):
+        """نمودارها و نظرات مرتبط فقط وقتی تب آن‌ها باز است به‌روز می‌شوند"""
+        self.update_charts_tab()
+        self.update_drilldown_terms()
+
+    def update_charts_tab(self):
+        """به‌روزرسانی تب نمودارها برای رستوران انتخاب شده"""
+        if self.current_restaurant is None or \
+                self.notebook.select() != str(self.charts_frame):
+            return
+
+        analysis = self.analyzer.all_restaurants_analysis[self.current_restaurant]
+        if self.chart_view is None:
+            from charts import RestaurantChartView
+            self.chart_view = RestaurantChartView(self.charts_frame, analysis['common_issues'].keys())
+        self.chart_view.show(self.current_restaurant, analysis)
 
     def update_summary_tab(self, report):
         """به‌روزرسانی تب خلاصه"""
@@ -491,47 +932,7 @@ class RestaurantAnalysisGUI:
         for widget in self.stats_frame.winfo_children():
             widget.destroy()
 
-        stats_text = f"""
-📈 آمار دقیق رستوران:
-
-• تعداد کل نظرات: {report['total_comments']}
-• میانگین امتیاز: {report['average_rating']:.2f} از 5
-
-😊 تحلیل احساسات:
-• مثبت: {report['sentiment_percentages']['مثبت']:.1f}%
-• منفی: {report['sentiment_percentages']['منفی']:.1f}%
-• خنثی: {report['sentiment_percentages']['خنثی']:.1f}%
-
-⭐ توزیع امتیازها:
-"""
-        for rating, count in sorted(report['rating_distribution'].items()):
-            percentage = (count / report['total_comments']) * 100
-            stars = '⭐' * int(rating)
-            stats_text += f"  {stars} امتیاز {rating}: {count} نظر ({percentage:.1f}%)\n"
-
-        # کلمات کلیدی مثبت
-        if report['top_positive_words']:
-            stats_text += f"\n✅ کلمات مثبت پرتکرار:\n"
-            for word, count in report['top_positive_words'].items():
-                stats_text += f"• '{word}': {count} بار\n"
-
-        # کلمات کلیدی منفی
-        if report['top_negative_words']:
-            stats_text += f"\n❌ کلمات منفی پرتکرار:\n"
-            for word, count in report['top_negative_words'].items():
-                stats_text += f"• '{word}': {count} بار\n"
-
-        if report['common_issues']:
-            stats_text += f"\n⚠️ مشکلات گزارش شده:\n"
-            for issue, count in report['common_issues'].items():
-                percentage = (count / report['total_comments']) * 100
-                stats_text += f"• {issue}: {count} بار ({percentage:.1f}%)\n"
-
-        # نمونه‌ای از نظرات
-        if report['comments_sample']:
-            stats_text += f"\n💬 نمونه‌ای از نظرات:\n"
-            for i, comment in enumerate(report['comments_sample'][:3], 1):
-                stats_text += f"{i}. {comment}\n\n"
+        stats_text = build_stats_text(report)
 
         text_widget = scrolledtext.ScrolledText(self.stats_frame,
                                                 font=('Tahoma', 11),
@@ -542,71 +943,64 @@ class RestaurantAnalysisGUI:
 
     def generate_clean_summary(self, report):
         """تولید خلاصه تمیز"""
-        summary = []
-
-        summary.append(f"🎯 خلاصه عملکرد {report['name']}")
-        summary.append("=" * 50)
-
-        # آمار کلیدی
-        summary.append(f"\n📊 آمار کلیدی:")
-        summary.append(f"• میانگین امتیاز: {report['average_rating']:.1f}/5")
-        summary.append(f"• نظرات مثبت: {report['sentiment_percentages']['مثبت']:.1f}%")
-        summary.append(f"• نظرات منفی: {report['sentiment_percentages']['منفی']:.1f}%")
-        summary.append(f"• نظرات خنثی: {report['sentiment_percentages']['خنثی']:.1f}%")
-        summary.append(f"• تعداد نظرات: {report['total_comments']}")
-
-        # نقاط قوت
-        if report['top_positive_words']:
-            summary.append(f"\n✅ نقاط قوت:")
-            top_positive = list(report['top_positive_words'].keys())[:3]
-            for word in top_positive:
-                summary.append(f"• {word}")
-
-        # مشکلات اصلی
-        if report['common_issues']:
-            top_issue = max(report['common_issues'].items(), key=lambda x: x[1])
-            summary.append(f"\n⚠️ اصلی‌ترین مشکل: {top_issue[0]}")
-
-        # وضعیت کلی
-        summary.append(f"\n📈 وضعیت کلی:")
-        if report['average_rating'] >= 4.0 and report['sentiment_percentages']['مثبت'] >= 70:
-            summary.append("✅ عملکرد عالی - حفظ کیفیت فعلی توصیه می‌شود")
-        elif report['average_rating'] >= 3.0 and report['sentiment_percentages']['مثبت'] >= 50:
-            summary.append("⚠️ عملکرد قابل قبول - نیاز به بهبود جزئی")
-        elif report['sentiment_percentages']['منفی'] >= 40:
-            summary.append("❌ نیاز به بازنگری اساسی در کیفیت خدمات")
-        else:
-            summary.append("📊 عملکرد متوسط - نیاز به توجه بیشتر به بازخوردها")
-
-        return "\n".join(summary)
+        return build_summary_text(report)
 
 
 # تابع اصلی
-def main(csv_file_path=None):
+def load_sentiment_backend(model_path):
+    """بارگذاری مدل احساسات آموزش‌دیده (در صورت وجود)"""
+    if not model_path:
+        return None
+    from sentiment_model import LinearSentimentModel
+    print(f"🧠 در حال بارگذاری مدل احساسات: {model_path}")
+    return LinearSentimentModel.load(model_path)
+
+
+def main(csv_file_path=None, sentiment_model_path=None, profile=False):
+    """csv_file_path: یک مسیر یا لیست مسیرها؛ چند فایل یعنی حالت مقایسه"""
     try:
-        if csv_file_path is None:
-            # اگر فایل مستقیم داده نشد، از طریق رابط کاربری انتخاب شود
+        if not csv_file_path:
+            # اگر فایل مستقیم داده نشد، از طریق رابط کاربری انتخاب شود (چند فایل برای مقایسه)
             root = tk.Tk()
             root.withdraw()
 
-            file_path = filedialog.askopenfilename(
-                title="لطفا فایل CSV را انتخاب کنید",
+            file_paths = list(filedialog.askopenfilenames(
+                title="لطفا فایل CSV را انتخاب کنید (چند فایل برای مقایسه)",
                 filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
-            )
+            ))
+            root.destroy()
 
-            if not file_path:
+            if not file_paths:
                 print("❌ هیچ فایلی انتخاب نشد!")
                 return
+        elif isinstance(csv_file_path, str):
+            file_paths = [csv_file_path]
         else:
-            file_path = csv_file_path
-
-        # خواندن داده‌ها
-        print("📁 در حال خواندن فایل CSV...")
-        df = pd.read_csv(file_path, encoding='utf-8')
-        print(f"✅ فایل با موفقیت خوانده شد. تعداد سطرها: {len(df)}")
+            file_paths = list(csv_file_path)
+
+        instrumentation = Instrumentation(profile=profile, trace_memory=profile)
+        sentiment_backend = load_sentiment_backend(sentiment_model_path)
+
+        if len(file_paths) > 1:
+            from comparison import ComparativeAnalyzer, load_datasets
+
+            # خواندن همزمان فایل‌ها و یک تحلیل مشترک روی همه نظرات
+            print(f"📁 در حال خواندن {len(file_paths)} فایل CSV...")
+            with instrumentation.stage('load_csv'):
+                datasets = load_datasets(file_paths)
+            for label, df in datasets.items():
+                print(f"✅ {label}: {len(df)} سطر")
+            analyzer = ComparativeAnalyzer(datasets, sentiment_backend, instrumentation=instrumentation)
+            file_path = None
+        else:
+            # خواندن داده‌ها
+            file_path = file_paths[0]
+            print("📁 در حال خواندن فایل CSV...")
+            df = pd.read_csv(file_path, encoding='utf-8')
+            print(f"✅ فایل با موفقیت خوانده شد. تعداد سطرها: {len(df)}")
 
-        # ایجاد تحلیل‌گر
-        analyzer = RestaurantAnalyzer(df)
+            # ایجاد تحلیل‌گر
+            analyzer = RestaurantAnalyzer(df, sentiment_backend, instrumentation=instrumentation)
 
         print(f"🏆 بهترین رستوران: {analyzer.best_restaurant}")
         print(f"📊 تعداد رستوران‌های تحلیل شده: {len(analyzer.all_restaurants_analysis)}")
@@ -615,6 +1009,8 @@ def main(csv_file_path=None):
         print("🎨 در حال ایجاد رابط گرافیکی...")
         root = tk.Tk()
         app = RestaurantAnalysisGUI(root, analyzer, file_path)
+        if file_path is None:
+            root.title("سیستم تحلیل رستوران‌ها - مقایسه: " + "، ".join(analyzer.dataset_labels))
 
         print("🚀 برنامه آماده اجراست!")
         root.mainloop()
@@ -625,7 +1021,16 @@ def main(csv_file_path=None):
 
 
 # تابع برای اجرای مستقیم از ماژول اول
-def run_analysis_from_scraper(csv_file_path):
+def open_analysis_window(master, analyzer, csv_file_path=None, title=None):
+    """نمایش تحلیل در پنجره فرزند یک برنامه Tk موجود (بدون ساختن root دوم)"""
+    window = tk.Toplevel(master)
+    app = RestaurantAnalysisGUI(window, analyzer, csv_file_path)
+    if title:
+        window.title(title)
+    return app
+
+
+def run_analysis_from_scraper(csv_file_path, sentiment_model_path=None):
     """اجرای تحلیل مستقیماً از ماژول اسکرپر"""
     try:
         print(f"📁 در حال خواندن فایل CSV: {csv_file_path}")
@@ -644,7 +1049,7 @@ def run_analysis_from_scraper(csv_file_path):
             raise ValueError(f"ستون‌های ضروری وجود ندارند: {missing_columns}")
 
         # ایجاد تحلیل‌گر
-        analyzer = RestaurantAnalyzer(df)
+        analyzer = RestaurantAnalyzer(df, load_sentiment_backend(sentiment_model_path))
 
         print(f"🏆 بهترین رستوران: {analyzer.best_restaurant}")
         print(f"📊 تعداد رستوران‌های تحلیل شده: {len(analyzer.all_restaurants_analysis)}")
@@ -671,4 +1076,13 @@ def run_analysis_from_scraper(csv_file_path):
 
 if __name__ == "__main__":
     # اگر ماژول مستقیماً اجرا شود
-    main()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="سیستم تحلیل رستوران‌ها")
+    parser.add_argument('csv_files', nargs='*',
+                        help="فایل(های) CSV؛ چند فایل یعنی حالت مقایسه (در صورت نبود، پنجره انتخاب فایل باز می‌شود)")
+    parser.add_argument('--model', help="مدل احساسات آموزش‌دیده (npz)")
+    parser.add_argument('--profile', action='store_true', help="فعال کردن cProfile و tracemalloc")
+    args = parser.parse_args()
+
+    main(args.csv_files, args.model, args.profile)
\ No newline at end of file
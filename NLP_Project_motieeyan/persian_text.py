@@ -0,0 +1,78 @@
+import re
+
+
+# نگاشت حروف عربی و ارقام به معادل فارسی/لاتین
+_CHAR_MAP = str.maketrans({
+    'ي': 'ی', 'ى': 'ی', 'ئ': 'ی',
+    'ك': 'ک',
+    'ة': 'ه', 'ۀ': 'ه',
+    'أ': 'ا', 'إ': 'ا', 'ٱ': 'ا',
+    'ؤ': 'و',
+    '۰': '0', '۱': '1', '۲': '2', '۳': '3', '۴': '4',
+    '۵': '5', '۶': '6', '۷': '7', '۸': '8', '۹': '9',
+    '٠': '0', '١': '1', '٢': '2', '٣': '3', '٤': '4',
+    '٥': '5', '٦': '6', '٧': '7', '٨': '8', '٩': '9',
+    'ـ': None,  # کشیده
+})
+
+_DIACRITICS = re.compile('[\u064B-\u065F\u0670]')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_persian(text, keep_zwnj=False):
+    """یکسان‌سازی متن فارسی برای مقایسه و جستجو"""
+    text = _DIACRITICS.sub('', str(text).translate(_CHAR_MAP))
+    if not keep_zwnj:
+        text = text.replace('\u200c', ' ')
+    return _SPACES.sub(' ', text).strip().lower()
+
+
+JALALI_MONTHS = ('فروردین', 'اردیبهشت', 'خرداد', 'تیر', 'مرداد', 'شهریور',
+                 'مهر', 'آبان', 'آذر', 'دی', 'بهمن', 'اسفند')
+
+_TO_PERSIAN_DIGITS = str.maketrans('0123456789', '۰۱۲۳۴۵۶۷۸۹')
+
+
+def to_persian_digits(value):
+    """تبدیل ارقام لاتین به فارسی"""
+    return str(value).translate(_TO_PERSIAN_DIGITS)
+
+
+def jalali_month_length(year, month):
+    """تعداد روزهای یک ماه شمسی (اسفند سال کبیسه ۳۰ روز)"""
+    if month <= 6:
+        return 31
+    if month <= 11:
+        return 30
+    return 30 if (year * 8 + 29) % 33 < 8 else 29
+
+
+def format_jalali_date(year, month, day):
+    """تاریخ به همان قالب سایت، مثلاً «۱۹ آبان ۱۴۰۴»"""
+    return f"{to_persian_digits(day)} {JALALI_MONTHS[month - 1]} {to_persian_digits(year)}"
+
+
+def parse_jalali_date(text):
+    """تبدیل «۱۹ آبان ۱۴۰۴» به (1404, 8, 19)؛ در صورت نامعتبر بودن None"""
+    parts = normalize_persian(text).split()
+    if len(parts) != 3 or parts[1] not in JALALI_MONTHS or not (parts[0].isdigit() and parts[2].isdigit()):
+        return None
+    return int(parts[2]), JALALI_MONTHS.index(parts[1]) + 1, int(parts[0])
+
+
+def gregorian_to_jalali(year, month, day):
+    """تبدیل تاریخ میلادی به شمسی، مثلاً (2025, 11, 10) به (1404, 8, 19)"""
+    days_before_month = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+    leap_year = year + 1 if month > 2 else year
+    days = (355666 + 365 * year + (leap_year + 3) // 4 - (leap_year + 99) // 100
+            + (leap_year + 399) // 400 + day + days_before_month[month - 1])
+    jalali_year = -1595 + 33 * (days // 12053)
+    days %= 12053
+    jalali_year += 4 * (days // 1461)
+    days %= 1461
+    if days > 365:
+        jalali_year += (days - 1) // 365
+        days = (days - 1) % 365
+    if days < 186:
+        return jalali_year, 1 + days // 31, 1 + days % 31
+    return jalali_year, 7 + (days - 186) // 30, 1 + (days - 186) % 30
@@ -0,0 +1,64 @@
+import queue
+import time
+
+
+class ProgressChannel:
+    """کانال رویداد امن بین thread کارگر و حلقه اصلی Tk"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def emit(self, kind, **data):
+        """ارسال رویداد از هر thread"""
+        data['kind'] = kind
+        self._queue.put(data)
+
+    def drain(self, max_events=200):
+        """برداشتن رویدادهای موجود بدون انتظار (فقط در thread اصلی)"""
+        events = []
+        for _ in range(max_events):
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def poll(self, root, handler, interval_ms=100):
+        """بررسی دوره‌ای صف با root.after و فراخوانی handler برای هر رویداد"""
+        def pump():
+            for event in self.drain():
+                try:
+                    handler(event)
+                except Exception as e:
+                    print(f"خطا در پردازش رویداد {event.get('kind')}: {e}")
+            root.after(interval_ms, pump)
+
+        root.after(interval_ms, pump)
+
+
+class ProgressTracker:
+    """محاسبه پیشرفت و زمان باقی‌مانده برای n از N مورد"""
+
+    def __init__(self, total, clock=time.monotonic):
+        self.total = total
+        self.done = 0
+        self.clock = clock
+        self.started_at = clock()
+
+    def step(self):
+        self.done += 1
+
+    @property
+    def eta_seconds(self):
+        if self.done == 0:
+            return None
+        elapsed = self.clock() - self.started_at
+        return elapsed / self.done * (self.total - self.done)
+
+
+def format_eta(seconds):
+    """نمایش زمان باقی‌مانده به صورت دقیقه:ثانیه"""
+    if seconds is None:
+        return "نامشخص"
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
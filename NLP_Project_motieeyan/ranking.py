@@ -0,0 +1,95 @@
+import bisect
+import math
+
+
+class RestaurantRanking:
+    """رتبه‌بندی رستوران‌ها با امتیاز بیزی (کشیده شده به سمت میانگین کل برای رستوران‌های کم‌نظر)"""
+
+    def __init__(self, restaurants_analysis=None, prior_weight=20):
+        # وزن پیش‌فرض: تعداد نظرات «مجازی» با میانگین کل که به هر رستوران اضافه می‌شود
+        self.prior_weight = prior_weight
+        self.prior_rating = 0.0
+        self.prior_positive = 0.0
+        self._analyses = {}
+        self._scores = {}
+        # لیست مرتب (-امتیاز، نام) برای top-k و صفحه‌بندی با bisect
+        self._order = []
+        if restaurants_analysis:
+            self.rebuild(restaurants_analysis)
+
+    @staticmethod
+    def _counts(analysis):
+        """(تعداد امتیازهای معتبر، مجموع امتیازها، تعداد نظرات، تعداد نظرات مثبت)"""
+        rated = sum(analysis['rating_distribution'].values())
+        rating = analysis['average_rating']
+        rating_sum = rating * rated if rated and not math.isnan(rating) else 0.0
+        comments = analysis['total_comments']
+        positive = analysis['positive_percentage'] * comments / 100
+        return rated, rating_sum, comments, positive
+
+    def rebuild(self, restaurants_analysis):
+        """محاسبه دوباره میانگین‌های کل و امتیاز همه رستوران‌ها"""
+        self._analyses = dict(restaurants_analysis)
+        totals = [0, 0.0, 0, 0.0]
+        for analysis in self._analyses.values():
+            for i, value in enumerate(self._counts(analysis)):
+                totals[i] += value
+        rated, rating_sum, comments, positive = totals
+        self.prior_rating = rating_sum / rated if rated else 0.0
+        self.prior_positive = positive / comments * 100 if comments else 0.0
+
+        self._scores = {name: self.score(analysis) for name, analysis in self._analyses.items()
+                        if analysis['total_comments'] >= 1}
+        self._order = sorted((-score, name) for name, score in self._scores.items())
+
+    def score(self, analysis):
+        """میانگین بیزی امتیاز × درصد بیزی نظرات مثبت (هم‌مقیاس با معیار قبلی)"""
+        rated, rating_sum, comments, positive = self._counts(analysis)
+        weight = self.prior_weight
+        rating = (weight * self.prior_rating + rating_sum) / (weight + rated) if weight + rated else 0.0
+        positive_percentage = ((weight * self.prior_positive + positive * 100) / (weight + comments)
+                               if weight + comments else 0.0)
+        return rating * positive_percentage / 100
+
+    def update(self, name, analysis):
+        """افزودن یا جایگزینی یک رستوران با میانگین‌های کل فعلی (بدون مرتب‌سازی دوباره همه)"""
+        self.remove(name)
+        self._analyses[name] = analysis
+        if analysis['total_comments'] >= 1:
+            score = self.score(analysis)
+            self._scores[name] = score
+            bisect.insort(self._order, (-score, name))
+
+    def remove(self, name):
+        self._analyses.pop(name, None)
+        score = self._scores.pop(name, None)
+        if score is not None:
+            index = bisect.bisect_left(self._order, (-score, name))
+            del self._order[index]
+
+    def page(self, offset=0, limit=10):
+        """بخشی از رتبه‌بندی به صورت لیست (نام، امتیاز)"""
+        return [(name, -negative) for negative, name in self._order[offset:offset + limit]]
+
+    def top(self, k=10):
+        return self.page(0, k)
+
+    def best(self):
+        return self._order[0][1] if self._order else None
+
+    def rank(self, name):
+        """رتبه یک رستوران (از ۱)؛ None اگر رتبه‌بندی نشده باشد"""
+        score = self._scores.get(name)
+        if score is None:
+            return None
+        return bisect.bisect_left(self._order, (-score, name)) + 1
+
+    def get_score(self, name):
+        return self._scores.get(name)
+
+    def names(self):
+        """نام رستوران‌ها به ترتیب رتبه"""
+        return [name for _, name in self._order]
+
+    def __len__(self):
+        return len(self._order)
@@ -0,0 +1,198 @@
+import argparse
+import html
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from urllib.parse import quote
+
+
+def to_jsonable(value):
+    """تبدیل انواع numpy/pandas و NaN به انواع قابل ذخیره در JSON"""
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if hasattr(value, 'item') and not isinstance(value, (str, bytes)):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def analyze_file(csv_path, sentiment_model_path=None, deduplicate=None):
+    """تحلیل کامل یک فایل CSV در فرآیند کارگر و برگرداندن نتیجه قابل ذخیره"""
+    import pandas as pd
+    from nlp2 import RestaurantAnalyzer, build_stats_text, build_summary_text, load_sentiment_backend
+
+    start = time.perf_counter()
+    df = pd.read_csv(csv_path, encoding='utf-8')
+    analyzer = RestaurantAnalyzer(df, load_sentiment_backend(sentiment_model_path), deduplicate)
+
+    # ترتیب رستوران‌ها همان رتبه‌بندی تحلیل‌گر است
+    ranked = analyzer.ranking.names()
+    ranked_set = set(ranked)
+    restaurants = {}
+    for name in ranked + [n for n in analyzer.all_restaurants_analysis if n not in ranked_set]:
+        report = analyzer.get_restaurant_report(name)
+        restaurants[name] = {
+            'score': analyzer.ranking.get_score(name),
+            'report': to_jsonable(report),
+            'summary_text': build_summary_text(report),
+            'stats_text': build_stats_text(report),
+        }
+
+    return {
+        'source_file': os.path.abspath(csv_path),
+        'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'basic_stats': to_jsonable(analyzer.basic_stats),
+        'best_restaurant': analyzer.best_restaurant,
+        'restaurants': restaurants,
+        'elapsed_seconds': time.perf_counter() - start,
+    }
+
+
+def render_html(result):
+    """ساخت صفحه HTML ایستا با همان محتوای تب‌های خلاصه و آمار"""
+    title = os.path.basename(result['source_file'])
+    stats = result['basic_stats']
+
+    rows = []
+    ordered = list(result['restaurants'].items())
+    for i, (name, entry) in enumerate(ordered):
+        report = entry['report']
+        rating = report['average_rating']
+        rating_text = f"{rating:.1f}" if rating is not None else "ندارد"
+        rows.append(
+            f"<tr><td><a href=\"#r{i}\">{html.escape(name)}</a></td><td>{rating_text}</td>"
+            f"<td>{report['total_comments']}</td>"
+            f"<td>{report['sentiment_percentages']['مثبت']:.1f}%</td></tr>"
+        )
+
+    sections = []
+    for i, (name, entry) in enumerate(ordered):
+        best = ' 🏆' if name == result['best_restaurant'] else ''
+        sections.append(
+            f"<section id=\"r{i}\"><h2>{html.escape(name)}{best}</h2>"
+            f"<div class=\"tabs\"><pre>{html.escape(entry['summary_text'])}</pre>"
+            f"<pre>{html.escape(entry['stats_text'])}</pre></div></section>"
+        )
+
+    return f"""<!DOCTYPE html>
+<html lang="fa" dir="rtl">
+<head>
+<meta charset="utf-8">
+<title>گزارش تحلیل رستوران‌ها - {html.escape(title)}</title>
+<style>
+body {{ font-family: Tahoma, sans-serif; background: #f5f5f5; margin: 2em; }}
+table {{ border-collapse: collapse; background: #fff; }}
+td, th {{ border: 1px solid #ddd; padding: 4px 10px; }}
+.tabs {{ display: flex; gap: 1em; }}
+pre {{ background: #fff; padding: 1em; white-space: pre-wrap; flex: 1; font-family: Tahoma, sans-serif; }}
+</style>
+</head>
+<body>
+<h1>📊 گزارش تحلیل رستوران‌ها - {html.escape(title)}</h1>
+<p>تعداد رستوران‌ها: {stats['restaurant_count']} | تعداد کل نظرات: {stats['total_comments']} |
+میانگین امتیاز کلی: {stats['average_rating'] or 0:.2f} | بهترین رستوران: {html.escape(str(result['best_restaurant']))}</p>
+<table>
+<tr><th>نام رستوران</th><th>امتیاز</th><th>تعداد نظرات</th><th>نظرات مثبت</th></tr>
+{''.join(rows)}
+</table>
+{''.join(sections)}
+<p><small>تولید شده در {result['generated_at']}</small></p>
+</body>
+</html>
+"""
+
+
+def report_names(paths):
+    """نام یکتای گزارش هر فایل؛ فایل‌های هم‌نام در پوشه‌های مختلف شماره می‌گیرند"""
+    names = []
+    used = set()
+    for path in paths:
+        stem, ext = os.path.splitext(os.path.basename(path))
+        name, n = stem + ext, 2
+        while name in used:
+            name, n = f"{stem} ({n}){ext}", n + 1
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def write_report(result, output_dir, name=None):
+    """ذخیره خروجی JSON و HTML یک فایل (name: نام یکتای گزارش، پیش‌فرض نام فایل CSV)"""
+    stem = os.path.splitext(name or os.path.basename(result['source_file']))[0]
+    json_path = os.path.join(output_dir, f"{stem}.json")
+    html_path = os.path.join(output_dir, f"{stem}.html")
+
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    with open(html_path, 'w', encoding='utf-8') as f:
+        f.write(render_html(result))
+
+    return json_path, html_path
+
+
+def write_index(entries, output_dir):
+    """صفحه فهرست همه گزارش‌های تولید شده"""
+    items = ''.join(
+        f"<li><a href=\"{html.escape(quote(os.path.basename(html_path)))}\">{html.escape(name)}</a> "
+        f"({restaurant_count} رستوران، بهترین: {html.escape(str(best))})</li>"
+        for name, html_path, restaurant_count, best in entries
+    )
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(f"<!DOCTYPE html><html lang=\"fa\" dir=\"rtl\"><head><meta charset=\"utf-8\">"
+                f"<title>گزارش‌های تحلیل</title></head><body style=\"font-family: Tahoma\">"
+                f"<h1>📁 گزارش‌های تحلیل</h1><ul>{items}</ul></body></html>")
+
+
+def generate_reports(csv_files, output_dir='reports', workers=None, sentiment_model_path=None,
+                     deduplicate=None):
+    """تحلیل موازی چند فایل CSV در استخر فرآیندها و ذخیره گزارش‌ها"""
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count()
+    entries = []
+    failures = {}
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(analyze_file, path, sentiment_model_path, deduplicate): (path, name)
+                   for path, name in zip(csv_files, report_names(csv_files))}
+        for future in as_completed(futures):
+            path, name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ خطا در تحلیل {path}: {e}")
+                failures[path] = str(e)
+                continue
+
+            _, html_path = write_report(result, output_dir, name)
+            entries.append((name, html_path,
+                            result['basic_stats']['restaurant_count'], result['best_restaurant']))
+            print(f"✅ {name} ({result['elapsed_seconds']:.2f} ثانیه)")
+
+    entries.sort()
+    write_index(entries, output_dir)
+    print(f"📁 {len(entries)} گزارش در {time.perf_counter() - start:.2f} ثانیه در {output_dir} ذخیره شد")
+    return entries, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="تولید گزارش‌های JSON و HTML بدون رابط گرافیکی")
+    parser.add_argument('csv_files', nargs='+')
+    parser.add_argument('-o', '--output', default='reports')
+    parser.add_argument('-j', '--workers', type=int, help="تعداد فرآیندها (پیش‌فرض: همه هسته‌ها)")
+    parser.add_argument('--model', help="مدل احساسات آموزش‌دیده (npz)")
+    parser.add_argument('--deduplicate', choices=['flag', 'collapse'])
+    args = parser.parse_args()
+
+    _, failures = generate_reports(args.csv_files, args.output, args.workers, args.model, args.deduplicate)
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
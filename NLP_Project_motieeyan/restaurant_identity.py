@@ -0,0 +1,154 @@
+import re
+from collections import Counter, namedtuple
+
+from lexicon import top_terms
+from persian_text import normalize_persian
+
+
+RestaurantIdentity = namedtuple('RestaurantIdentity',
+                                ['display_name', 'brand', 'branch', 'brand_id', 'branch_id'])
+
+# «نام برند (شعبه) توضیح اضافی»؛ مثلاً «برگرلند(اندرزگو)شبانه»
+_NAME_PATTERN = re.compile(r'^(?P<brand>[^()]*?)\s*\((?P<inside>[^()]*)\)\s*(?P<suffix>.*)$')
+_LATIN = re.compile(r'[A-Za-z]')
+_PERSIAN = re.compile('[\u0600-\u06FF]')
+
+
+def parse_restaurant_name(raw_name):
+    """جدا کردن نام برند و شعبه از عنوان صفحه رستوران"""
+    name = normalize_persian(raw_name)
+    match = _NAME_PATTERN.match(name)
+    if not match:
+        return name, ''
+
+    brand = match.group('brand').strip()
+    inside = match.group('inside').strip()
+    suffix = match.group('suffix').strip()
+
+    # پرانتز لاتین ترجمه نام برند است، نه شعبه؛ مثل «بوفه فرشریا (Fresheria Buffet)»
+    if _LATIN.search(inside) and not _PERSIAN.search(inside):
+        inside = ''
+
+    branch = ' '.join(part for part in (inside.replace(' - ', ' '), suffix) if part)
+    return brand or name, branch
+
+
+class RestaurantIdentityIndex:
+    """نگاشت نام‌های خام رستوران به برند و شعبه یکتا با جستجوی O(1)"""
+
+    def __init__(self, raw_names=()):
+        self._by_raw = {}
+        self._by_branch_key = {}
+        self._brand_ids = {}
+        self.brand_names = []
+        self.brand_branches = {}
+        for raw_name in raw_names:
+            self.add(raw_name)
+
+    def add(self, raw_name):
+        """ثبت یک نام خام (تکراری بودن اشکالی ندارد)"""
+        identity = self._by_raw.get(raw_name)
+        if identity is not None:
+            return identity
+
+        brand, branch = parse_restaurant_name(raw_name)
+        identity = self._by_branch_key.get((brand, branch))
+        if identity is None:
+            brand_id = self._brand_ids.get(brand)
+            if brand_id is None:
+                brand_id = len(self.brand_names)
+                self._brand_ids[brand] = brand_id
+                self.brand_names.append(brand)
+                self.brand_branches[brand] = []
+            identity = RestaurantIdentity(
+                display_name=str(raw_name).strip(),
+                brand=brand,
+                branch=branch,
+                brand_id=brand_id,
+                branch_id=len(self._by_branch_key),
+            )
+            self._by_branch_key[(brand, branch)] = identity
+            self.brand_branches[brand].append(identity.display_name)
+
+        self._by_raw[raw_name] = identity
+        return identity
+
+    def lookup(self, raw_name):
+        """هویت یک نام خام؛ نام‌های جدید خودکار ثبت می‌شوند"""
+        identity = self._by_raw.get(raw_name)
+        return identity if identity is not None else self.add(raw_name)
+
+    def display_name(self, raw_name):
+        """نام نمایشی یکسان برای همه املاهای یک شعبه"""
+        return self.lookup(raw_name).display_name
+
+    def brand_of(self, raw_name):
+        return self.lookup(raw_name).brand
+
+    def branches(self, brand):
+        """نام نمایشی شعبه‌های یک برند"""
+        return list(self.brand_branches.get(normalize_persian(brand), []))
+
+    @property
+    def brand_count(self):
+        return len(self.brand_names)
+
+    def aggregate_brands(self, restaurants_analysis, word_counts=None):
+        """ساخت تحلیل هر برند از روی تحلیل شعبه‌ها، بدون پیمایش دوباره نظرات
+
+        word_counts: شمارنده کامل کلمات هر شعبه ({نام: {'positive': Counter, 'negative': Counter}})
+        """
+        brands = {}
+        for brand in self.brand_names:
+            branches = [name for name in self.brand_branches[brand] if name in restaurants_analysis]
+            if branches:
+                branch_counts = [word_counts[name] for name in branches] if word_counts is not None else None
+                brands[brand] = combine_analyses([restaurants_analysis[name] for name in branches], branch_counts)
+                brands[brand]['branches'] = branches
+        return brands
+
+
+def combine_analyses(analyses, word_counts=None):
+    """ادغام چند تحلیل شعبه در یک تحلیل با همان ساختار
+
+    word_counts: شمارنده کامل کلمات هر تحلیل به همان ترتیب؛ بدون آن کلمات کلیدی از ۵ کلمه برتر
+    هر شعبه ادغام می‌شوند و تقریبی‌اند (کلمه ششم همه شعبه‌ها جا می‌ماند)
+    """
+    total_comments = sum(a['total_comments'] for a in analyses)
+
+    rating_distribution = Counter()
+    sentiment_distribution = Counter()
+    common_issues = Counter()
+    positive_words = Counter()
+    negative_words = Counter()
+    for a in analyses:
+        rating_distribution.update(a['rating_distribution'])
+        sentiment_distribution.update(a['sentiment_distribution'])
+        common_issues.update(a['common_issues'])
+    for counts in word_counts if word_counts is not None else \
+            ({'positive': a['top_positive_words'], 'negative': a['top_negative_words']} for a in analyses):
+        positive_words.update(counts['positive'])
+        negative_words.update(counts['negative'])
+
+    rated = sum(rating_distribution.values())
+    average_rating = (sum(r * c for r, c in rating_distribution.items()) / rated) if rated else 0
+
+    total_sentiments = sum(sentiment_distribution.values())
+    sentiment_percentages = {
+        label: (sentiment_distribution[label] / total_sentiments) * 100 if total_sentiments > 0 else 0
+        for label in ('مثبت', 'منفی', 'خنثی')
+    }
+
+    return {
+        'total_comments': total_comments,
+        'average_rating': average_rating,
+        'rating_distribution': dict(sorted(rating_distribution.items())),
+        'sentiment_distribution': dict(sentiment_distribution),
+        'sentiment_percentages': sentiment_percentages,
+        # اجتماع دسته‌ها به ترتیب اولین دیده شدن، تا دسته‌ای که شعبه اول ندارد حذف نشود
+        'common_issues': {issue: common_issues[issue] for a in analyses for issue in a['common_issues']},
+        'positive_percentage': sentiment_percentages['مثبت'],
+        'top_positive_words': top_terms(positive_words),
+        'top_negative_words': top_terms(negative_words),
+        'comments_sample': [c for a in analyses for c in a['comments_sample']][:5],
+    }
@@ -0,0 +1,54 @@
+from collections import defaultdict
+
+from persian_text import normalize_persian
+
+
+class RestaurantSearchIndex:
+    """ایندکس جستجوی پیشوندی/زیررشته‌ای روی نام رستوران‌ها، مستقل از املای عربی/فارسی"""
+
+    def __init__(self, names=()):
+        self.names = []
+        self._normalized = []
+        self._grams = defaultdict(set)
+        self._last_query = None
+        self._last_result = None
+        for name in names:
+            self.add(name)
+
+    def add(self, name):
+        """افزودن یک نام و برگرداندن شناسه آن"""
+        position = len(self.names)
+        normalized = normalize_persian(name)
+        self.names.append(name)
+        self._normalized.append(normalized)
+        # ایندکس تک‌حرفی و دوحرفی؛ کاندیداها بعداً با زیررشته تأیید می‌شوند
+        for i in range(len(normalized)):
+            self._grams[normalized[i]].add(position)
+            if i + 1 < len(normalized):
+                self._grams[normalized[i:i + 2]].add(position)
+        self._last_query = None
+        return position
+
+    def search(self, query):
+        """شناسه نام‌های شامل عبارت، به همان ترتیب افزوده شدن"""
+        query = normalize_persian(query)
+        if not query:
+            return list(range(len(self.names)))
+
+        # وقتی کاربر ادامه عبارت قبلی را تایپ می‌کند فقط نتایج قبلی بررسی می‌شوند
+        if self._last_query and query.startswith(self._last_query):
+            candidates = self._last_result
+        else:
+            grams = [query[i:i + 2] for i in range(len(query) - 1)] or [query]
+            postings = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+            candidates = sorted(set.intersection(*postings)) if postings[0] else []
+
+        result = [position for position in candidates if query in self._normalized[position]]
+        self._last_query, self._last_result = query, result
+        return result
+
+    def search_prefix(self, query):
+        """نام‌هایی که یکی از کلماتشان با عبارت شروع می‌شود"""
+        query = normalize_persian(query)
+        return [position for position in self.search(query)
+                if self._normalized[position].startswith(query) or f' {query}' in self._normalized[position]]
@@ -0,0 +1,380 @@
+import argparse
+import heapq
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+DEFAULT_STATE_PATH = 'scheduler_state.json'
+# وزن نرخ تازه در میانگین نمایی نرخ نظرات جدید
+RATE_SMOOTHING = 0.5
+# حداقل نرخ فرضی (نظر در ساعت) تا جفت‌های کم‌تحرک هم بالاخره نوبت بگیرند
+MIN_RATE = 0.1
+MAX_BACKOFF_HOURS = 24
+
+
+def target_key(neighborhood, food):
+    return f"{neighborhood}|{food}"
+
+
+class RateBudget:
+    """سطل توکن: حداکثر تعداد اجرای اسکرپر در ساعت (با امکان چند اجرای پشت سر هم)"""
+
+    def __init__(self, per_hour, clock, tokens=None, updated_at=None):
+        self.per_hour = per_hour
+        self.clock = clock
+        self.tokens = per_hour if tokens is None else tokens
+        self.updated_at = clock() if updated_at is None else updated_at
+
+    def refill(self):
+        now = self.clock()
+        elapsed_hours = max(now - self.updated_at, 0) / 3600
+        self.tokens = min(self.per_hour, self.tokens + elapsed_hours * self.per_hour)
+        self.updated_at = now
+
+    def available(self):
+        self.refill()
+        return int(self.tokens)
+
+    def take(self):
+        self.refill()
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class ScrapeScheduler:
+    """زمان‌بندی اسکرپ جفت‌های (محله، غذا) بر اساس کهنگی داده و نرخ نظرات جدید"""
+
+    def __init__(self, state_path=DEFAULT_STATE_PATH, scrape_fn=None, max_workers=2,
+                 scrapes_per_hour=6, min_interval_hours=1.0, clock=time.time):
+        """scrape_fn(neighborhood, food) باید لیست ردیف‌های پاک شده اسکرپر را برگرداند"""
+        self.state_path = state_path
+        self.scrape_fn = scrape_fn or browser_scrape
+        self.max_workers = max_workers
+        self.min_interval_hours = min_interval_hours
+        self.clock = clock
+        self.targets = {}
+        self.in_flight = set()
+        self.budget = RateBudget(scrapes_per_hour, clock)
+        self._lock = threading.Lock()
+        self._executor = None
+        self.load()
+
+    # region State
+    def load(self):
+        """بازیابی وضعیت ذخیره شده از اجرای قبلی"""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        with open(self.state_path, encoding='utf-8') as f:
+            state = json.load(f)
+        self.targets = state.get('targets', {})
+        budget = state.get('budget')
+        if budget:
+            self.budget = RateBudget(self.budget.per_hour, self.clock,
+                                     budget['tokens'], budget['updated_at'])
+
+    def save(self):
+        """ذخیره اتمی وضعیت (نوشتن در فایل موقت و جایگزینی)"""
+        if not self.state_path:
+            return
+        with self._lock:
+            state = {
+                'targets': self.targets,
+                'budget': {'tokens': self.budget.tokens, 'updated_at': self.budget.updated_at},
+            }
+            temp_path = f"{self.state_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.state_path)
+    # endregion
+
+    # region Watch list
+    def watch(self, neighborhood, food):
+        key = target_key(neighborhood, food)
+        with self._lock:
+            target = self.targets.get(key)
+            added = target is None
+            if added:
+                target = self.targets[key] = {
+                    'neighborhood': neighborhood,
+                    'food': food,
+                    'last_scraped': None,
+                    'restaurant_counts': {},
+                    'restaurant_rates': {},
+                    'failures': 0,
+                    'retry_after': None,
+                    'last_error': None,
+                }
+        # save خودش قفل را می‌گیرد، پس بعد از آزاد شدن قفل صدا زده می‌شود
+        if added:
+            self.save()
+        return target
+
+    def unwatch(self, neighborhood, food):
+        with self._lock:
+            removed = self.targets.pop(target_key(neighborhood, food), None)
+        if removed is not None:
+            self.save()
+    # endregion
+
+    # region Scheduling
+    @staticmethod
+    def comment_rate(target):
+        """نرخ نظرات جدید یک جفت: مجموع نرخ مشاهده شده رستوران‌هایش (None اگر هنوز معلوم نیست)"""
+        rates = target['restaurant_rates']
+        return sum(rates.values()) if rates else None
+
+    def default_rate(self):
+        """نرخ فرضی جفت‌هایی که هنوز دو اسکرپ ندارند: میانگین نرخ‌های شناخته شده"""
+        rates = [rate for rate in map(self.comment_rate, self.targets.values()) if rate is not None]
+        return sum(rates) / len(rates) if rates else MIN_RATE
+
+    def priority(self, target, now, default_rate=None):
+        """تعداد نظرات جدید مورد انتظار از آخرین اسکرپ؛ جفت‌های اسکرپ نشده اولویت بی‌نهایت دارند"""
+        if target['last_scraped'] is None:
+            return float('inf')
+        age_hours = (now - target['last_scraped']) / 3600
+        rate = self.comment_rate(target)
+        if rate is None:
+            rate = self.default_rate() if default_rate is None else default_rate
+        return age_hours * max(rate, MIN_RATE)
+
+    def is_due(self, target, now):
+        if target['retry_after'] is not None and now < target['retry_after']:
+            return False
+        if target['last_scraped'] is None:
+            return True
+        return now - target['last_scraped'] >= self.min_interval_hours * 3600
+
+    def due_targets(self, now=None):
+        """کلید جفت‌های آماده به ترتیب اولویت (بیشترین اول)"""
+        now = self.clock() if now is None else now
+        default_rate = self.default_rate()
+        with self._lock:
+            in_flight = set(self.in_flight)
+        candidates = [
+            (-self.priority(target, now, default_rate), key)
+            for key, target in list(self.targets.items())
+            if key not in in_flight and self.is_due(target, now)
+        ]
+        heapq.heapify(candidates)
+        return [heapq.heappop(candidates)[1] for _ in range(len(candidates))]
+
+    def dispatch(self):
+        """ارسال جفت‌های آماده به کارگرهای آزاد، در حد بودجه نرخ؛ future ها را برمی‌گرداند"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        futures = []
+        for key in self.due_targets():
+            with self._lock:
+                if len(self.in_flight) >= self.max_workers or not self.budget.take():
+                    break
+                self.in_flight.add(key)
+            futures.append(self._executor.submit(self._run_target, key))
+        return futures
+
+    def run_once(self):
+        """یک دور کامل: ارسال، انتظار برای پایان و برگرداندن خلاصه نتایج"""
+        futures = self.dispatch()
+        wait(futures)
+        return [future.result() for future in futures]
+
+    def run_forever(self, poll_seconds=60, sleep=time.sleep):
+        print(f"⏰ زمان‌بند با {len(self.targets)} جفت و {self.max_workers} کارگر شروع شد")
+        try:
+            while True:
+                for future in self.dispatch():
+                    future.add_done_callback(report_future)
+                sleep(poll_seconds)
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    # endregion
+
+    # region Results
+    def _run_target(self, key):
+        try:
+            target = self.targets.get(key)
+            if target is None:
+                return None
+            try:
+                rows = self.scrape_fn(target['neighborhood'], target['food'])
+            except Exception as e:
+                summary = self.record_failure(key, e)
+            else:
+                summary = self.record_result(key, rows)
+        finally:
+            with self._lock:
+                self.in_flight.discard(key)
+        self.save()
+        return summary
+
+    def record_result(self, key, rows):
+        """به‌روزرسانی نرخ نظرات جدید هر رستوران از روی تفاوت تعداد نظرات با اسکرپ قبلی"""
+        now = self.clock()
+        with self._lock:
+            # جفت در حین اسکرپ از فهرست پایش حذف شده است
+            target = self.targets.get(key)
+            if target is None:
+                return None
+            counts = Counter(row['restaurant_name'] for row in rows)
+            previous = target['restaurant_counts']
+            elapsed_hours = None
+            if target['last_scraped'] is not None and now > target['last_scraped']:
+                elapsed_hours = (now - target['last_scraped']) / 3600
+
+            new_comments = 0
+            rates = target['restaurant_rates']
+            # رستوران‌هایی که این بار دیده نشدند هم با نرخ صفر به‌روز می‌شوند
+            for restaurant in set(counts) | set(rates):
+                new = max(counts.get(restaurant, 0) - previous.get(restaurant, 0), 0)
+                new_comments += new
+                if elapsed_hours:
+                    rate = new / elapsed_hours
+                    old_rate = rates.get(restaurant)
+                    rates[restaurant] = rate if old_rate is None else \
+                        RATE_SMOOTHING * rate + (1 - RATE_SMOOTHING) * old_rate
+
+            target['restaurant_counts'] = dict(counts)
+            target['last_scraped'] = now
+            target['failures'] = 0
+            target['retry_after'] = None
+            target['last_error'] = None
+
+        return {'target': key, 'rows': len(rows), 'new_comments': new_comments,
+                'comment_rate': self.comment_rate(target)}
+
+    def record_failure(self, key, error):
+        """تأخیر نمایی برای جفت‌هایی که اسکرپشان خطا داده است"""
+        now = self.clock()
+        with self._lock:
+            target = self.targets.get(key)
+            if target is None:
+                return None
+            target['failures'] += 1
+            backoff_hours = min(self.min_interval_hours * 2 ** (target['failures'] - 1), MAX_BACKOFF_HOURS)
+            target['retry_after'] = now + backoff_hours * 3600
+            target['last_error'] = str(error)
+        return {'target': key, 'error': str(error), 'retry_in_hours': backoff_hours}
+    # endregion
+
+
+def report_future(future):
+    """چاپ نتیجه یک اجرا در run_forever؛ خطای پیش‌بینی نشده کارگر هم چاپ می‌شود"""
+    try:
+        summary = future.result()
+    except Exception as e:
+        print(f"❌ خطای زمان‌بند: {e}")
+        return
+    if summary is not None:
+        print(f"✅ {summary}")
+
+
+def browser_scrape(neighborhood, food):
+    """اجرای اسکرپر Selenium برای یک جفت و ذخیره CSV با همان نام‌گذاری ScraperGUI"""
+    import pandas as pd
+    from scrapy2 import setup_driver, scraper, clean_and_validate_data
+
+    driver = setup_driver(neighborhood_name=neighborhood, food_name=food)
+    if not driver:
+        raise RuntimeError("خطا در راه‌اندازی مرورگر")
+    try:
+        rows = clean_and_validate_data(scraper(driver))
+    finally:
+        driver.quit()
+
+    if rows:
+        pd.DataFrame(rows).to_csv(f"{neighborhood}_{food}_structured.csv", index=False, encoding='utf-8-sig')
+    return rows
+
+
+def http_backend(config_path=None):
+    """تابع اسکرپ مبتنی بر HTTP (بدون مرورگر) با همان خروجی CSV"""
+    from http_scraper import http_scrape, load_config
+
+    config = load_config(config_path)
+
+    def scrape(neighborhood, food):
+        import pandas as pd
+
+        rows = http_scrape(neighborhood, food, config)
+        if rows:
+            pd.DataFrame(rows).to_csv(f"{neighborhood}_{food}_structured.csv", index=False, encoding='utf-8-sig')
+        return rows
+
+    return scrape
+
+
+def main():
+    parser = argparse.ArgumentParser(description="زمان‌بندی خودکار اسکرپ محله‌ها و غذاها")
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH, help="فایل وضعیت زمان‌بند")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = subparsers.add_parser('add', help="افزودن جفت به فهرست پایش")
+    add_parser.add_argument('neighborhood')
+    add_parser.add_argument('food')
+
+    remove_parser = subparsers.add_parser('remove', help="حذف جفت از فهرست پایش")
+    remove_parser.add_argument('neighborhood')
+    remove_parser.add_argument('food')
+
+    subparsers.add_parser('list', help="نمایش فهرست پایش به ترتیب اولویت")
+
+    run_parser = subparsers.add_parser('run', help="اجرای زمان‌بند")
+    run_parser.add_argument('--workers', type=int, default=2, help="تعداد مرورگرهای همزمان")
+    run_parser.add_argument('--per-hour', type=int, default=6, help="حداکثر اسکرپ در ساعت")
+    run_parser.add_argument('--min-interval', type=float, default=1.0, help="حداقل فاصله دو اسکرپ (ساعت)")
+    run_parser.add_argument('--once', action='store_true', help="فقط یک دور اجرا")
+    run_parser.add_argument('--backend', choices=('browser', 'http'), default='browser',
+                            help="اسکرپ با مرورگر یا درخواست‌های HTTP")
+    run_parser.add_argument('--http-config', help="فایل تنظیمات اسکرپر HTTP")
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        scrape_fn = http_backend(args.http_config) if args.backend == 'http' else browser_scrape
+        scheduler = ScrapeScheduler(args.state, scrape_fn, max_workers=args.workers,
+                                    scrapes_per_hour=args.per_hour, min_interval_hours=args.min_interval)
+    else:
+        scheduler = ScrapeScheduler(args.state)
+
+    if args.command == 'add':
+        scheduler.watch(args.neighborhood, args.food)
+        print(f"✅ به فهرست پایش اضافه شد: {args.neighborhood} / {args.food}")
+    elif args.command == 'remove':
+        scheduler.unwatch(args.neighborhood, args.food)
+        print(f"🗑️ از فهرست پایش حذف شد: {args.neighborhood} / {args.food}")
+    elif args.command == 'list':
+        now = scheduler.clock()
+        due = set(scheduler.due_targets(now))
+        default_rate = scheduler.default_rate()
+        ordered = sorted(scheduler.targets.items(),
+                         key=lambda item: -scheduler.priority(item[1], now, default_rate))
+        for key, target in ordered:
+            age = "هرگز" if target['last_scraped'] is None else \
+                f"{(now - target['last_scraped']) / 3600:.1f} ساعت پیش"
+            rate = scheduler.comment_rate(target)
+            rate_text = f"{rate:.2f} نظر/ساعت" if rate is not None else "نامشخص"
+            marker = '⏳' if key in due else '✔️'
+            print(f"{marker} {target['neighborhood']} / {target['food']} • آخرین اسکرپ: {age} • {rate_text}")
+    else:
+        if args.once:
+            for summary in scheduler.run_once():
+                if summary is not None:
+                    print(summary)
+            scheduler.shutdown()
+        else:
+            scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,4 @@
 import time
-from selenium import webdriver
-from selenium.common import NoSuchElementException
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as ec
-import pandas as pd
 import csv
 import re
 import tkinter as tk
@@ -15,18 +7,39 @@ import threading
 import sys
 import os
 
+from lazy_imports import lazy_module
+from persian_text import normalize_persian, parse_jalali_date
+from progress_channel import ProgressChannel, ProgressTracker, format_eta
+from restaurant_identity import RestaurantIdentityIndex
+
+# Selenium و pandas فقط هنگام شروع جمع‌آوری لازم‌اند؛ پنجره اول بدون آن‌ها باز می‌شود
+pd = lazy_module('pandas')
+
+
+# اسکرول مودال نظرات: حداکثر انتظار برای بارگذاری نظرات بیشتر پس از هر اسکرول (ثانیه)
+REVIEW_LOAD_TIMEOUT = 1.5
+REVIEW_POLL_INTERVAL = 0.2
+REVIEW_MAX_ROUNDS = 300
+
 
 class ScraperGUI:
+    PREVIEW_LIMIT = 500
+
     def __init__(self, root):
         self.root = root
         self.root.title("سیستم جمع‌آوری داده‌های رستوران")
-        self.root.geometry("500x400")
+        self.root.geometry("700x700")
         self.root.configure(bg='#f5f5f5')
 
         self.setup_gui()
         self.driver = None
         self.current_csv_file = None
         self.current_dataframe = None
+        self.partial_rows = []
+
+        # همه به‌روزرسانی‌های رابط از طریق این صف در thread اصلی انجام می‌شوند
+        self.events = ProgressChannel()
+        self.events.poll(self.root, self.handle_event)
 
     def setup_gui(self):
         """تنظیم رابط گرافیکی"""
@@ -58,6 +71,16 @@ class ScraperGUI:
                                font=('Tahoma', 12), width=30)
         food_entry.pack(side='left', padx=(10, 0), fill='x', expand=True)
 
+        # فیلد تاریخ شروع (فقط نظرات جدیدتر جمع‌آوری می‌شوند)
+        since_frame = ttk.Frame(main_frame)
+        since_frame.pack(fill='x', pady=10)
+
+        ttk.Label(since_frame, text="از تاریخ (اختیاری):", font=('Tahoma', 12)).pack(side='left')
+        self.since_var = tk.StringVar()
+        since_entry = ttk.Entry(since_frame, textvariable=self.since_var,
+                                font=('Tahoma', 12), width=30)
+        since_entry.pack(side='left', padx=(10, 0), fill='x', expand=True)
+
         # دکمه شروع
         self.start_button = ttk.Button(main_frame, text="شروع جمع‌آوری داده‌ها",
                                        command=self.start_scraping)
@@ -72,6 +95,34 @@ class ScraperGUI:
                                  font=('Tahoma', 10))
         status_label.pack(pady=10)
 
+        # پیشرفت هر رستوران (n از N، تعداد نظرات، زمان باقی‌مانده)
+        self.progress_detail_var = tk.StringVar()
+        ttk.Label(main_frame, textvariable=self.progress_detail_var,
+                  font=('Tahoma', 10)).pack()
+
+        # پیش‌نمایش زنده ردیف‌های جمع‌آوری شده
+        preview_frame = ttk.Frame(main_frame)
+        preview_frame.pack(fill='both', expand=True, pady=10)
+        columns = ('restaurant', 'rating', 'comment')
+        self.preview_tree = ttk.Treeview(preview_frame, columns=columns, show='headings', height=8)
+        self.preview_tree.heading('restaurant', text='رستوران')
+        self.preview_tree.heading('rating', text='امتیاز')
+        self.preview_tree.heading('comment', text='نظر')
+        self.preview_tree.column('restaurant', width=180)
+        self.preview_tree.column('rating', width=50)
+        self.preview_tree.column('comment', width=380)
+        preview_scrollbar = ttk.Scrollbar(preview_frame, orient='vertical',
+                                          command=self.preview_tree.yview)
+        self.preview_tree.configure(yscrollcommand=preview_scrollbar.set)
+        self.preview_tree.pack(side='left', fill='both', expand=True)
+        preview_scrollbar.pack(side='right', fill='y')
+
+        # تحلیل داده‌های جمع‌آوری شده تا این لحظه
+        self.partial_analysis_button = ttk.Button(main_frame, text="تحلیل داده‌های فعلی",
+                                                  command=self.open_partial_analysis,
+                                                  state='disabled')
+        self.partial_analysis_button.pack(pady=5)
+
     def start_scraping(self):
         """شروع فرآیند اسکرپینگ در یک thread جداگانه"""
         neighborhood = self.neighborhood_var.get().strip()
@@ -81,65 +132,147 @@ class ScraperGUI:
             messagebox.showerror("خطا", "لطفاً نام محله و نوع غذا را وارد کنید")
             return
 
+        try:
+            since = parse_since_date(self.since_var.get())
+        except ValueError as e:
+            messagebox.showerror("خطا", f"{e}\nمثال: ۱ آبان ۱۴۰۴ یا 1404/08/01")
+            return
+
         # غیرفعال کردن دکمه و نمایش پیشرفت
         self.start_button.config(state='disabled')
+        self.progress.config(mode='indeterminate', value=0)
         self.progress.pack(pady=10)
         self.progress.start()
         self.status_var.set("در حال راه‌اندازی مرورگر...")
+        self.progress_detail_var.set("")
+        self.partial_rows = []
+        self.preview_tree.delete(*self.preview_tree.get_children())
+        self.partial_analysis_button.config(state='disabled')
 
         # اجرای اسکرپینگ در thread جداگانه
-        thread = threading.Thread(target=self.run_scraping, args=(neighborhood, food))
+        thread = threading.Thread(target=self.run_scraping, args=(neighborhood, food, since))
         thread.daemon = True
         thread.start()
 
-    def run_scraping(self, neighborhood, food):
-        """اجرای فرآیند اسکرپینگ"""
+    def run_scraping(self, neighborhood, food, since=None):
+        """اجرای فرآیند اسکرپینگ (در thread کارگر؛ بدون دسترسی مستقیم به Tk)"""
+        emit = self.events.emit
         try:
-            self.status_var.set("در حال راه‌اندازی مرورگر...")
+            emit('status', text="در حال راه‌اندازی مرورگر...")
             driver = setup_driver(neighborhood_name=neighborhood, food_name=food)
 
             if driver:
-                self.status_var.set("در حال جمع‌آوری داده‌ها...")
-                scraped_data = scraper(driver)
+                emit('status', text="در حال جمع‌آوری داده‌ها...")
+                scraped_data = scraper(driver, progress=emit, since=since)
 
                 if scraped_data:
-                    self.status_var.set("در حال ذخیره داده‌ها...")
+                    emit('status', text="در حال ذخیره داده‌ها...")
                     # پاکسازی داده‌ها
                     cleaned_data = clean_and_validate_data(scraped_data)
 
                     # ایجاد DataFrame
                     df = pd.DataFrame(cleaned_data)
-                    self.current_dataframe = df  # ذخیره dataframe برای استفاده بعدی
 
                     # ذخیره فایل CSV
                     filename = f"{neighborhood}_{food}_structured.csv"
                     df.to_csv(filename, index=False, encoding='utf-8-sig')
 
-                    # ذخیره نام فایل برای استفاده در تحلیل
-                    self.current_csv_file = filename
-
-                    self.status_var.set(f"داده‌ها با موفقیت ذخیره شد: {filename}")
-
-                    # نمایش خلاصه داده‌ها
-                    self.show_summary_page(df)
+                    emit('result', dataframe=df, filename=filename)
 
                 else:
-                    self.status_var.set("هیچ داده‌ای جمع‌آوری نشد")
-                    messagebox.showinfo("اطلاع", "هیچ داده‌ای از رستوران‌ها جمع‌آوری نشد.")
+                    emit('status', text="هیچ داده‌ای جمع‌آوری نشد")
+                    emit('info', text="هیچ داده‌ای از رستوران‌ها جمع‌آوری نشد.")
 
             else:
-                self.status_var.set("خطا در راه‌اندازی مرورگر")
-                messagebox.showerror("خطا", "خطا در راه‌اندازی مرورگر")
+                emit('status', text="خطا در راه‌اندازی مرورگر")
+                emit('error', text="خطا در راه‌اندازی مرورگر")
 
         except Exception as e:
-            self.status_var.set(f"خطا: {str(e)}")
-            messagebox.showerror("خطا", f"خطا در جمع‌آوری داده‌ها: {str(e)}")
+            emit('status', text=f"خطا: {str(e)}")
+            emit('error', text=f"خطا در جمع‌آوری داده‌ها: {str(e)}")
         finally:
+            emit('finished')
+
+    def handle_event(self, event):
+        """پردازش رویدادهای کارگر در thread اصلی"""
+        kind = event['kind']
+
+        if kind == 'status':
+            self.status_var.set(event['text'])
+
+        elif kind == 'started':
+            # با معلوم شدن تعداد رستوران‌ها نوار پیشرفت معین می‌شود
+            self.progress.stop()
+            self.progress.config(mode='determinate', maximum=max(event['total'], 1), value=0)
+            self.progress_detail_var.set(f"0 از {event['total']} رستوران")
+
+        elif kind == 'restaurant_done':
+            self.progress.config(value=event['index'])
+            self.progress_detail_var.set(
+                f"{event['index']} از {event['total']} رستوران • "
+                f"{event['comments_so_far']} نظر • زمان باقی‌مانده: {format_eta(event['eta'])}")
+            self.add_preview_rows(event['rows'])
+
+        elif kind == 'result':
+            df = event['dataframe']
+            self.current_dataframe = df  # ذخیره dataframe برای استفاده بعدی
+            # ذخیره نام فایل برای استفاده در تحلیل
+            self.current_csv_file = event['filename']
+            self.status_var.set(f"داده‌ها با موفقیت ذخیره شد: {event['filename']}")
+
+            # نمایش خلاصه داده‌ها
+            self.show_summary_page(df)
+
+        elif kind == 'analysis_ready':
+            from nlp2 import open_analysis_window
+
+            try:
+                open_analysis_window(self.root, event['analyzer'], event['filename'], event.get('title'))
+                self.status_var.set("تحلیل موقت آماده است" if event.get('title') else "تحلیل دقیق‌تر آماده است")
+            except Exception as e:
+                messagebox.showerror("خطا", f"خطا در نمایش تحلیل: {str(e)}")
+
+        elif kind == 'info':
+            messagebox.showinfo("اطلاع", event['text'])
+
+        elif kind == 'error':
+            messagebox.showerror("خطا", event['text'])
+
+        elif kind == 'finished':
             # بازگرداندن وضعیت به حالت عادی
             self.progress.stop()
             self.progress.pack_forget()
             self.start_button.config(state='normal')
 
+    def add_preview_rows(self, rows):
+        """افزودن ردیف‌های جدید به پیش‌نمایش زنده"""
+        self.partial_rows.extend(rows)
+        for row in rows:
+            self.preview_tree.insert('', 'end', values=(
+                row['restaurant_name'], row['rating'], row['comment_text']))
+
+        # فقط آخرین ردیف‌ها در پیش‌نمایش نگه داشته می‌شوند
+        children = self.preview_tree.get_children()
+        if len(children) > self.PREVIEW_LIMIT:
+            self.preview_tree.delete(*children[:len(children) - self.PREVIEW_LIMIT])
+        if children:
+            self.preview_tree.see(children[-1])
+
+        if self.partial_rows:
+            self.partial_analysis_button.config(state='normal')
+
+    def open_partial_analysis(self):
+        """تحلیل داده‌های جمع‌آوری شده تا این لحظه، در حالی که اسکرپینگ ادامه دارد"""
+        if not self.partial_rows:
+            messagebox.showinfo("اطلاع", "هنوز داده‌ای برای تحلیل جمع‌آوری نشده است")
+            return
+
+        # پاکسازی و تحلیل در thread کارگر؛ پنجره با رویداد analysis_ready در thread اصلی باز می‌شود
+        self.status_var.set("در حال تحلیل داده‌های موقت...")
+        analysis_thread = threading.Thread(target=self.execute_partial_analysis, args=(list(self.partial_rows),))
+        analysis_thread.daemon = True
+        analysis_thread.start()
+
     def show_summary_page(self, df):
         """نمایش صفحه خلاصه داده‌ها"""
         try:
@@ -162,6 +295,7 @@ class ScraperGUI:
             # محاسبات آماری
             total_comments = len(df)
             total_restaurants = df['restaurant_name'].nunique()
+            identity_index = RestaurantIdentityIndex(df['restaurant_name'].unique())
             comments_with_rating = df[df['rating'] != ''].shape[0]
 
             # محاسبه میانگین امتیازها
@@ -181,6 +315,7 @@ class ScraperGUI:
 📈 اطلاعات کلی داده‌ها:
 
 • 🏢 تعداد رستوران‌ها: {total_restaurants} 
+• 🔗 تعداد برندها (با ادغام شعبه‌ها): {identity_index.brand_count}
 • 💬 تعداد کل نظرات: {total_comments}
 • ⭐ نظرات دارای امتیاز: {comments_with_rating}
 • 📊 میانگین امتیازها: {avg_rating:.2f}
@@ -233,8 +368,8 @@ class ScraperGUI:
 
     def open_detailed_analysis(self, summary_window):
         """باز کردن تحلیل دقیق‌تر"""
-        if not self.current_csv_file:
-            messagebox.showerror("خطا", "هیچ فایل داده‌ای برای تحلیل وجود ندارد")
+        if self.current_dataframe is None:
+            messagebox.showerror("خطا", "هیچ داده‌ای برای تحلیل وجود ندارد")
             return
 
         try:
@@ -248,11 +383,9 @@ class ScraperGUI:
             if current_dir not in sys.path:
                 sys.path.append(current_dir)
 
-            # ایمپورت و اجرای ماژول تحلیل
-            from nlp2 import run_analysis_from_scraper
-
-            # ایجاد یک thread جدید برای اجرای تحلیل
-            analysis_thread = threading.Thread(target=self.execute_analysis, args=(self.current_csv_file,))
+            # تحلیل همان DataFrame حافظه در thread کارگر؛ پنجره نتیجه در thread اصلی باز می‌شود
+            analysis_thread = threading.Thread(target=self.execute_analysis,
+                                               args=(self.current_dataframe, self.current_csv_file))
             analysis_thread.daemon = True
             analysis_thread.start()
 
@@ -263,20 +396,35 @@ class ScraperGUI:
             self.status_var.set(f"خطا در اجرای تحلیل: {str(e)}")
             messagebox.showerror("خطا", f"خطا در اجرای تحلیل داده‌ها: {str(e)}")
 
-    def execute_analysis(self, csv_file):
-        """اجرای تحلیل داده‌ها"""
+    def execute_analysis(self, df, csv_file, title=None):
+        """اجرای تحلیل داده‌ها (در thread کارگر؛ بدون دسترسی مستقیم به Tk)"""
+        emit = self.events.emit
         try:
-            from nlp2 import run_analysis_from_scraper
-            # اجرای مستقیم تحلیل بدون نیاز به انتخاب فایل
-            run_analysis_from_scraper(csv_file)
+            from nlp2 import RestaurantAnalyzer
+            # کپی سطحی: ستون‌های کمکی تحلیل‌گر به DataFrame اسکرپر اضافه نمی‌شوند و داده‌ها کپی نمی‌شوند
+            analyzer = RestaurantAnalyzer(df.copy(deep=False))
+            emit('analysis_ready', analyzer=analyzer, filename=csv_file, title=title)
 
         except Exception as e:
-            self.root.after(0, lambda: self.status_var.set(f"خطا در تحلیل: {str(e)}"))
-            self.root.after(0, lambda: messagebox.showerror("خطا", f"خطا در تحلیل داده‌ها: {str(e)}"))
+            emit('status', text=f"خطا در تحلیل: {str(e)}")
+            emit('error', text=f"خطا در تحلیل داده‌ها: {str(e)}")
+
+    def execute_partial_analysis(self, rows):
+        """تحلیل ردیف‌های جمع‌آوری شده تا این لحظه (در thread کارگر)"""
+        cleaned_data = clean_and_validate_data(rows)
+        if not cleaned_data:
+            self.events.emit('status', text="داده معتبری برای تحلیل موقت وجود ندارد")
+            self.events.emit('info', text="هنوز داده‌ای برای تحلیل جمع‌آوری نشده است")
+            return
+        self.execute_analysis(pd.DataFrame(cleaned_data), None, title=f"تحلیل موقت - {len(cleaned_data)} نظر")
 
 
 # region Driver Setup
 def setup_driver(neighborhood_name, food_name):
+    from selenium import webdriver
+    from selenium.common import NoSuchElementException
+    from selenium.webdriver.common.by import By
+
     url = "https://www.snappfood.ir/"
     driver = webdriver.Edge()
     driver.get(url)
@@ -364,7 +512,63 @@ def extract_comments_grouped(comments_elements):
 
 
 # region Scraper Function
-def scraper(driver):
+def parse_since_date(text):
+    """«۱۹ آبان ۱۴۰۴» یا «1404/08/19» به (سال، ماه، روز)؛ متن خالی یعنی None"""
+    text = (text or '').strip()
+    if not text:
+        return None
+    parsed = parse_jalali_date(text)
+    if parsed is None:
+        match = re.fullmatch(r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})', normalize_persian(text))
+        if match:
+            parsed = tuple(int(part) for part in match.groups())
+    if parsed is None or not 1 <= parsed[1] <= 12 or not 1 <= parsed[2] <= 31:
+        raise ValueError(f"تاریخ نامعتبر: {text}")
+    return parsed
+
+
+def load_all_review_lines(driver, container, line_selector, since=None):
+    """اسکرول مودال نظرات تا تمام شدن نظرات، یا تا رسیدن به نظری قدیمی‌تر از since"""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    def more_lines(_):
+        current = container.find_elements(By.CSS_SELECTOR, line_selector)
+        return current if len(current) > len(lines) else False
+
+    lines = container.find_elements(By.CSS_SELECTOR, line_selector)
+    for _ in range(REVIEW_MAX_ROUNDS):
+        # نظرات از جدید به قدیم‌اند؛ تاریخ آخرین نظر کامل برای توقف زودهنگام کافی است
+        if since is not None and len(lines) >= 3:
+            oldest = parse_jalali_date(lines[(len(lines) // 3 - 1) * 3].text)
+            if oldest is not None and oldest < since:
+                print("   > Reached reviews older than the cutoff.")
+                break
+
+        # اسکرول آخرین خط به داخل دید، مستقل از اینکه کدام والد قابل اسکرول است
+        if lines:
+            driver.execute_script('arguments[0].scrollIntoView({block: "end"});', lines[-1])
+        driver.execute_script('arguments[0].scrollTop = arguments[0].scrollHeight;', container)
+
+        # به محض اضافه شدن نظر جدید ادامه می‌دهیم؛ اگر تا timeout چیزی نیامد، فهرست تمام شده است
+        try:
+            lines = WebDriverWait(driver, REVIEW_LOAD_TIMEOUT, poll_frequency=REVIEW_POLL_INTERVAL).until(more_lines)
+        except TimeoutException:
+            break
+
+    return lines
+
+
+def scraper(driver, progress=None, since=None):
+    """progress: تابع اختیاری progress(kind, **data) برای گزارش پیشرفت هر رستوران
+    since: (سال، ماه، روز) شمسی؛ فقط نظرات این تاریخ و بعد از آن جمع‌آوری می‌شوند"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as ec
+
     # --- Your scrolling logic ---
     last_height = driver.execute_script('return document.body.scrollHeight')
     while True:
@@ -392,10 +596,14 @@ def scraper(driver):
 
     all_comments_data = []
     original_window = driver.current_window_handle
+    tracker = ProgressTracker(num_items)
+    if progress:
+        progress('started', total=num_items)
 
     # --- Use the "Index Loop" ---
     for i in range(num_items):
         print(f"--- Processing item {i + 1} of {num_items} ---")
+        rows_before = len(all_comments_data)
         try:
             all_items = driver.find_elements(By.CSS_SELECTOR, item_css_selector)
 
@@ -427,11 +635,15 @@ def scraper(driver):
 
                 comment_container = wait.until(ec.visibility_of_element_located((By.XPATH, comment_container_xpath)))
 
-                comment_elements = comment_container.find_elements(By.CSS_SELECTOR, comment_selector_css)
+                # بارگذاری همه صفحات نظرات مودال (نظرات قدیمی با اسکرول بارگذاری می‌شوند)
+                comment_elements = load_all_review_lines(driver, comment_container, comment_selector_css, since)
                 print(f"   > Found {len(comment_elements)} comment lines for '{item_name}'.")
 
                 # استخراج نظرات به صورت گروه‌بندی شده
                 grouped_comments = extract_comments_grouped(comment_elements)
+                if since is not None:
+                    grouped_comments = [c for c in grouped_comments
+                                        if (parse_jalali_date(c['date']) or since) >= since]
                 print(f"   > Extracted {len(grouped_comments)} complete comments.")
 
                 for comment_data in grouped_comments:
@@ -453,6 +665,13 @@ def scraper(driver):
             if len(driver.window_handles) > 1:
                 driver.close()
             driver.switch_to.window(original_window)
+
+        tracker.step()
+        if progress:
+            progress('restaurant_done', index=i + 1, total=num_items,
+                     rows=all_comments_data[rows_before:],
+                     comments_so_far=len(all_comments_data),
+                     eta=tracker.eta_seconds)
         time.sleep(1)
     print("Loop finished.")
     return all_comments_data
@@ -0,0 +1,233 @@
+import argparse
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+# برچسب‌ها به همان ترتیبی که موتور واژه‌نامه‌ای استفاده می‌کند
+LABELS = ('مثبت', 'منفی', 'خنثی')
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def rating_to_label(rating):
+    """تبدیل امتیاز ستاره‌ای به برچسب ضعیف"""
+    try:
+        rating = float(rating)
+    except (ValueError, TypeError):
+        return None
+    if np.isnan(rating):
+        return None
+    if rating >= 4:
+        return 'مثبت'
+    if rating <= 2:
+        return 'منفی'
+    return 'خنثی'
+
+
+class HashedNgramVectorizer:
+    """تبدیل نظرات به ماتریس تُنُک با هش کردن n-gramهای کلمه"""
+
+    def __init__(self, n_features=2 ** 18, ngram_range=(1, 2)):
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self._bucket_cache = {}
+
+    def tokenize(self, text):
+        """شکستن متن به کلمات (نیم‌فاصله بخشی از کلمه در نظر گرفته می‌شود)"""
+        return TOKEN_PATTERN.findall(str(text).replace('\u200c', ''))
+
+    def _bucket(self, term):
+        bucket = self._bucket_cache.get(term)
+        if bucket is None:
+            # از crc32 استفاده می‌کنیم چون hash() پایتون بین اجراها ثابت نیست
+            bucket = zlib.crc32(term.encode('utf-8')) % self.n_features
+            self._bucket_cache[term] = bucket
+        return bucket
+
+    def transform(self, comments):
+        """ساخت ماتریس CSR (data, indices, indptr) برای یک دسته نظر"""
+        min_n, max_n = self.ngram_range
+        indices = []
+        indptr = [0]
+
+        for comment in comments:
+            tokens = self.tokenize(comment)
+            row = set()
+            for n in range(min_n, max_n + 1):
+                for i in range(len(tokens) - n + 1):
+                    row.add(self._bucket(' '.join(tokens[i:i + n])))
+            indices.extend(row)
+            indptr.append(len(indices))
+
+        indices = np.asarray(indices, dtype=np.int32)
+        indptr = np.asarray(indptr, dtype=np.int64)
+
+        # نرمال‌سازی L2 ویژگی‌های دودویی هر سطر
+        row_lengths = np.diff(indptr)
+        row_norms = 1.0 / np.sqrt(np.maximum(row_lengths, 1))
+        data = np.repeat(row_norms, row_lengths).astype(np.float32)
+
+        return SparseRows(data, indices, indptr, self.n_features)
+
+
+class SparseRows:
+    """ماتریس تُنُک سطری با حداقل عملیات مورد نیاز مدل خطی"""
+
+    def __init__(self, data, indices, indptr, n_features):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.n_features = n_features
+        self.n_rows = len(indptr) - 1
+        self.row_ids = np.repeat(np.arange(self.n_rows), np.diff(indptr))
+
+    def dot(self, weights):
+        """ضرب ماتریس در وزن‌ها با شکل (n_features, n_classes)"""
+        n_classes = weights.shape[1]
+        out = np.empty((self.n_rows, n_classes), dtype=np.float64)
+        for c in range(n_classes):
+            out[:, c] = np.bincount(self.row_ids,
+                                    weights=self.data * weights[self.indices, c],
+                                    minlength=self.n_rows)
+        return out
+
+    def transpose_dot(self, gradients):
+        """ضرب ترانهاده ماتریس در گرادیان‌ها با شکل (n_rows, n_classes)"""
+        n_classes = gradients.shape[1]
+        out = np.empty((self.n_features, n_classes), dtype=np.float64)
+        for c in range(n_classes):
+            out[:, c] = np.bincount(self.indices,
+                                    weights=self.data * gradients[self.row_ids, c],
+                                    minlength=self.n_features)
+        return out
+
+    def take(self, rows):
+        """انتخاب زیرمجموعه‌ای از سطرها"""
+        lengths = np.diff(self.indptr)[rows]
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        starts = self.indptr[rows]
+        positions = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return SparseRows(self.data[positions], self.indices[positions], indptr, self.n_features)
+
+
+class LinearSentimentModel:
+    """مدل خطی چندکلاسه (رگرسیون لجستیک) روی ویژگی‌های هش‌شده"""
+
+    def __init__(self, vectorizer=None, weights=None, bias=None):
+        self.vectorizer = vectorizer or HashedNgramVectorizer()
+        n_features = self.vectorizer.n_features
+        self.weights = weights if weights is not None else np.zeros((n_features, len(LABELS)))
+        self.bias = bias if bias is not None else np.zeros(len(LABELS))
+
+    def fit(self, comments, labels, epochs=8, batch_size=4096, learning_rate=2.0,
+            l2=1e-6, seed=0):
+        """آموزش مدل با گرادیان کاهشی دسته‌ای"""
+        label_index = {label: i for i, label in enumerate(LABELS)}
+        y = np.array([label_index[label] for label in labels], dtype=np.int64)
+        X = self.vectorizer.transform(comments)
+
+        # وزن‌دهی کلاس‌ها چون بیشتر نظرات پنج ستاره هستند
+        class_counts = np.bincount(y, minlength=len(LABELS)).astype(np.float64)
+        class_weights = np.where(class_counts > 0,
+                                 len(y) / (len(LABELS) * np.maximum(class_counts, 1)), 0)
+
+        rng = np.random.default_rng(seed)
+        for epoch in range(epochs):
+            order = rng.permutation(len(y))
+            for start in range(0, len(y), batch_size):
+                rows = order[start:start + batch_size]
+                batch = X.take(rows)
+                probs = self._softmax(batch.dot(self.weights) + self.bias)
+
+                gradients = probs
+                gradients[np.arange(len(rows)), y[rows]] -= 1
+                gradients *= class_weights[y[rows]][:, None] / len(rows)
+
+                self.weights -= learning_rate * (batch.transpose_dot(gradients) + l2 * self.weights)
+                self.bias -= learning_rate * gradients.sum(axis=0)
+
+        return self
+
+    @staticmethod
+    def _softmax(scores):
+        scores = scores - scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict_proba(self, comments, batch_size=50000):
+        """احتمال هر برچسب برای نظرات، به صورت دسته‌ای"""
+        comments = list(comments)
+        results = []
+        for start in range(0, len(comments), batch_size):
+            batch = self.vectorizer.transform(comments[start:start + batch_size])
+            results.append(self._softmax(batch.dot(self.weights) + self.bias))
+        if not results:
+            return np.empty((0, len(LABELS)))
+        return np.vstack(results)
+
+    def predict_labels(self, comments, batch_size=50000):
+        """برچسب احساسات برای هر نظر (رابط موتور احساسات)"""
+        probs = self.predict_proba(comments, batch_size=batch_size)
+        return [LABELS[i] for i in probs.argmax(axis=1)]
+
+    def save(self, path):
+        """ذخیره مدل در فایل npz"""
+        np.savez_compressed(path,
+                            weights=self.weights.astype(np.float32),
+                            bias=self.bias,
+                            n_features=self.vectorizer.n_features,
+                            ngram_range=np.array(self.vectorizer.ngram_range))
+
+    @classmethod
+    def load(cls, path):
+        """بارگذاری مدل ذخیره شده"""
+        with np.load(path) as archive:
+            vectorizer = HashedNgramVectorizer(int(archive['n_features']),
+                                               tuple(int(n) for n in archive['ngram_range']))
+            return cls(vectorizer,
+                       archive['weights'].astype(np.float64),
+                       archive['bias'])
+
+
+def load_training_data(csv_files):
+    """خواندن نظرات و ساخت برچسب‌های ضعیف از ستون امتیاز"""
+    frames = [pd.read_csv(path, encoding='utf-8') for path in csv_files]
+    df = pd.concat(frames, ignore_index=True)
+    df = df[df['comment_text'].notna() & (df['comment_text'] != '')]
+
+    labels = df['rating'].apply(rating_to_label)
+    df = df[labels.notna()]
+    return df['comment_text'].astype(str).tolist(), labels[labels.notna()].tolist()
+
+
+def train_from_csv(csv_files, model_path, n_features=2 ** 18, epochs=8):
+    """آموزش آفلاین مدل از فایل‌های CSV اسکرپر"""
+    comments, labels = load_training_data(csv_files)
+    if not comments:
+        raise ValueError("هیچ نظر دارای امتیاز معتبری برای آموزش وجود ندارد")
+
+    print(f"📚 آموزش مدل روی {len(comments)} نظر...")
+    model = LinearSentimentModel(HashedNgramVectorizer(n_features=n_features))
+    model.fit(comments, labels, epochs=epochs)
+    model.save(model_path)
+    print(f"✅ مدل ذخیره شد: {model_path}")
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="آموزش مدل احساسات از روی امتیاز نظرات")
+    parser.add_argument('csv_files', nargs='+', help="فایل‌های CSV خروجی اسکرپر")
+    parser.add_argument('-o', '--output', default='sentiment_model.npz', help="مسیر فایل مدل")
+    parser.add_argument('--features', type=int, default=2 ** 18, help="تعداد سطل‌های هش")
+    parser.add_argument('--epochs', type=int, default=8)
+    args = parser.parse_args()
+
+    train_from_csv(args.csv_files, args.output, n_features=args.features, epochs=args.epochs)
+
+
+if __name__ == "__main__":
+    main()
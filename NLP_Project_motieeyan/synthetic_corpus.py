@@ -0,0 +1,132 @@
+import argparse
+import csv
+import random
+
+from persian_text import format_jalali_date, jalali_month_length
+
+
+BRANDS = ('چیکن فامیلی', 'شیکاگو گریل', 'لوکال رژیمی', 'پیتزا بیژن', 'برگرلند', 'گریل باکس',
+          'فرش باکس', 'مینی میل', 'پروتئین امیر', 'کافه پیتزا ناپولیتن', 'سالاد بار گرینلند',
+          'فست فود بارکد', 'پیتزا پرپروک', 'بامزی', 'فیت شف رژیمی', 'رستوران ایتالیایی روتیندا')
+
+BRANCHES = ('اندرزگو', 'تجریش', 'نیاوران', 'زعفرانیه', 'چیذر', 'ولنجک', 'شریعتی', 'نیایش',
+            'اقدسیه', 'سعادت آباد', 'پاسداران', 'ونک', 'جردن', 'پونک')
+
+POSITIVE_PHRASES = ('عالی', 'خیلی خوشمزه بود', 'مثل همیشه عالی', 'طعم خوب', 'تازه و داغ رسید',
+                    'کیفیت عالی بود', 'پیشنهاد می‌کنم', 'همه چی عالی', 'خوب بود', 'ترد و لذیذ')
+
+NEGATIVE_PHRASES = ('غذا سرد بود', 'خیلی دیر رسید', 'بی‌مزه بود', 'خیلی شور بود', 'کیفیت ضعیف بود',
+                    'قیمت بیشتر و حجم کمتر شده', 'بد بود', 'نان بیات بود', 'تاخیر زیاد داشت', 'افتضاح')
+
+NEUTRAL_PHRASES = ('سفارش رسید', 'معمولی بود', 'سس رو نفرستادین', 'بسته‌بندی ساده بود',
+                   'لطفا در نوع سبزیجات تنوع بدید', 'نسبت به قبل فرقی نکرده')
+
+DISHES = ('پیتزا', 'استیک مرغ', 'همبرگر', 'سالاد', 'پاستا', 'سیب‌زمینی', 'سوپ', 'ساندویچ')
+
+FIELDNAMES = ['restaurant_name', 'comment_text', 'date', 'rating']
+
+# توزیع امتیاز نزدیک به داده‌های واقعی: بیشتر نظرات پنج ستاره‌اند
+RATING_WEIGHTS = {5: 0.62, 4: 0.14, 3: 0.09, 2: 0.06, 1: 0.05, '': 0.04}
+
+
+class SyntheticReviewGenerator:
+    """تولید قطعی (با seed ثابت) نظرات فارسی با همان ساختار خروجی اسکرپر"""
+
+    def __init__(self, seed=0, restaurant_count=None, start_year=1402, end_year=1404):
+        self.rng = random.Random(seed)
+        self.start_year = start_year
+        self.end_year = end_year
+        self.restaurants = self._make_restaurants(restaurant_count)
+        self._ratings = list(RATING_WEIGHTS)
+        self._rating_cum_weights = []
+        total = 0
+        for weight in RATING_WEIGHTS.values():
+            total += weight
+            self._rating_cum_weights.append(total)
+
+    def _make_restaurants(self, count):
+        names = []
+        for brand in BRANDS:
+            names.append(brand)
+            names.extend(f"{brand} ({branch})" for branch in BRANCHES)
+        self.rng.shuffle(names)
+        if count is None:
+            return names
+        # برای تعداد بیشتر، شماره شعبه اضافه می‌شود
+        while len(names) < count:
+            names.append(f"{self.rng.choice(BRANDS)} (شعبه {len(names)})")
+        return names[:count]
+
+    def comment(self, rating):
+        """ساخت متن نظر متناسب با امتیاز"""
+        rng = self.rng
+        if rating in (4, 5):
+            pools = [POSITIVE_PHRASES] * 3 + [NEUTRAL_PHRASES]
+        elif rating in (1, 2):
+            pools = [NEGATIVE_PHRASES] * 3 + [NEUTRAL_PHRASES]
+        else:
+            pools = [POSITIVE_PHRASES, NEGATIVE_PHRASES, NEUTRAL_PHRASES]
+
+        parts = [rng.choice(rng.choice(pools)) for _ in range(rng.randint(1, 3))]
+        if rng.random() < 0.4:
+            parts.insert(0, rng.choice(DISHES))
+        return ' '.join(parts) if rng.random() < 0.5 else '، '.join(parts)
+
+    def date(self):
+        year = self.rng.randint(self.start_year, self.end_year)
+        month = self.rng.randint(1, 12)
+        return format_jalali_date(year, month, self.rng.randint(1, jalali_month_length(year, month)))
+
+    def rows(self, count):
+        """تولید ردیف‌ها به صورت جریانی (بدون نگه داشتن کل داده در حافظه)"""
+        rng = self.rng
+        # چند رستوران پرطرفدار بیشتر نظرات را دارند (توزیع Zipf مانند)
+        weights = [1.0 / (rank + 1) for rank in range(len(self.restaurants))]
+        cum_weights = []
+        total = 0
+        for weight in weights:
+            total += weight
+            cum_weights.append(total)
+
+        for _ in range(count):
+            restaurant = rng.choices(self.restaurants, cum_weights=cum_weights)[0]
+            rating = rng.choices(self._ratings, cum_weights=self._rating_cum_weights)[0]
+            yield {
+                'restaurant_name': restaurant,
+                'comment_text': self.comment(rating if rating != '' else 3),
+                'date': self.date(),
+                'rating': rating,
+            }
+
+
+def write_corpus(path, count, seed=0, restaurant_count=None, chunk_size=100000):
+    """نوشتن مجموعه داده مصنوعی در CSV با همان کدگذاری اسکرپر"""
+    generator = SyntheticReviewGenerator(seed, restaurant_count)
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        chunk = []
+        for row in generator.rows(count):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                writer.writerows(chunk)
+                chunk = []
+        writer.writerows(chunk)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="تولید مجموعه نظرات فارسی مصنوعی")
+    parser.add_argument('rows', type=int, help="تعداد ردیف‌ها (مثلاً 1000 تا 10000000)")
+    parser.add_argument('-o', '--output', help="مسیر فایل خروجی")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--restaurants', type=int, help="تعداد رستوران‌ها")
+    args = parser.parse_args()
+
+    output = args.output or f"synthetic_{args.rows}_structured.csv"
+    write_corpus(output, args.rows, args.seed, args.restaurants)
+    print(f"✅ {args.rows} ردیف در {output} ذخیره شد")
+
+
+if __name__ == "__main__":
+    main()
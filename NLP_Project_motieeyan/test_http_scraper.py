@@ -0,0 +1,140 @@
+import asyncio
+import http.client
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from benchmark_http_scraper import STAND_IN_NEIGHBORHOOD, create_stand_in_server
+from http_scraper import HttpScraper, ThreadedHttpClient, format_review_date, http_scrape
+from persian_text import gregorian_to_jalali, parse_jalali_date
+
+
+@contextmanager
+def stand_in_server(**options):
+    options.setdefault('latency', 0)
+    server, config = create_stand_in_server(**options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield server, config
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def scrape(config, **options):
+    async def run():
+        async with HttpScraper(config, requests_per_second=0, backoff=0.01, **options) as scraper:
+            return await scraper.scrape(STAND_IN_NEIGHBORHOOD, 'پیتزا'), scraper.requests_made
+
+    return asyncio.run(run())
+
+
+def test_rows_follow_vendor_order_and_schema():
+    with stand_in_server(restaurants=6, comments_per_restaurant=45) as (server, config):
+        rows, _ = scrape(config, concurrency=4)
+        vendors = [name for name, _ in server.RequestHandlerClass.vendors]
+
+    assert len(rows) == 6 * 45
+    assert [row['restaurant_name'] for row in rows[::45]] == vendors
+    for row in rows:
+        assert set(row) == {'restaurant_name', 'comment_text', 'date', 'rating'}
+        assert row['comment_text']
+        assert parse_jalali_date(row['date']) is not None
+        assert row['rating'] in (1, 2, 3, 4, 5)
+
+
+def test_dates_are_converted_to_jalali():
+    assert format_review_date('2025-03-21 12:00:00') == '۱ فروردین ۱۴۰۴'
+    assert format_review_date('2025-11-10') == '۱۹ آبان ۱۴۰۴'
+    assert gregorian_to_jalali(2024, 3, 20) == (1403, 1, 1)
+    # تاریخ شمسی عددی فقط قالب‌بندی می‌شود
+    assert format_review_date('1404/08/19') == '۱۹ آبان ۱۴۰۴'
+
+
+def test_throttled_requests_are_retried():
+    with stand_in_server(restaurants=2, comments_per_restaurant=5, throttle=2) as (server, config):
+        rows, requests_made = scrape(config, concurrency=1, retries=3)
+        served = server.RequestHandlerClass._served['count']
+
+    assert len(rows) == 2 * 5
+    # ۲ درخواست رد شده + فهرست رستوران‌ها + ۲ صفحه نظر برای هر رستوران
+    assert requests_made == 2 + 1 + 2 * 2
+    # هر تلاش fetch_json دقیقاً یک درخواست به سرور است
+    assert served == requests_made
+
+
+def test_transport_errors_are_retried():
+    # سرور بسته: همه تلاش‌ها با خطای اتصال تمام می‌شوند و خطا به بیرون می‌رسد
+    with stand_in_server(restaurants=1, comments_per_restaurant=1) as (_, config):
+        pass
+
+    async def run():
+        async with HttpScraper(config, requests_per_second=0, retries=2, backoff=0.01, timeout=2) as scraper:
+            try:
+                await scraper.list_vendors(STAND_IN_NEIGHBORHOOD, 'پیتزا')
+            except RuntimeError:
+                return scraper.requests_made
+        return None
+
+    assert asyncio.run(run()) == 3
+
+
+def test_http_scrape_cleans_rows():
+    with stand_in_server(restaurants=3, comments_per_restaurant=10) as (_, config):
+        rows = http_scrape(STAND_IN_NEIGHBORHOOD, 'پیتزا', config, requests_per_second=0)
+    assert 0 < len(rows) <= 30
+    assert all(row['comment_text'] for row in rows)
+
+
+class ClosingHandler(BaseHTTPRequestHandler):
+    """پاسخ keep-alive می‌دهد ولی بعد از هر پاسخ اتصال را می‌بندد (اتصال کهنه برای کلاینت)"""
+
+    protocol_version = 'HTTP/1.1'
+    served = 0
+
+    def do_GET(self):
+        type(self).served += 1
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_threaded_client_replaces_stale_keep_alive_connection():
+    handler = type('Handler', (ClosingHandler,), {'served': 0})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = ThreadedHttpClient(1, {}, timeout=5)
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        assert client._get(url)[0] == 200
+        assert client._get(url)[0] == 200
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert handler.served == 2
+
+
+def test_threaded_client_does_not_retry_failed_requests(monkeypatch):
+    # سرور بسته: یک تلاش اتصال و سپس خطا؛ تلاش دوباره فقط با fetch_json
+    with stand_in_server(restaurants=1, comments_per_restaurant=1) as (_, config):
+        pass
+    attempts = []
+    original_connect = http.client.HTTPConnection.connect
+
+    def counting_connect(connection):
+        attempts.append(connection.host)
+        return original_connect(connection)
+
+    monkeypatch.setattr(http.client.HTTPConnection, 'connect', counting_connect)
+    client = ThreadedHttpClient(1, {}, timeout=2)
+    with pytest.raises(OSError):
+        client._get(config['comments_url'].format(vendor_code='v0', page=0))
+    assert len(attempts) == 1
@@ -0,0 +1,70 @@
+import pytest
+
+from lexicon import CompiledLexicon, load_lexicon, top_terms
+
+OLD = {
+    'positive': ['خوب', 'عالی'],
+    'negative': ['بد', 'سرد'],
+    'issues': {'سرد بودن غذا': ['سرد'], 'تاخیر در ارسال': ['دیر']},
+}
+NEW = {
+    'positive': ['خوب', 'عالی', 'عالی بود', 'خوشمزه'],
+    'negative': ['بد', 'سرد', 'دیر رسید'],
+    'issues': {'سرد بودن غذا': ['سرد'], 'تاخیر در ارسال': ['دیر'], 'کیفیت پایین': ['بی کیفیت']},
+}
+
+
+def test_phrase_words_are_not_counted_twice():
+    lexicon = CompiledLexicon(['عالی', 'عالی بود', 'خیلی عالی بود'], ['بد', 'دیر رسید'], {})
+    emotion, positive, negative = lexicon.match_sentiment('خیلی عالی بود ولی دیر رسید و عالی بود')
+    # طولانی‌ترین عبارت اول؛ «عالی» درون عبارت‌ها جداگانه شمرده نمی‌شود
+    assert positive == ['خیلی عالی بود', 'عالی بود']
+    assert negative == ['دیر رسید']
+    assert emotion == 'مثبت'
+    assert lexicon.match_sentiment('عالی بود')[1] == ['عالی بود']
+    assert lexicon.match_sentiment('عالی')[1] == ['عالی']
+
+
+def test_top_terms_breaks_ties_by_term():
+    counts = {'ب': 2, 'الف': 2, 'ج': 3, 'د': 0, 'ه': -1, 'و': 1}
+    assert list(top_terms(counts).items()) == [('ج', 3), ('الف', 2), ('ب', 2), ('و', 1)]
+    assert list(top_terms(counts, 2)) == ['ج', 'الف']
+
+
+def test_default_lexicon_loads(tmp_path):
+    lexicon = load_lexicon(use_cache=False)
+    assert lexicon.positive and lexicon.negative and lexicon.issues
+
+
+def test_reloaded_analysis_matches_fresh_analysis():
+    pd = pytest.importorskip('pandas')
+    from nlp2 import RestaurantAnalyzer
+
+    comments = [
+        ('الف', 'غذا خوب و خوشمزه بود', 5),
+        ('الف', 'خوشمزه و خوب', 4),
+        ('الف', 'عالی بود ولی دیر رسید', 3),
+        ('الف', 'سرد و بد بود', 1),
+        ('ب', 'بی کیفیت و سرد', 1),
+        ('ب', 'عالی بود عالی', 5),
+        ('ب', 'خوب بود', 4),
+        ('ج', 'دیر رسید و بد', 2),
+        ('ج', 'خوشمزه', 5),
+    ]
+    df = pd.DataFrame([{'restaurant_name': name, 'comment_text': text, 'date': '', 'rating': rating}
+                       for name, text, rating in comments])
+
+    reloaded = RestaurantAnalyzer(df.copy(), lexicon=CompiledLexicon.from_dict(OLD))
+    result = reloaded.apply_lexicon(CompiledLexicon.from_dict(NEW))
+    fresh = RestaurantAnalyzer(df.copy(), lexicon=CompiledLexicon.from_dict(NEW))
+
+    assert result['rescored_comments'] > 0
+    assert reloaded.all_restaurants_analysis.keys() == fresh.all_restaurants_analysis.keys()
+    for name, expected in fresh.all_restaurants_analysis.items():
+        actual = reloaded.all_restaurants_analysis[name]
+        for key in ('sentiment_distribution', 'sentiment_percentages', 'common_issues', 'positive_percentage'):
+            assert actual[key] == pytest.approx(expected[key]), (name, key)
+        # ترتیب کلمات کلیدی هم (با تعداد برابر) باید یکسان باشد
+        assert list(actual['top_positive_words'].items()) == list(expected['top_positive_words'].items())
+        assert list(actual['top_negative_words'].items()) == list(expected['top_negative_words'].items())
+    assert reloaded.best_restaurant == fresh.best_restaurant
@@ -0,0 +1,189 @@
+import threading
+
+from scheduler import RateBudget, ScrapeScheduler, target_key
+
+HOUR = 3600
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, hours):
+        self.now += hours * HOUR
+
+
+def rows_for(counts):
+    return [{'restaurant_name': name} for name, count in counts.items() for _ in range(count)]
+
+
+class StubScraper:
+    """اسکرپر جایگزین: برای هر جفت ردیف‌های از پیش تعیین شده یا خطا برمی‌گرداند"""
+
+    def __init__(self):
+        self.results = {}
+        self.calls = []
+
+    def __call__(self, neighborhood, food):
+        self.calls.append((neighborhood, food))
+        result = self.results[target_key(neighborhood, food)]
+        if isinstance(result, Exception):
+            raise result
+        return rows_for(result)
+
+
+def make_scheduler(tmp_path, clock, scrape_fn, **options):
+    options.setdefault('max_workers', 1)
+    options.setdefault('scrapes_per_hour', 100)
+    return ScrapeScheduler(str(tmp_path / 'state.json'), scrape_fn, clock=clock, **options)
+
+
+def test_due_order_follows_per_restaurant_rates(tmp_path):
+    clock = FakeClock()
+    scrape = StubScraper()
+    scheduler = make_scheduler(tmp_path, clock, scrape)
+    busy, quiet = target_key('a', 'pizza'), target_key('b', 'pizza')
+    scheduler.watch('a', 'pizza')
+    scheduler.watch('b', 'pizza')
+
+    scrape.results = {busy: {'r1': 10, 'r2': 5}, quiet: {'r3': 10}}
+    scheduler.run_once()
+    scheduler.run_once()
+    assert scheduler.due_targets() == []
+
+    # دو ساعت بعد: رستوران‌های a هر کدام ۱۰ نظر جدید، b فقط ۲ نظر
+    clock.advance(2)
+    scrape.results = {busy: {'r1': 20, 'r2': 15}, quiet: {'r3': 12}}
+    scheduler.run_once()
+    scheduler.run_once()
+    assert scheduler.targets[busy]['restaurant_rates'] == {'r1': 5.0, 'r2': 5.0}
+    assert scheduler.comment_rate(scheduler.targets[busy]) == 10.0
+    assert scheduler.comment_rate(scheduler.targets[quiet]) == 1.0
+
+    clock.advance(1)
+    assert scheduler.due_targets() == [busy, quiet]
+
+    # جفت تازه اسکرپ نشده جلوتر از همه است
+    scheduler.watch('c', 'pizza')
+    assert scheduler.due_targets()[0] == target_key('c', 'pizza')
+
+
+def test_rate_budget_limits_dispatch(tmp_path):
+    clock = FakeClock()
+    scrape = StubScraper()
+    scheduler = make_scheduler(tmp_path, clock, scrape, max_workers=4, scrapes_per_hour=2)
+    for food in ('a', 'b', 'c'):
+        scheduler.watch('n', food)
+        scrape.results[target_key('n', food)] = {'r': 1}
+
+    assert len(scheduler.run_once()) == 2
+    assert scheduler.run_once() == []
+
+    clock.advance(0.5)
+    assert len(scheduler.run_once()) == 1
+    scheduler.shutdown()
+
+
+def test_rate_budget_refills_up_to_limit():
+    clock = FakeClock()
+    budget = RateBudget(3, clock)
+    assert [budget.take() for _ in range(4)] == [True, True, True, False]
+    clock.advance(10)
+    assert budget.available() == 3
+
+
+def test_failures_back_off_exponentially(tmp_path):
+    clock = FakeClock()
+    scrape = StubScraper()
+    scheduler = make_scheduler(tmp_path, clock, scrape, min_interval_hours=1.0)
+    key = target_key('n', 'pizza')
+    scheduler.watch('n', 'pizza')
+    scrape.results[key] = RuntimeError("boom")
+
+    delays = []
+    for _ in range(3):
+        summary, = scheduler.run_once()
+        delays.append(summary['retry_in_hours'])
+        assert scheduler.due_targets() == []
+        clock.advance(summary['retry_in_hours'])
+        assert scheduler.due_targets() == [key]
+    assert delays == [1.0, 2.0, 4.0]
+
+    scrape.results[key] = {'r': 3}
+    scheduler.run_once()
+    assert scheduler.targets[key]['failures'] == 0
+    assert scheduler.targets[key]['retry_after'] is None
+    scheduler.shutdown()
+
+
+def test_state_round_trip(tmp_path):
+    clock = FakeClock()
+    scrape = StubScraper()
+    scheduler = make_scheduler(tmp_path, clock, scrape, scrapes_per_hour=5)
+    key = target_key('n', 'pizza')
+    scheduler.watch('n', 'pizza')
+    scrape.results[key] = {'r1': 4}
+    scheduler.run_once()
+    clock.advance(2)
+    scrape.results[key] = {'r1': 8}
+    scheduler.run_once()
+    scheduler.shutdown()
+
+    restored = make_scheduler(tmp_path, clock, scrape, scrapes_per_hour=5)
+    assert restored.targets == scheduler.targets
+    assert restored.budget.tokens == scheduler.budget.tokens
+    assert restored.budget.updated_at == scheduler.budget.updated_at
+    assert restored.due_targets() == scheduler.due_targets()
+
+
+def test_unwatch_during_scrape_drops_result(tmp_path):
+    clock = FakeClock()
+    scheduler = None
+
+    def scrape(neighborhood, food):
+        scheduler.unwatch(neighborhood, food)
+        return rows_for({'r': 1})
+
+    scheduler = make_scheduler(tmp_path, clock, scrape)
+    scheduler.watch('n', 'pizza')
+    assert scheduler.run_once() == [None]
+    assert scheduler.targets == {}
+    assert scheduler.in_flight == set()
+    scheduler.shutdown()
+
+
+def test_watch_and_unwatch_while_scrapes_run(tmp_path):
+    clock = FakeClock()
+    started = threading.Barrier(5)
+    release = threading.Event()
+
+    def scrape(neighborhood, food):
+        started.wait(timeout=5)
+        release.wait(timeout=5)
+        return rows_for({f"{food}-r": 2})
+
+    scheduler = make_scheduler(tmp_path, clock, scrape, max_workers=4)
+    for food in 'abcd':
+        scheduler.watch('n', food)
+    futures = scheduler.dispatch()
+    started.wait(timeout=5)
+
+    # تغییر فهرست پایش همزمان با ذخیره وضعیت در کارگرها
+    scheduler.watch('n', 'e')
+    scheduler.unwatch('n', 'b')
+    release.set()
+    for i in range(200):
+        scheduler.watch('m', str(i))
+        scheduler.unwatch('m', str(i))
+    results = [future.result() for future in futures]
+    scheduler.shutdown()
+
+    assert sorted(r['target'] for r in results if r is not None) == ['n|a', 'n|c', 'n|d']
+    assert sorted(scheduler.targets) == ['n|a', 'n|c', 'n|d', 'n|e']
+    assert scheduler.targets['n|e']['last_scraped'] is None
+    assert scheduler.targets['n|a']['last_scraped'] == clock.now
+    restored = make_scheduler(tmp_path, clock, scrape)
+    assert restored.targets == scheduler.targets
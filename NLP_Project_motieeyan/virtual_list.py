@@ -0,0 +1,176 @@
+from tkinter import ttk
+
+
+class VirtualRestaurantList:
+    """لیست مجازی: فقط ردیف‌های قابل مشاهده در Treeview ساخته می‌شوند"""
+
+    def __init__(self, parent, columns, on_select=None, visible_rows=25):
+        """columns: لیستی از (شناسه، عنوان، عرض، کلید مرتب‌سازی یا None)"""
+        self.on_select = on_select
+        self.rows = []
+        self.sort_keys = {}
+        self._sorted_cache = {}
+        self.name_to_row = {}
+        self.filtered = None
+        self.order = []
+        self.top = 0
+        self.selected_row = None
+        self._sort_column = None
+        self._sort_reverse = True
+
+        frame = ttk.Frame(parent)
+        frame.pack(fill='both', expand=True)
+
+        self.tree = ttk.Treeview(frame, columns=[c[0] for c in columns],
+                                 show='headings', height=visible_rows, selectmode='browse')
+        for column_id, title, width, sortable in columns:
+            command = (lambda c=column_id: self.toggle_sort(c)) if sortable else ''
+            self.tree.heading(column_id, text=title, command=command)
+            self.tree.column(column_id, width=width)
+
+        self.scrollbar = ttk.Scrollbar(frame, orient='vertical', command=self.on_scrollbar)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        # ردیف‌های ثابت Treeview که با داده‌های پنجره فعلی پر می‌شوند
+        self.slots = [self.tree.insert('', 'end', values=()) for _ in range(visible_rows)]
+
+        self.tree.bind('<<TreeviewSelect>>', self.on_tree_select)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1, 'units'))
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-1, 'units'))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(1, 'units'))
+        self.tree.bind('<Up>', lambda e: self.move_selection(-1))
+        self.tree.bind('<Down>', lambda e: self.move_selection(1))
+        self.tree.bind('<Prior>', lambda e: self.scroll(-1, 'pages'))
+        self.tree.bind('<Next>', lambda e: self.scroll(1, 'pages'))
+
+    @property
+    def visible_rows(self):
+        return len(self.slots)
+
+    def set_rows(self, rows, sort_keys=None):
+        """rows: مقادیر ستون‌ها (ستون اول نام رستوران)؛ sort_keys: ستون -> لیست کلیدها"""
+        self.rows = list(rows)
+        self.sort_keys = sort_keys or {}
+        self._sorted_cache = {}
+        self.name_to_row = {row[0]: i for i, row in enumerate(self.rows)}
+        self.filtered = None
+        self.selected_row = None
+        self._rebuild_order()
+
+    def set_filter(self, row_indices):
+        """نمایش فقط ردیف‌های داده شده؛ None یعنی همه"""
+        self.filtered = None if row_indices is None else set(row_indices)
+        self._rebuild_order()
+
+    def sort_by(self, column, reverse=True):
+        """مرتب‌سازی روی آرایه داده‌ها بدون ساختن دوباره ویجت‌ها"""
+        self._sort_column, self._sort_reverse = column, reverse
+        self._rebuild_order()
+
+    def toggle_sort(self, column):
+        reverse = not self._sort_reverse if column == self._sort_column else True
+        self.sort_by(column, reverse)
+
+    def _rebuild_order(self):
+        order = range(len(self.rows))
+        if self._sort_column in self.sort_keys:
+            # ترتیب کامل هر ستون یک بار محاسبه و برای فیلترهای بعدی نگه داشته می‌شود
+            cache_key = (self._sort_column, self._sort_reverse)
+            order = self._sorted_cache.get(cache_key)
+            if order is None:
+                keys = self.sort_keys[self._sort_column]
+                order = sorted(range(len(self.rows)), key=keys.__getitem__, reverse=self._sort_reverse)
+                self._sorted_cache[cache_key] = order
+        if self.filtered is not None:
+            order = [i for i in order if i in self.filtered]
+        self.order = list(order)
+        self._position = {row: i for i, row in enumerate(self.order)}
+        self.top = 0
+        self.render()
+
+    def render(self):
+        """پر کردن ردیف‌های ثابت با پنجره فعلی داده‌ها"""
+        window = self.order[self.top:self.top + self.visible_rows]
+        for slot, row in zip(self.slots, window):
+            self.tree.item(slot, values=self.rows[row])
+        self.tree.set_children('', *self.slots[:len(window)])
+
+        if self.selected_row in self._position and \
+                self.top <= self._position[self.selected_row] < self.top + len(window):
+            slot = self.slots[self._position[self.selected_row] - self.top]
+            if self.tree.selection() != (slot,):
+                self.tree.selection_set(slot)
+            self.tree.focus(slot)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = len(self.order)
+        if total <= self.visible_rows:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.top / total, (self.top + self.visible_rows) / total)
+
+    def _max_top(self):
+        return max(0, len(self.order) - self.visible_rows)
+
+    def scroll_to(self, top):
+        top = min(max(0, int(top)), self._max_top())
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def scroll(self, amount, what='units'):
+        step = self.visible_rows - 1 if what == 'pages' else 1
+        self.scroll_to(self.top + amount * step)
+        return 'break'
+
+    def on_scrollbar(self, action, *args):
+        if action == 'moveto':
+            self.scroll_to(float(args[0]) * len(self.order))
+        elif action == 'scroll':
+            self.scroll(int(args[0]), args[1])
+
+    def on_tree_select(self, event=None):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        position = self.top + self.slots.index(selection[0])
+        if position >= len(self.order):
+            return
+        row = self.order[position]
+        # انتخاب‌های برنامه‌ای همین رویداد را دوباره تولید می‌کنند
+        if row == self.selected_row:
+            return
+        self.selected_row = row
+        if self.on_select:
+            self.on_select(self.rows[row][0])
+
+    def move_selection(self, delta):
+        if not self.order:
+            return 'break'
+        current = self._position.get(self.selected_row, -1)
+        position = min(max(0, current + delta), len(self.order) - 1)
+        self.select_row(self.order[position])
+        if self.on_select:
+            self.on_select(self.rows[self.selected_row][0])
+        return 'break'
+
+    def select_row(self, row):
+        """انتخاب یک ردیف داده و اسکرول تا آن"""
+        self.selected_row = row
+        position = self._position.get(row)
+        if position is not None and not self.top <= position < self.top + self.visible_rows:
+            self.top = min(max(0, position - self.visible_rows // 2), self._max_top())
+        self.render()
+
+    def select_name(self, name):
+        """انتخاب با نام رستوران در O(1)"""
+        row = self.name_to_row.get(name)
+        if row is None:
+            return False
+        self.select_row(row)
+        return True
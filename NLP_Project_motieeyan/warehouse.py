@@ -0,0 +1,228 @@
+import argparse
+import csv
+import glob
+import os
+import sqlite3
+import time
+
+from persian_text import normalize_persian
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrapes (
+    id INTEGER PRIMARY KEY,
+    source_file TEXT UNIQUE NOT NULL,
+    neighborhood TEXT NOT NULL,
+    food TEXT NOT NULL,
+    file_mtime REAL NOT NULL,
+    imported_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY,
+    scrape_id INTEGER NOT NULL REFERENCES scrapes(id) ON DELETE CASCADE,
+    restaurant_name TEXT NOT NULL,
+    comment_text TEXT NOT NULL,
+    date TEXT,
+    rating REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_reviews_scrape ON reviews(scrape_id);
+CREATE INDEX IF NOT EXISTS idx_reviews_restaurant ON reviews(restaurant_name);
+CREATE INDEX IF NOT EXISTS idx_scrapes_pair ON scrapes(neighborhood, food);
+
+-- متن نرمال‌شده نظرات؛ rowid همان reviews.id است
+CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5(
+    comment_norm,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def parse_scrape_filename(path):
+    """استخراج (محله، غذا) از نام فایل {neighborhood}_{food}_structured.csv"""
+    name = os.path.basename(path)
+    suffix = '_structured.csv'
+    if not name.endswith(suffix) or '_' not in name[:-len(suffix)]:
+        raise ValueError(f"نام فایل با الگوی اسکرپر مطابقت ندارد: {name}")
+    neighborhood, food = name[:-len(suffix)].split('_', 1)
+    return normalize_persian(neighborhood), normalize_persian(food)
+
+
+def parse_rating(value):
+    """تبدیل امن امتیاز به عدد یا None"""
+    try:
+        return float(value) if str(value).strip() else None
+    except ValueError:
+        return None
+
+
+def build_match_expression(match):
+    """ساخت عبارت FTS5: رشته یعنی همه کلمات، لیست یعنی هر کدام از عبارات"""
+    if isinstance(match, str):
+        terms = normalize_persian(match).split()
+        joiner = ' AND '
+    else:
+        terms = [normalize_persian(term) for term in match]
+        joiner = ' OR '
+    quoted = ['"' + term.replace('"', '""') + '"' for term in terms if term]
+    return joiner.join(quoted)
+
+
+class ReviewWarehouse:
+    """انبار SQLite برای همه فایل‌های اسکرپ شده با جستجوی تمام‌متن روی نظرات"""
+
+    def __init__(self, db_path='reviews_warehouse.db'):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def import_csv(self, path, force=False):
+        """وارد کردن یک فایل CSV؛ فایل‌های تغییرنکرده دوباره خوانده نمی‌شوند"""
+        source_file = os.path.abspath(path)
+        file_mtime = os.path.getmtime(source_file)
+        neighborhood, food = parse_scrape_filename(source_file)
+
+        existing = self.conn.execute('SELECT id, file_mtime FROM scrapes WHERE source_file = ?',
+                                     (source_file,)).fetchone()
+        if existing and existing['file_mtime'] == file_mtime and not force:
+            return 0
+
+        with open(source_file, encoding='utf-8-sig', newline='') as f:
+            rows = [row for row in csv.DictReader(f)
+                    if row.get('restaurant_name') and row.get('comment_text')]
+
+        with self.conn:
+            if existing:
+                self._delete_scrape(existing['id'])
+            cursor = self.conn.execute(
+                'INSERT INTO scrapes (source_file, neighborhood, food, file_mtime, imported_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (source_file, neighborhood, food, file_mtime, time.time()))
+            scrape_id = cursor.lastrowid
+
+            for row in rows:
+                cursor = self.conn.execute(
+                    'INSERT INTO reviews (scrape_id, restaurant_name, comment_text, date, rating) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (scrape_id, row['restaurant_name'].strip(), row['comment_text'].strip(),
+                     (row.get('date') or '').strip(), parse_rating(row.get('rating', ''))))
+                self.conn.execute('INSERT INTO reviews_fts (rowid, comment_norm) VALUES (?, ?)',
+                                  (cursor.lastrowid, normalize_persian(row['comment_text'])))
+
+        print(f"✅ {len(rows)} نظر از {os.path.basename(source_file)} وارد شد")
+        return len(rows)
+
+    def import_directory(self, directory='.', pattern='*_structured.csv', force=False):
+        """وارد کردن همه فایل‌های اسکرپ شده یک پوشه"""
+        total = 0
+        for path in sorted(glob.glob(os.path.join(directory, pattern))):
+            try:
+                total += self.import_csv(path, force=force)
+            except ValueError as e:
+                print(f"⚠️ {e}")
+        return total
+
+    def _delete_scrape(self, scrape_id):
+        self.conn.execute('DELETE FROM reviews_fts WHERE rowid IN '
+                          '(SELECT id FROM reviews WHERE scrape_id = ?)', (scrape_id,))
+        self.conn.execute('DELETE FROM reviews WHERE scrape_id = ?', (scrape_id,))
+        self.conn.execute('DELETE FROM scrapes WHERE id = ?', (scrape_id,))
+
+    def _where(self, match=None, neighborhood=None, food=None, restaurant=None):
+        clauses, params = [], []
+        if match:
+            clauses.append('r.id IN (SELECT rowid FROM reviews_fts WHERE reviews_fts MATCH ?)')
+            params.append(build_match_expression(match))
+        if neighborhood:
+            clauses.append('s.neighborhood LIKE ?')
+            params.append(f'%{normalize_persian(neighborhood)}%')
+        if food:
+            clauses.append('s.food LIKE ?')
+            params.append(f'%{normalize_persian(food)}%')
+        if restaurant:
+            clauses.append('r.restaurant_name = ?')
+            params.append(restaurant)
+        where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        return where, params
+
+    def search(self, match=None, neighborhood=None, food=None, restaurant=None, limit=None):
+        """نظرات مطابق با فیلترها و عبارت جستجو"""
+        where, params = self._where(match, neighborhood, food, restaurant)
+        sql = ('SELECT r.id, s.neighborhood, s.food, r.restaurant_name, r.comment_text, r.date, r.rating '
+               'FROM reviews r JOIN scrapes s ON s.id = r.scrape_id' + where + ' ORDER BY r.id')
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def restaurants_matching(self, match, neighborhood=None, food=None):
+        """رستوران‌هایی که نظراتشان با عبارت جستجو مطابقت دارد، با تعداد نظرات مطابق"""
+        where, params = self._where(match, neighborhood, food)
+        sql = ('SELECT s.neighborhood, s.food, r.restaurant_name, COUNT(*) AS matches '
+               'FROM reviews r JOIN scrapes s ON s.id = r.scrape_id' + where +
+               ' GROUP BY s.neighborhood, s.food, r.restaurant_name ORDER BY matches DESC')
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def query_dataframe(self, match=None, neighborhood=None, food=None, restaurant=None, limit=None):
+        """نتیجه جستجو به شکل DataFrame با ستون‌های مورد نیاز RestaurantAnalyzer"""
+        import pandas as pd
+
+        rows = self.search(match, neighborhood, food, restaurant, limit)
+        columns = ['id', 'neighborhood', 'food', 'restaurant_name', 'comment_text', 'date', 'rating']
+        return pd.DataFrame(rows, columns=columns)
+
+    def list_scrapes(self):
+        """فهرست فایل‌های وارد شده به همراه تعداد نظرات"""
+        sql = ('SELECT s.neighborhood, s.food, s.source_file, COUNT(r.id) AS reviews '
+               'FROM scrapes s LEFT JOIN reviews r ON r.scrape_id = s.id '
+               'GROUP BY s.id ORDER BY s.neighborhood, s.food')
+        return [dict(row) for row in self.conn.execute(sql)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="انبار SQLite نظرات اسکرپ شده")
+    parser.add_argument('--db', default='reviews_warehouse.db')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help="وارد کردن فایل‌های CSV")
+    import_parser.add_argument('paths', nargs='*', default=['.'])
+    import_parser.add_argument('--force', action='store_true')
+
+    search_parser = subparsers.add_parser('search', help="جستجوی رستوران‌ها بر اساس متن نظرات")
+    search_parser.add_argument('terms', nargs='+', help="هر کدام از این عبارات")
+    search_parser.add_argument('--neighborhood')
+    search_parser.add_argument('--food')
+
+    args = parser.parse_args()
+
+    with ReviewWarehouse(args.db) as warehouse:
+        if args.command == 'import':
+            for path in args.paths:
+                if os.path.isdir(path):
+                    warehouse.import_directory(path, force=args.force)
+                else:
+                    warehouse.import_csv(path, force=args.force)
+        else:
+            start = time.perf_counter()
+            results = warehouse.restaurants_matching(args.terms, args.neighborhood, args.food)
+            elapsed = (time.perf_counter() - start) * 1000
+            for row in results:
+                print(f"{row['neighborhood']} | {row['food']} | {row['restaurant_name']}: {row['matches']} نظر")
+            print(f"⏱️ {len(results)} رستوران در {elapsed:.1f} میلی‌ثانیه")
+
+
+if __name__ == "__main__":
+    main()